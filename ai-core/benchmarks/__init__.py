@@ -0,0 +1,3 @@
+"""
+AI Core Benchmarks Package
+"""
@@ -0,0 +1,96 @@
+"""
+Per-call overhead of PerplexityClient.chat with and without the shared HTTP pool.
+
+Runs against a local stub of the /chat/completions endpoint so only client
+overhead is measured. Usage (from ai-core/):
+
+    python -m benchmarks.bench_http_pool --calls 200
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+import aiohttp
+from aiohttp import web
+
+STUB_RESPONSE = {
+    "choices": [{"message": {"role": "assistant", "content": "pong"}}],
+    "usage": {"prompt_tokens": 5, "completion_tokens": 1, "total_tokens": 6}
+}
+
+
+async def _chat_completions(request: web.Request) -> web.Response:
+    await request.read()
+    return web.json_response(STUB_RESPONSE)
+
+
+async def start_stub_server() -> web.AppRunner:
+    app = web.Application()
+    app.router.add_post("/chat/completions", _chat_completions)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    return runner
+
+
+async def _unpooled_call(url: str, payload: dict):
+    # Reproduces the previous behaviour: a fresh session per attempt
+    async with aiohttp.ClientSession() as session:
+        async with session.post(url, json=payload) as response:
+            await response.text()
+
+
+def _summary(label: str, samples: list) -> str:
+    samples_ms = sorted(s * 1000 for s in samples)
+    p95 = samples_ms[int(len(samples_ms) * 0.95) - 1]
+    return (
+        f"{label:<10} mean={statistics.mean(samples_ms):7.3f}ms  "
+        f"p50={statistics.median(samples_ms):7.3f}ms  p95={p95:7.3f}ms"
+    )
+
+
+async def run(calls: int):
+    runner = await start_stub_server()
+    port = runner.addresses[0][1]
+    base_url = f"http://127.0.0.1:{port}"
+
+    os.environ.setdefault("PERPLEXITY_API_KEY", "benchmark")
+    os.environ["PERPLEXITY_BASE_URL"] = base_url
+
+    from utils.perplexity_client import PerplexityClient
+    from utils.http_pool import http_pool
+
+    client = PerplexityClient()
+    payload = {"model": client.default_model, "messages": [{"role": "user", "content": "ping"}]}
+
+    try:
+        before = []
+        for _ in range(calls):
+            start = time.perf_counter()
+            await _unpooled_call(f"{base_url}/chat/completions", payload)
+            before.append(time.perf_counter() - start)
+
+        await http_pool.open()
+        after = []
+        for _ in range(calls):
+            start = time.perf_counter()
+            await client.chat("ping", max_tokens=10)
+            after.append(time.perf_counter() - start)
+
+        print(f"{calls} sequential calls against {base_url}")
+        print(_summary("unpooled", before))
+        print(_summary("pooled", after))
+        print(f"pool stats: {http_pool.stats()}")
+    finally:
+        await http_pool.close()
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(run(args.calls))
@@ -0,0 +1,118 @@
+"""
+PDF text extraction throughput: sync PDFParser vs the async parallel path.
+
+Builds 1-, 10- and 100-page documents by repeating the pages of a sample
+resume and reports pages/second for each mode. Usage (from ai-core/):
+
+    python -m benchmarks.bench_pdf_extract --sample ../server/uploads/resumes/<file>.pdf --workers 4
+"""
+import argparse
+import asyncio
+import glob
+import io
+import os
+import statistics
+import time
+
+import PyPDF2
+
+DEFAULT_SAMPLE_GLOB = os.path.join(os.path.dirname(__file__), "..", "..", "server", "uploads", "resumes", "*.pdf")
+
+
+def build_document(sample: bytes, pages: int) -> bytes:
+    source = PyPDF2.PdfReader(io.BytesIO(sample))
+    writer = PyPDF2.PdfWriter()
+    for i in range(pages):
+        writer.add_page(source.pages[i % len(source.pages)])
+    out = io.BytesIO()
+    writer.write(out)
+    return out.getvalue()
+
+
+def _summary(label: str, pages: int, samples: list, stall: float) -> str:
+    mean = statistics.mean(samples)
+    return (
+        f"  {label:<6} mean={mean * 1000:9.2f}ms  throughput={pages / mean:8.1f} pages/s  "
+        f"max_loop_stall={stall * 1000:8.2f}ms"
+    )
+
+
+class LoopStallMonitor:
+    """Measures the longest gap between event loop ticks, i.e. how long the loop was blocked."""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.max_stall = 0.0
+        self._task = None
+
+    async def _run(self):
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.max_stall = max(self.max_stall, time.perf_counter() - start - self.interval)
+
+    async def __aenter__(self):
+        self.max_stall = 0.0
+        self._task = asyncio.ensure_future(self._run())
+        await asyncio.sleep(0)
+        return self
+
+    async def __aexit__(self, *exc):
+        await asyncio.sleep(self.interval * 2)
+        self._task.cancel()
+
+
+async def run(sample_path: str, sizes: list, repeats: int):
+    from utils.pdf_parser import PDFParser
+
+    with open(sample_path, "rb") as f:
+        sample = f.read()
+
+    print(f"workers={os.environ['PDF_WORKERS']} parallel_min_pages={os.environ['PDF_PARALLEL_MIN_PAGES']} sandbox={os.environ['PDF_SANDBOX']} cpus={os.cpu_count()}")
+    # Start every worker process before timing anything
+    warmup = build_document(sample, int(os.environ["PDF_PARALLEL_MIN_PAGES"]))
+    await asyncio.gather(*(
+        PDFParser.extract_text_from_buffer_async(warmup) for _ in range(int(os.environ["PDF_WORKERS"]))
+    ))
+
+    try:
+        for pages in sizes:
+            document = build_document(sample, pages)
+            sync_samples, async_samples = [], []
+            sync_monitor, async_monitor = LoopStallMonitor(), LoopStallMonitor()
+            for _ in range(repeats):
+                async with sync_monitor:
+                    start = time.perf_counter()
+                    expected = PDFParser.extract_text_from_buffer(document)
+                    sync_samples.append(time.perf_counter() - start)
+
+                async with async_monitor:
+                    start = time.perf_counter()
+                    result = await PDFParser.extract_text_from_buffer_async(document)
+                    async_samples.append(time.perf_counter() - start)
+                assert result == expected, "async extraction must match the sync output"
+
+            print(f"{pages} page(s), {len(document) / 1024:.0f} KiB")
+            print(_summary("sync", pages, sync_samples, sync_monitor.max_stall))
+            print(_summary("async", pages, async_samples, async_monitor.max_stall))
+    finally:
+        PDFParser.shutdown_workers()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sample", default=None, help="PDF to build test documents from")
+    parser.add_argument("--sizes", default="1,10,100")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--parallel-min-pages", type=int, default=16)
+    parser.add_argument("--no-sandbox", action="store_true", help="Extract small documents on a thread instead of the worker pool")
+    args = parser.parse_args()
+
+    sample_path = args.sample or sorted(glob.glob(DEFAULT_SAMPLE_GLOB))[0]
+    os.environ["PDF_WORKERS"] = str(args.workers)
+    os.environ["PDF_PARALLEL_MIN_PAGES"] = str(args.parallel_min_pages)
+    os.environ["PDF_SANDBOX"] = "false" if args.no_sandbox else "true"
+    # Repeats would otherwise be served from the extraction cache
+    os.environ["PDF_CACHE_ENABLED"] = "false"
+    asyncio.run(run(sample_path, [int(s) for s in args.sizes.split(",")], args.repeats))
@@ -0,0 +1,202 @@
+"""
+Experience, company, role and education extraction: the previous regexes in
+ResumeAnalyzer vs the precompiled ones in utils.resume_extractors.
+
+First times both on 1k-50k character resumes built by repeating the text
+of a sample PDF. Then runs the new extractors on adversarial inputs (long
+digit runs, one endless word, repeated keywords on one line, ...) that
+made the old patterns backtrack, at doubling sizes, and reports how the
+time grows: about x2 per doubling is linear, x4 quadratic. The old
+extractors only run on the smaller adversarial sizes, as they take
+minutes on the larger ones. With --check the exit status is 1 if any new
+extractor grows faster than linearly. Usage (from ai-core/):
+
+    python -m benchmarks.bench_resume_extractors --sizes 1000,5000,20000,50000 --check
+"""
+import argparse
+import glob
+import math
+import re
+import statistics
+import sys
+import time
+
+import PyPDF2
+
+from benchmarks.bench_pdf_extract import DEFAULT_SAMPLE_GLOB
+from utils.resume_extractors import (
+    experience_years_by_pattern, find_companies, find_roles, find_degrees, find_certifications, find_institutions
+)
+from utils.text_normalizer import normalize_text
+
+# Growth exponent above which an extractor counts as super-linear (1 is linear, 2 quadratic)
+MAX_GROWTH_EXPONENT = 1.3
+
+
+def legacy_experience_years(text_lower: str) -> list:
+    years = []
+    for pattern in [
+        r'(\d+)\+?\s*years?\s*(?:of\s*)?(?:professional\s*)?experience',
+        r'experience:?\s*(\d+)\+?\s*years?',
+        r'(\d+)\+?\s*years?\s*in\s*(?:the\s*)?(?:field|industry|role)',
+        r'(\d+)\+?\s*years?\s*(?:working|developing|programming)',
+        r'over\s*(\d+)\s*years?',
+        r'more\s*than\s*(\d+)\s*years?'
+    ]:
+        match = re.search(pattern, text_lower)
+        years.append(int(match.group(1)) if match else None)
+    return years
+
+
+def legacy_companies(text: str) -> set:
+    companies = []
+    for pattern in [
+        r'(?:at|@)\s+([A-Z][a-zA-Z\s&.,]+(?:Inc|LLC|Corp|Ltd|Co\.?))',
+        r'([A-Z][a-zA-Z\s&.,]+(?:Technologies|Tech|Systems|Solutions|Services|Software|Inc|LLC|Corp|Ltd))',
+    ]:
+        companies.extend(match.strip() for match in re.findall(pattern, text) if len(match.strip()) > 2)
+    return set(companies)
+
+
+def legacy_roles(text: str) -> set:
+    roles = []
+    text_lower = text.lower()
+    for keyword in [
+        "developer", "engineer", "analyst", "manager", "lead", "senior",
+        "junior", "architect", "consultant", "specialist", "coordinator",
+        "administrator", "designer", "programmer", "scientist"
+    ]:
+        if keyword in text_lower:
+            matches = re.findall(rf'(\w+\s+)*{keyword}(?:\s+\w+)*', text_lower)
+            roles.extend(match.strip() for match in matches if len(match.strip()) > 5)
+    return set(roles)
+
+
+def legacy_education(text: str) -> tuple:
+    degrees, certifications, institutions = [], [], []
+    text_lower = text.lower()
+    for pattern in [
+        r"bachelor(?:'?s)?(?:\s+of\s+|\s+in\s+)?(.*?)(?:\n|,|\.|\s{2,})",
+        r"master(?:'?s)?(?:\s+of\s+|\s+in\s+)?(.*?)(?:\n|,|\.|\s{2,})",
+        r"phd(?:\s+in\s+)?(.*?)(?:\n|,|\.|\s{2,})",
+        r"doctorate(?:\s+in\s+)?(.*?)(?:\n|,|\.|\s{2,})",
+        r"mba(?:\s+in\s+)?(.*?)(?:\n|,|\.|\s{2,})",
+        r"b\.?tech(?:\s+in\s+)?(.*?)(?:\n|,|\.|\s{2,})",
+        r"m\.?tech(?:\s+in\s+)?(.*?)(?:\n|,|\.|\s{2,})"
+    ]:
+        degrees.extend(m.strip() for m in re.findall(pattern, text_lower, re.IGNORECASE) if len(m.strip()) > 2)
+    for pattern in [
+        r"certified?\s+([A-Za-z\s]+)(?:\s+\([A-Z]+\))?",
+        r"certification\s+in\s+([A-Za-z\s]+)",
+        r"([A-Z]{2,})\s+certified",
+        r"aws\s+(.*?)(?:\s+certified|certification)",
+        r"google\s+(.*?)(?:\s+certified|certification)",
+        r"microsoft\s+(.*?)(?:\s+certified|certification)"
+    ]:
+        certifications.extend(m.strip() for m in re.findall(pattern, text_lower, re.IGNORECASE) if len(m.strip()) > 2)
+    for pattern in [
+        r'(?:university|college|institute|school)\s+of\s+([A-Za-z\s]+)',
+        r'([A-Za-z\s]+)\s+(?:university|college|institute)',
+        r'(?:at|from)\s+([A-Z][A-Za-z\s]+(?:University|College|Institute|School))'
+    ]:
+        institutions.extend(m.strip() for m in re.findall(pattern, text, re.IGNORECASE) if len(m.strip()) > 3)
+    return set(degrees), set(certifications), set(institutions)
+
+
+def current_education(text: str) -> tuple:
+    text_lower = text.lower()
+    return find_degrees(text_lower), find_certifications(text_lower), find_institutions(text)
+
+
+LEGACY = {
+    "experience": lambda text: legacy_experience_years(text.lower()),
+    "companies": legacy_companies,
+    "roles": legacy_roles,
+    "education": legacy_education
+}
+
+CURRENT = {
+    "experience": lambda text: experience_years_by_pattern(text.lower()),
+    "companies": find_companies,
+    "roles": lambda text: find_roles(text.lower()),
+    "education": lambda text: current_education(text)
+}
+
+# Keywords that make every old pattern run, put in front of each adversarial body
+_TRIGGERS = "developer university certified aws google microsoft bachelor over experience "
+
+ADVERSARIAL = {
+    "digit run": lambda size: "1" * size,
+    "one long word": lambda size: _TRIGGERS + "a" * size,
+    "lowercase words": lambda size: _TRIGGERS + ("alpha " * size)[:size],
+    "capitalized words": lambda size: _TRIGGERS + ("Alpha Beta " * size)[:size],
+    "keywords on one line": lambda size: (_TRIGGERS * size)[:size],
+    "whitespace runs": lambda size: ("5 years" + " " * 1000 + "x") * (size // 1008 + 1)
+}
+
+
+def _time(fn, text: str, repeats: int) -> float:
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn(text)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def compare_on_sample(sample: str, sizes: list, repeats: int):
+    print("Sample resume text")
+    for size in sizes:
+        text = (sample * (size // len(sample) + 1))[:size]
+        legacy = sum(_time(fn, text, repeats) for fn in LEGACY.values())
+        current = sum(_time(fn, text, repeats) for fn in CURRENT.values())
+        print(f"  {size:>6} chars  old {legacy * 1000:9.3f}ms  new {current * 1000:8.3f}ms  x{legacy / current:.1f}")
+
+
+def growth_exponent(sizes: list, times: list) -> float:
+    """Slope of log(time) over log(size) between the smallest and largest size."""
+    return math.log(times[-1] / times[0]) / math.log(sizes[-1] / sizes[0])
+
+
+def check_adversarial(sizes: list, legacy_max_chars: int, repeats: int) -> bool:
+    linear = True
+    for label, build in ADVERSARIAL.items():
+        print(f"Adversarial input: {label}")
+        for name in CURRENT:
+            times = [_time(CURRENT[name], build(size), repeats) for size in sizes]
+            exponent = growth_exponent(sizes, times)
+            row = "  ".join(f"{size}: {t * 1000:7.3f}ms" for size, t in zip(sizes, times))
+            flag = "" if exponent <= MAX_GROWTH_EXPONENT else "  SUPER-LINEAR"
+            print(f"  new {name:<10} {row}  growth n^{exponent:.2f}{flag}")
+            linear = linear and exponent <= MAX_GROWTH_EXPONENT
+
+            legacy_sizes = [size for size in (legacy_max_chars // 4, legacy_max_chars // 2, legacy_max_chars) if size]
+            legacy_times = [_time(LEGACY[name], build(size), 1) for size in legacy_sizes]
+            row = "  ".join(f"{size}: {t * 1000:7.3f}ms" for size, t in zip(legacy_sizes, legacy_times))
+            print(f"  old {name:<10} {row}  growth n^{growth_exponent(legacy_sizes, legacy_times):.2f}")
+    return linear
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sample", default=None, help="PDF whose text is repeated")
+    parser.add_argument("--sizes", default="1000,5000,20000,50000", help="Resume lengths in characters")
+    parser.add_argument("--adversarial-sizes", default="25000,50000,100000,200000", help="Adversarial input lengths")
+    parser.add_argument("--legacy-max-chars", type=int, default=4000, help="Largest adversarial input given to the old extractors")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--check", action="store_true", help="Exit with status 1 if any new extractor is super-linear")
+    args = parser.parse_args()
+
+    sample_path = args.sample or sorted(glob.glob(DEFAULT_SAMPLE_GLOB))[0]
+    reader = PyPDF2.PdfReader(sample_path)
+    sample = normalize_text("\n".join(page.extract_text() or "" for page in reader.pages))
+
+    compare_on_sample(sample, [int(s) for s in args.sizes.split(",")], args.repeats)
+    linear = check_adversarial([int(s) for s in args.adversarial_sizes.split(",")], args.legacy_max_chars, args.repeats)
+    print("All extractors linear" if linear else "Super-linear extractor found")
+    if args.check and not linear:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Skill extraction: the previous per-skill substring scans in
+ResumeAnalyzer._extract_skills vs the single-pass SkillMatcher.
+
+Builds 1k-50k character resumes by repeating the text of a sample PDF and
+reports time per document for each, plus the skills only one of them
+found (the old scan's false positives, e.g. "Java" inside "JavaScript").
+The old scan's cost grows with the number of skills, so the run is
+repeated with made-up skill names added to the taxonomy file's skills,
+reporting how long that taxonomy takes to compile. Usage (from ai-core/):
+
+    python -m benchmarks.bench_skill_matcher --sizes 1000,5000,20000,50000
+"""
+import argparse
+import copy
+import glob
+import json
+import random
+import statistics
+import string
+import time
+
+import PyPDF2
+
+from benchmarks.bench_pdf_extract import DEFAULT_SAMPLE_GLOB
+from utils.skill_taxonomy import SkillTaxonomy, DEFAULT_TAXONOMY_PATH
+from utils.text_normalizer import normalize_text
+
+
+def legacy_skill_exists(skill: str, text_lower: str) -> bool:
+    """ResumeAnalyzer._skill_exists_in_text before the matcher, variations dict included."""
+    skill_lower = skill.lower()
+    if skill_lower in text_lower:
+        return True
+    variations = {
+        "node.js": ["nodejs", "node js"],
+        "vue.js": ["vuejs", "vue js"],
+        "express.js": ["expressjs", "express js"],
+        "c++": ["cpp", "c plus plus"],
+        "c#": ["c sharp", "csharp"],
+        "asp.net": ["aspnet", "asp net"]
+    }
+    if skill_lower in variations:
+        return any(var in text_lower for var in variations[skill_lower])
+    return False
+
+
+def legacy_find_skills(skill_categories, text: str) -> set:
+    text_lower = text.lower()
+    return {
+        skill
+        for skills in skill_categories.values()
+        for skill in skills
+        if legacy_skill_exists(skill, text_lower)
+    }
+
+
+def synthetic_skills(count: int, seed: int = 7) -> list:
+    """Made-up multi-letter skill names, as a large external taxonomy would add."""
+    rng = random.Random(seed)
+    return [
+        "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 10))).title()
+        for _ in range(count)
+    ]
+
+
+def _time(fn, repeats: int) -> float:
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sample", default=None, help="PDF whose text is repeated")
+    parser.add_argument("--sizes", default="1000,5000,20000,50000", help="Resume lengths in characters")
+    parser.add_argument("--repeats", type=int, default=50)
+    parser.add_argument("--taxonomy", default=DEFAULT_TAXONOMY_PATH, help="Skill taxonomy file")
+    parser.add_argument("--extra-skills", type=int, default=5000, help="Made-up skills added for the second run")
+    args = parser.parse_args()
+
+    sample_path = args.sample or sorted(glob.glob(DEFAULT_SAMPLE_GLOB))[0]
+    reader = PyPDF2.PdfReader(sample_path)
+    sample = normalize_text("\n".join(page.extract_text() or "" for page in reader.pages))
+
+    with open(args.taxonomy, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    variants = [("file", data)]
+    if args.extra_skills:
+        extended = copy.deepcopy(data)
+        extended["categories"]["Synthetic"] = synthetic_skills(args.extra_skills)
+        variants.append((f"file + {args.extra_skills} synthetic", extended))
+
+    for label, taxonomy_data in variants:
+        started = time.perf_counter()
+        taxonomy = SkillTaxonomy(taxonomy_data)
+        print(f"{label} taxonomy ({taxonomy.skill_count} skills), compiled in {(time.perf_counter() - started) * 1000:.2f}ms")
+        skill_categories, matcher = taxonomy.skill_categories, taxonomy.matcher
+
+        for size in [int(s) for s in args.sizes.split(",")]:
+            text = (sample * (size // len(sample) + 1))[:size]
+            legacy_found = legacy_find_skills(skill_categories, text)
+            found = matcher.find(text)
+            legacy = _time(lambda: legacy_find_skills(skill_categories, text), args.repeats)
+            fast = _time(lambda: matcher.find(text), args.repeats)
+            print(
+                f"  {size:>6} chars  substring scans {legacy * 1000:8.3f}ms  matcher {fast * 1000:8.3f}ms  "
+                f"x{legacy / fast:.1f}  skills {len(legacy_found)} -> {len(found)}"
+            )
+            if legacy_found - found:
+                print(f"           only substring scans: {sorted(legacy_found - found)}")
+            if found - legacy_found:
+                print(f"           only matcher: {sorted(found - legacy_found)}")
+
+
+if __name__ == "__main__":
+    main()
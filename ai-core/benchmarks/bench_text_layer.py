@@ -0,0 +1,105 @@
+"""
+"Has text" check: sampling extracted text from the first pages (what
+PDFParser.validate_pdf used to do) vs the content-stream text-layer detector.
+
+Runs both on text documents built from a sample resume and on generated
+image-only documents shaped like scanned resumes. Usage (from ai-core/):
+
+    python -m benchmarks.bench_text_layer --pages 1,3,10
+"""
+import argparse
+import glob
+import io
+import os
+import statistics
+import time
+import zlib
+
+import PyPDF2
+
+from benchmarks.bench_pdf_extract import build_document, DEFAULT_SAMPLE_GLOB
+from utils.pdf_text_layer import detect_text_layer
+
+
+def build_scanned_document(pages: int, width: int = 850, height: int = 1100) -> bytes:
+    """An image-only PDF: each page draws one full-page grayscale image and nothing else."""
+    pixels = zlib.compress(bytes((x * 7 + y * 3) % 256 for y in range(height) for x in range(width)))
+    content = b"q 612 0 0 792 0 0 cm /Im0 Do Q"
+    objects = {1: b"<< /Type /Catalog /Pages 2 0 R >>"}
+    kids = []
+    for i in range(pages):
+        page_id, content_id, image_id = 3 + 3 * i, 4 + 3 * i, 5 + 3 * i
+        kids.append(f"{page_id} 0 R".encode())
+        objects[page_id] = (
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents {content_id} 0 R "
+            f"/Resources << /XObject << /Im0 {image_id} 0 R >> >> >>"
+        ).encode()
+        objects[content_id] = b"<< /Length %d >>\nstream\n%s\nendstream" % (len(content), content)
+        objects[image_id] = (
+            b"<< /Type /XObject /Subtype /Image /Width %d /Height %d /ColorSpace /DeviceGray "
+            b"/BitsPerComponent 8 /Filter /FlateDecode /Length %d >>\nstream\n%s\nendstream"
+        ) % (width, height, len(pixels), pixels)
+    objects[2] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(kids), pages)
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = {}
+    for object_id in sorted(objects):
+        offsets[object_id] = out.tell()
+        out.write(b"%d 0 obj\n%s\nendobj\n" % (object_id, objects[object_id]))
+    xref_offset = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for object_id in sorted(objects):
+        out.write(b"%010d 00000 n \n" % offsets[object_id])
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_offset))
+    return out.getvalue()
+
+
+def sample_extraction_check(document: bytes) -> bool:
+    """The previous check: extract up to three pages until 50 characters are seen."""
+    reader = PyPDF2.PdfReader(io.BytesIO(document))
+    sample_text = ""
+    for i in range(min(3, len(reader.pages))):
+        sample_text += reader.pages[i].extract_text() or ""
+        if len(sample_text.strip()) > 50:
+            return True
+    return False
+
+
+def detector_check(document: bytes) -> bool:
+    return detect_text_layer(PyPDF2.PdfReader(io.BytesIO(document)))["has_text_layer"] is not False
+
+
+def _time(check, document: bytes, repeats: int):
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = check(document)
+        samples.append(time.perf_counter() - start)
+    return result, statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sample", default=None, help="Text PDF to build test documents from")
+    parser.add_argument("--pages", default="1,3,10")
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    sample_path = args.sample or sorted(glob.glob(DEFAULT_SAMPLE_GLOB))[0]
+    with open(sample_path, "rb") as f:
+        sample = f.read()
+
+    for pages in [int(p) for p in args.pages.split(",")]:
+        for kind, document in (("text", build_document(sample, pages)), ("scanned", build_scanned_document(pages))):
+            expected, legacy = _time(sample_extraction_check, document, args.repeats)
+            detected, fast = _time(detector_check, document, args.repeats)
+            assert expected == detected, f"{kind}: detector says {detected}, extraction says {expected}"
+            print(
+                f"{pages:>3} page(s) {kind:<8} has_text={detected!s:<5}  "
+                f"extract-sample {legacy * 1000:8.2f}ms  detector {fast * 1000:7.2f}ms  x{legacy / fast:.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
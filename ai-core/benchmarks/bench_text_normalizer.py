@@ -0,0 +1,82 @@
+"""
+Text cleaning micro-benchmark: the previous six-pass regex chain in
+PDFParser._clean_extracted_text vs the single-pass TextNormalizer.
+
+Builds large multi-page resumes by repeating the raw page text of a sample
+PDF. Usage (from ai-core/):
+
+    python -m benchmarks.bench_text_normalizer --pages 10,50,200
+"""
+import argparse
+import glob
+import os
+import re
+import statistics
+import time
+
+import PyPDF2
+
+from utils.text_normalizer import TextNormalizer
+
+DEFAULT_SAMPLE_GLOB = os.path.join(os.path.dirname(__file__), "..", "..", "server", "uploads", "resumes", "*.pdf")
+
+
+def legacy_clean(text: str) -> str:
+    """The cleaning chain PDFParser used before the single-pass normalizer."""
+    if not text:
+        return ""
+    text = re.sub(r'\n\s*\n', '\n\n', text)
+    text = re.sub(r' +', ' ', text)
+    text = re.sub(r'[^\x00-\x7F]+', ' ', text)
+    text = text.replace('\f', '\n')
+    text = re.sub(r'(?<=[a-z])\n(?=[a-z])', ' ', text)
+    text = re.sub(r'\n+', '\n', text)
+    return text.strip()
+
+
+def _time(fn, repeats: int) -> float:
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def run(sample_path: str, page_counts: list, repeats: int):
+    reader = PyPDF2.PdfReader(sample_path)
+    sample_pages = [page.extract_text() or "" for page in reader.pages]
+    ascii_normalizer = TextNormalizer("ascii")
+    unicode_normalizer = TextNormalizer("unicode")
+
+    for count in page_counts:
+        pages = [sample_pages[i % len(sample_pages)] for i in range(count)]
+        document = "\f".join(pages)
+        size_mb = len(document.encode("utf-8")) / (1024 * 1024)
+        assert ascii_normalizer.normalize(document) == legacy_clean(document), "ascii mode must match the legacy chain"
+
+        results = {
+            "legacy (6 passes)": _time(lambda: legacy_clean(document), repeats),
+            "single-pass ascii": _time(lambda: ascii_normalizer.normalize(document), repeats),
+            "single-pass unicode": _time(lambda: unicode_normalizer.normalize(document), repeats),
+            "unicode per page": _time(lambda: list(unicode_normalizer.normalize_pages(pages)), repeats),
+        }
+
+        print(f"{count} pages, {size_mb:.2f} MiB")
+        baseline = results["legacy (6 passes)"]
+        for label, seconds in results.items():
+            print(
+                f"  {label:<20} {seconds * 1000:9.2f}ms  {size_mb / seconds:7.1f} MiB/s  "
+                f"x{baseline / seconds:4.2f} vs legacy"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sample", default=None, help="PDF whose page text is repeated")
+    parser.add_argument("--pages", default="10,50,200")
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    sample_path = args.sample or sorted(glob.glob(DEFAULT_SAMPLE_GLOB))[0]
+    run(sample_path, [int(p) for p in args.pages.split(",")], args.repeats)
@@ -1,12 +1,16 @@
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import ValidationError
 import uvicorn
 import os
+import json
+import asyncio
+import time
 import logging
 from datetime import datetime
+from typing import Optional
 from dotenv import load_dotenv
 
 # Import models
@@ -22,6 +26,22 @@ from services.quiz_generator import QuizGenerator
 from services.learning_path_gen import LearningPathGenerator
 from services.tutor_service import TutorService
 
+# Import shared utilities
+from utils.http_pool import http_pool
+from utils.llm_cache import llm_cache
+from utils.single_flight import llm_single_flight
+from utils.rate_limiter import llm_rate_limiter
+from utils.circuit_breaker import llm_circuit_breaker
+from utils.llm_replay import llm_replay
+from utils.usage_tracker import llm_usage, endpoint_scope
+from utils.pdf_parser import PDFParser, PDFLimitError
+from utils.pdf_cache import pdf_text_cache
+from utils.pdf_worker_pool import pdf_worker_pool
+from utils.skill_taxonomy import skill_taxonomy
+from utils.cpu_pool import cpu_pool
+from utils.upload_spool import spool_upload, UploadError
+from utils.deadline import deadline_scope, parse_deadline_header
+
 # Load environment variables
 load_dotenv()
 
@@ -66,6 +86,43 @@ except Exception as e:
     tutor_service = None
 
 
+# Default latency budgets (seconds) per endpoint, overridable with
+# e.g. BUDGET_GENERATE_QUIZ_SECONDS=45
+REQUEST_BUDGETS = {
+    "/analyze-resume": 45,
+    "/parse-resume": 60,
+    "/generate-quiz": 60,
+    "/generate-learning-path": 60,
+    "/tutor-ask": 30,
+    "/tutor-ask/stream": 120
+}
+
+
+def get_request_budget(request: Request) -> Optional[float]:
+    """
+    Latency budget for a request: the configured endpoint budget, shortened
+    by the caller's X-Request-Deadline header (Unix epoch milliseconds).
+    """
+    path = request.url.path
+    budget = None
+    if path in REQUEST_BUDGETS:
+        env_name = f"BUDGET_{path.strip('/').replace('-', '_').replace('/', '_').upper()}_SECONDS"
+        budget = float(os.getenv(env_name, REQUEST_BUDGETS[path]))
+    
+    header_budget = parse_deadline_header(request.headers.get("X-Request-Deadline"))
+    if header_budget is not None:
+        budget = header_budget if budget is None else min(budget, header_budget)
+    return budget
+
+
+# Propagate the request's latency budget to every upstream call it makes,
+# and attribute their token usage to the endpoint
+@app.middleware("http")
+async def apply_deadline(request: Request, call_next):
+    with deadline_scope(get_request_budget(request)), endpoint_scope(request.url.path):
+        return await call_next(request)
+
+
 # Middleware for request logging and error handling
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
@@ -98,6 +155,19 @@ async def validation_exception_handler(request: Request, exc: ValidationError):
     )
 
 
+@app.exception_handler(PDFLimitError)
+async def pdf_limit_exception_handler(request: Request, exc: PDFLimitError):
+    return JSONResponse(
+        status_code=413,
+        content=APIResponse(
+            success=False,
+            data=exc.to_dict(),
+            message=str(exc),
+            error="PDF limit exceeded"
+        ).dict()
+    )
+
+
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request: Request, exc: HTTPException):
     return JSONResponse(
@@ -147,9 +217,14 @@ async def health_check():
             "learning_path_generator": learning_path_gen is not None,
             "tutor_service": tutor_service is not None
         },
+        "circuit_breaker": llm_circuit_breaker.stats(),
         "environment": os.getenv("ENVIRONMENT", "development")
     }
     
+    # Services still answer from templates while the AI circuit is open
+    if health_status["circuit_breaker"]["state"] != "closed":
+        health_status["status"] = "degraded"
+    
     # Check if all services are available
     all_services_healthy = all(health_status["services"].values())
     
@@ -190,6 +265,126 @@ async def analyze_resume(request: ResumeAnalysisRequest):
         raise HTTPException(status_code=500, detail=f"Resume analysis failed: {str(e)}")
 
 
+# Resume upload endpoint: PDF upload -> text extraction -> analysis in one request
+@app.post("/parse-resume")
+async def parse_resume(request: Request):
+    """
+    Analyze an uploaded resume PDF (multipart field "file", optional "target_role")
+    and report how long each stage took.
+    
+    With the form field incremental=true, pages are analyzed as they are
+    decoded instead of after the whole document is extracted; extract_ms then
+    only covers opening the document.
+    """
+    if not resume_analyzer:
+        raise HTTPException(status_code=503, detail="Resume analyzer service unavailable")
+    
+    timings = {}
+    started = time.perf_counter()
+    try:
+        upload = await spool_upload(request, file_field="file")
+    except UploadError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+    timings["upload_ms"] = round((time.perf_counter() - started) * 1000, 2)
+    
+    document = None
+    try:
+        logger.info(f"Parsing uploaded resume {upload.filename} ({upload.size} bytes)")
+        
+        incremental = upload.fields.get("incremental", "").lower() == "true"
+        target_role = upload.fields.get("target_role") or None
+        
+        stage_started = time.perf_counter()
+        try:
+            # One parse serves validation, metadata and text
+            document = await PDFParser.parse_file_async(upload.path)
+            if incremental:
+                # Raises on cap violations, unlike validate(), which only reports them
+                await document.inspect_async()
+                validation = document.validate()
+                if document.has_no_text_layer:
+                    raise Exception("PDF has no text layer (scanned or image-only resume)")
+                if not validation["page_count"]:
+                    raise Exception("; ".join(validation["errors"]) or "PDF file is empty or corrupted")
+            else:
+                text = await PDFParser.extract_text_async(document)
+                validation = document.validate()
+            metadata = document.metadata()
+        except PDFLimitError:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=422, detail=f"Could not extract text from PDF: {str(e)}")
+        timings["extract_ms"] = round((time.perf_counter() - stage_started) * 1000, 2)
+        
+        stage_started = time.perf_counter()
+        # Breakdown of analyze_ms: local extraction and the AI call run concurrently
+        analysis_timings = {}
+        if incremental:
+            # Same length limits as /analyze-resume, checked as pages arrive
+            text_length = 0
+            
+            async def checked_pages():
+                nonlocal text_length
+                async for page_text in document.aiter_pages():
+                    text_length += len(page_text) + 1
+                    if text_length > 50000:
+                        raise HTTPException(status_code=422, detail="Resume text must not exceed 50,000 characters")
+                    yield page_text
+                if text_length < 100:
+                    raise HTTPException(status_code=422, detail="Resume text must be at least 100 characters")
+            
+            if target_role is not None:
+                target_role = target_role.strip()
+                if len(target_role) < 2:
+                    raise HTTPException(status_code=422, detail="Target role must be at least 2 characters")
+            analysis = await resume_analyzer.analyze_pages(
+                checked_pages(), target_role=target_role, timings=analysis_timings
+            )
+        else:
+            # Same validation as /analyze-resume
+            analysis_request = ResumeAnalysisRequest(text=text, target_role=target_role)
+            text_length = len(analysis_request.text)
+            analysis = await resume_analyzer.analyze(
+                text=analysis_request.text,
+                target_role=analysis_request.target_role,
+                timings=analysis_timings
+            )
+        timings["analyze_ms"] = round((time.perf_counter() - stage_started) * 1000, 2)
+        timings["analyze_stages"] = analysis_timings
+        timings["total_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        
+        logger.info(f"Uploaded resume analyzed: {timings}")
+        
+        return APIResponse(
+            success=True,
+            data={
+                "analysis": analysis,
+                "file": {"filename": upload.filename, "size_bytes": upload.size},
+                "pdf": {
+                    "metadata": metadata,
+                    "validation": validation,
+                    "from_cache": document.from_cache,
+                    "repeated_lines": document.repeated_lines
+                },
+                "text_length": text_length,
+                "incremental": incremental,
+                "timings": timings
+            },
+            message="Resume parsed and analyzed"
+        )
+        
+    except (HTTPException, ValidationError, PDFLimitError):
+        raise
+    except Exception as e:
+        logger.error(f"Resume parsing failed: {e}")
+        raise HTTPException(status_code=500, detail=f"Resume parsing failed: {str(e)}")
+    finally:
+        # The mapping must go before the file can be deleted on Windows
+        if document is not None:
+            document.close()
+        upload.cleanup()
+
+
 # Quiz Generation endpoint
 @app.post("/generate-quiz")
 async def generate_quiz(request: QuizRequest):
@@ -287,7 +482,93 @@ async def tutor_ask(request: TutorRequest):
         raise HTTPException(status_code=500, detail=f"Tutor request failed: {str(e)}")
 
 
+# Streaming AI Tutor endpoint
+@app.post("/tutor-ask/stream")
+async def tutor_ask_stream(request: TutorRequest):
+    """
+    Ask the AI tutor a question and receive the answer as server-sent events
+    """
+    if not tutor_service:
+        raise HTTPException(status_code=503, detail="Tutor service unavailable")
+
+    logger.info(f"Tutor stream question: {request.question[:50]}...")
+
+    async def event_stream():
+        async for event in tutor_service.ask_stream(
+            question=request.question,
+            context=request.context,
+            subject=request.subject,
+            conversation_id=request.conversation_id
+        ):
+            yield f"event: {event['event']}\ndata: {json.dumps(event['data'])}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+            # Prevents GZipMiddleware from buffering the token stream
+            "Content-Encoding": "identity"
+        }
+    )
+
+
 # Additional utility endpoints
+@app.get("/usage")
+async def usage():
+    """
+    Get LLM token usage per endpoint, per service operation and per model
+    """
+    return APIResponse(
+        success=True,
+        data=llm_usage.stats(),
+        message="Usage retrieved"
+    )
+
+
+@app.get("/metrics")
+async def metrics():
+    """
+    Get runtime metrics for shared AI Core infrastructure
+    """
+    return APIResponse(
+        success=True,
+        data={
+            "http_pool": http_pool.stats(),
+            "llm_cache": llm_cache.stats(),
+            "llm_coalescing": llm_single_flight.stats(),
+            "llm_rate_limiter": llm_rate_limiter.stats(),
+            "llm_circuit_breaker": llm_circuit_breaker.stats(),
+            "llm_replay": llm_replay.stats(),
+            "pdf_text_cache": pdf_text_cache.stats(),
+            "pdf_workers": pdf_worker_pool.stats(),
+            "skill_taxonomy": skill_taxonomy.stats(),
+            "cpu_pool": cpu_pool.stats(),
+            "resume_analysis": resume_analyzer.stats() if resume_analyzer else None
+        },
+        message="Metrics retrieved"
+    )
+
+
+@app.post("/skill-taxonomy/reload")
+async def reload_skill_taxonomy():
+    """
+    Reload the skill taxonomy file now instead of waiting for the change check
+    """
+    try:
+        taxonomy = await asyncio.to_thread(skill_taxonomy.reload)
+    except Exception as e:
+        # The previous taxonomy stays in use
+        raise HTTPException(status_code=422, detail=f"Skill taxonomy not reloaded: {str(e)}")
+    
+    return APIResponse(
+        success=True,
+        data=taxonomy.summary(),
+        message="Skill taxonomy reloaded"
+    )
+
+
 @app.get("/services/status")
 async def services_status():
     """
@@ -363,6 +644,7 @@ async def models_info():
 async def startup_event():
     logger.info("SkillForge AI Core starting up...")
     logger.info(f"Environment: {os.getenv('ENVIRONMENT', 'development')}")
+    await http_pool.open()
     logger.info("AI Core services ready!")
 
 
@@ -370,6 +652,11 @@ async def startup_event():
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info("SkillForge AI Core shutting down...")
+    await http_pool.close()
+    llm_cache.close()
+    pdf_text_cache.close()
+    PDFParser.shutdown_workers()
+    cpu_pool.shutdown()
 
 
 # Main entry point
@@ -4,6 +4,8 @@ import uuid
 from typing import Dict, List, Any
 from datetime import datetime, timedelta
 from utils.perplexity_client import PerplexityClient
+from utils.circuit_breaker import CircuitOpenError
+from utils.deadline import DeadlineExceeded
 from models.response_models import (
     LearningModule, LearningResource, LearningAssessment, 
     LearningPathResponse
@@ -46,6 +48,10 @@ class LearningPathGenerator:
 
     async def generate(self, goal: str, timeline: int, current_skills: List[str], learning_style: str = "mixed", hours_per_week: int = 10) -> LearningPathResponse:
         try:
+            # Upstream known to be degraded: go straight to the template path
+            if not self.perplexity.is_available():
+                return self._generate_fallback_path(goal, timeline, current_skills, learning_style, hours_per_week)
+            
             # Determine learning track info
             track_info = self._get_track_info(goal)
             
@@ -97,10 +103,18 @@ class LearningPathGenerator:
         prompt = self._create_learning_path_prompt(goal, timeline, current_skills, learning_style, hours_per_week)
         
         try:
-            ai_response = await self.perplexity.chat(prompt)
+            ai_response = await self.perplexity.chat(
+                prompt, priority="batch", operation="LearningPathGenerator._generate_modules_with_ai"
+            )
             modules = self._parse_ai_learning_response(ai_response, timeline, hours_per_week)
+            if not modules:
+                # Unusable response: don't serve it again from the cache
+                await self.perplexity.invalidate_cache(prompt)
             return modules
             
+        except (CircuitOpenError, DeadlineExceeded):
+            # Let generate() return the template path
+            raise
         except Exception as e:
             print(f"AI generation failed: {e}")
             return []
@@ -386,6 +386,8 @@ import random
 from typing import Dict, List, Any
 from datetime import datetime
 from utils.perplexity_client import PerplexityClient
+from utils.circuit_breaker import CircuitOpenError
+from utils.deadline import DeadlineExceeded
 from models.response_models import QuizQuestion, QuizSettings, QuizResponse
 
 
@@ -418,6 +420,11 @@ class QuizGenerator:
         try:
             print(f"🎯 Starting quiz generation: {topic} - {difficulty} - {num_questions} questions")
             
+            # Upstream known to be degraded: skip the AI retries entirely
+            if not self.perplexity.is_available():
+                print("⚡ AI circuit open, using smart fallback")
+                return await self._generate_smart_fallback_quiz(topic, difficulty, num_questions, category)
+            
             settings = self.difficulty_settings.get(difficulty, self.difficulty_settings["intermediate"])
             
             # Generate quiz with AI (with better retry mechanism)
@@ -474,7 +481,11 @@ class QuizGenerator:
                 print(f"🤖 AI Generation Attempt {attempt + 1}/{max_retries}")
                 
                 prompt = self._create_enhanced_quiz_prompt(topic, difficulty, num_questions, settings)
-                ai_response = await self.perplexity.chat(prompt, max_tokens=4000, temperature=0.7)
+                # Shorter cache TTL than the default so popular topics still rotate questions
+                ai_response = await self.perplexity.chat(
+                    prompt, max_tokens=4000, temperature=0.7, cache_ttl=6 * 3600, priority="batch",
+                    operation="QuizGenerator._generate_questions_with_ai_retry"
+                )
                 
                 print(f"📝 AI Response received, length: {len(ai_response)}")
                 
@@ -485,7 +496,12 @@ class QuizGenerator:
                     return questions
                 else:
                     print(f"⚠️ Only {len(questions)} questions parsed, retrying...")
+                    # Don't let the retry (or the next user) get the same unusable response
+                    await self.perplexity.invalidate_cache(prompt, max_tokens=4000, temperature=0.7)
                     
+            except (CircuitOpenError, DeadlineExceeded):
+                # No point retrying; generate() falls back to the template quiz
+                raise
             except Exception as e:
                 print(f"❌ AI generation attempt {attempt + 1} failed: {e}")
                 if attempt == max_retries - 1:
@@ -745,11 +761,16 @@ Return only JSON format:
   }}
 ]}}
 """
-            response = await self.perplexity.chat(focused_prompt, max_tokens=2000, temperature=0.8)
+            response = await self.perplexity.chat(
+                focused_prompt, max_tokens=2000, temperature=0.8, priority="batch",
+                operation="QuizGenerator._generate_supplementary_questions"
+            )
             questions = self._parse_ai_response_enhanced(response, topic, difficulty)
             
             if questions:
                 return questions[:num_needed]
+            
+            await self.perplexity.invalidate_cache(focused_prompt, max_tokens=2000, temperature=0.8)
                 
         except Exception as e:
             print(f"⚠️ Supplementary AI generation failed: {e}")
@@ -1,243 +1,361 @@
+import time
 import asyncio
-import re
 import json
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, AsyncIterable, AsyncIterator, Iterable, Set, Union
 from datetime import datetime
 from utils.perplexity_client import PerplexityClient
+from utils.text_normalizer import normalize_text
+from utils.cpu_pool import cpu_pool
+from utils.skill_taxonomy import skill_taxonomy, SkillTaxonomy
+from utils.resume_document import ResumeDocument
+from utils.resume_extractors import (
+    EXPERIENCE_PATTERN_COUNT, experience_years_by_pattern, find_companies, find_roles,
+    find_degrees, find_certifications, find_institutions
+)
 from models.response_models import (
     SkillAnalysis, SkillCategory, ResumeAnalysisResponse, 
     JobSuggestion, ResumeScore
 )
 
+# Characters of resume text included in the AI prompt
+AI_PROMPT_CHARS = 3000
+
+# Characters taken from each side of a page boundary to catch matches split across pages
+PAGE_SEAM_CHARS = 100
+
+_EXPERT_INDICATORS = ["expert", "advanced", "lead", "senior", "architect", "years"]
+_INTERMEDIATE_INDICATORS = ["proficient", "experienced", "solid", "good"]
+
+# Resume sections each field is read from; the whole text when a resume has none of them.
+# Skills, proficiency and years of experience are read from the whole text
+_FIELD_SECTIONS = {
+    "companies": ("experience",),
+    "roles": ("experience",),
+    "industries": ("experience", "projects"),
+    "degrees": ("education",),
+    "certifications": ("certifications", "education", "skills"),
+    "institutions": ("education",)
+}
+
+
 class ResumeAnalyzer:
     def __init__(self):
         self.perplexity = PerplexityClient()
-        self.skill_categories = {
-            "Programming Languages": [
-                "JavaScript", "TypeScript", "Python", "Java", "C++", "C#", "PHP", 
-                "Ruby", "Go", "Rust", "Kotlin", "Swift", "Dart", "Scala", "R"
-            ],
-            "Frontend": [
-                "React", "Vue.js", "Angular", "HTML", "CSS", "SASS", "LESS", 
-                "Bootstrap", "Tailwind CSS", "Material-UI", "Ant Design", "jQuery"
-            ],
-            "Backend": [
-                "Node.js", "Express.js", "Django", "Flask", "FastAPI", "Spring Boot", 
-                "Laravel", "Ruby on Rails", "ASP.NET", "Gin", "Echo"
-            ],
-            "Mobile": [
-                "React Native", "Flutter", "iOS", "Android", "Xamarin", 
-                "Ionic", "PhoneGap", "Cordova"
-            ],
-            "Database": [
-                "MongoDB", "MySQL", "PostgreSQL", "Redis", "Elasticsearch", 
-                "Cassandra", "DynamoDB", "Firebase", "SQLite", "Oracle"
-            ],
-            "Cloud & DevOps": [
-                "AWS", "Azure", "GCP", "Docker", "Kubernetes", "Terraform", 
-                "Ansible", "Jenkins", "CI/CD", "Nginx", "Apache"
-            ],
-            "Data Science & AI": [
-                "TensorFlow", "PyTorch", "scikit-learn", "Pandas", "NumPy", 
-                "Jupyter", "Matplotlib", "Seaborn", "OpenCV", "NLTK"
-            ],
-            "Testing": [
-                "Jest", "Cypress", "Selenium", "JUnit", "PyTest", "Mocha", 
-                "Chai", "TestNG", "Postman", "Newman"
-            ],
-            "Tools & Others": [
-                "Git", "GitHub", "GitLab", "Jira", "Confluence", "VS Code", 
-                "IntelliJ IDEA", "Eclipse", "Figma", "Adobe XD"
-            ]
-        }
+        # Loaded here so a broken taxonomy file fails at startup; requests use skill_taxonomy.current()
+        skill_taxonomy.current()
 
-        self.job_roles = {
-            "Frontend Developer": ["frontend", "front-end", "ui", "user interface", "react", "angular", "vue"],
-            "Backend Developer": ["backend", "back-end", "server", "api", "database", "microservices"],
-            "Full Stack Developer": ["full stack", "fullstack", "full-stack", "end-to-end"],
-            "Data Scientist": ["data scientist", "machine learning", "ml", "ai", "analytics"],
-            "DevOps Engineer": ["devops", "infrastructure", "deployment", "ci/cd", "kubernetes"],
-            "Mobile Developer": ["mobile", "ios", "android", "react native", "flutter"],
-            "QA Engineer": ["qa", "quality assurance", "testing", "test automation"]
+        self.industries = [
+            "fintech", "healthcare", "e-commerce", "education", "gaming",
+            "automotive", "banking", "insurance", "retail", "media",
+            "telecommunications", "consulting", "manufacturing"
+        ]
+
+        # Stage durations over all analyses, see stats()
+        self._stage_stats: Dict[str, Dict[str, float]] = {}
+
+        # Field extractors, each given (text, lower-cased text) of the field's sections
+        self._field_extractors = {
+            "companies": lambda text, text_lower: find_companies(text),
+            "roles": lambda text, text_lower: find_roles(text_lower),
+            "industries": lambda text, text_lower: self._find_industries(text_lower),
+            "degrees": lambda text, text_lower: find_degrees(text_lower),
+            "certifications": lambda text, text_lower: find_certifications(text_lower),
+            "institutions": lambda text, text_lower: find_institutions(text)
         }
 
-    async def analyze(self, text: str, target_role: Optional[str] = None) -> ResumeAnalysisResponse:
+    async def analyze(
+        self,
+        text: str,
+        target_role: Optional[str] = None,
+        timings: Optional[Dict[str, float]] = None
+    ) -> ResumeAnalysisResponse:
+        """
+        Analyze resume text.
+
+        The AI call starts as soon as the text is normalized, and the local
+        extraction runs on cpu_pool meanwhile, so an analysis takes about as
+        long as the slower of the two instead of their sum and the event loop
+        stays free for other requests. Stage durations (normalize_ms,
+        local_ms, ai_ms, total_ms) are added to ``timings`` if given and
+        summarized in stats().
+        """
+        stages: Dict[str, float] = {}
+        started = time.perf_counter()
+        ai_task: Optional[asyncio.Task] = None
         try:
-            skills = self._extract_skills(text)
-            experience = self._extract_experience(text)
-            education = self._extract_education(text)
-            score = self._calculate_score(skills, experience, education)
-            job_suggestions = self._generate_job_suggestions(skills, target_role)
-            ai_insights = await self._analyze_with_ai(text, target_role)
-            recommendations = self._generate_recommendations(skills, experience, target_role)
-            return ResumeAnalysisResponse(
-                skills=skills,
-                experience=experience,
-                education=education,
-                score=score,
-                job_suggestions=job_suggestions,
-                ai_insights=ai_insights,
-                recommendations=recommendations
-            )
+            # One taxonomy version for the whole analysis, even if a reload lands meanwhile
+            taxonomy = skill_taxonomy.current()
+            # Same normalization as PDFParser output, so text posted by the Node server is treated alike
+            text = await cpu_pool.run(normalize_text, text)
+            stages["normalize_ms"] = _ms_since(started)
+            ai_task = asyncio.create_task(self._timed_ai(text, target_role, stages))
+            local_started = time.perf_counter()
+            local = await cpu_pool.run(self._analyze_locally, text, target_role, taxonomy)
+            stages["local_ms"] = _ms_since(local_started)
+            ai_insights = await ai_task
+            stages["total_ms"] = _ms_since(started)
+            return ResumeAnalysisResponse(ai_insights=ai_insights, **local)
         except Exception as e:
             raise Exception(f"Resume analysis failed: {str(e)}")
+        finally:
+            if ai_task is not None and not ai_task.done():
+                ai_task.cancel()
+            self._record_stages(stages, timings)
+
+    async def analyze_pages(
+        self,
+        pages: Union[Iterable[str], AsyncIterable[str]],
+        target_role: Optional[str] = None,
+        timings: Optional[Dict[str, float]] = None
+    ) -> ResumeAnalysisResponse:
+        """
+        Incremental counterpart of analyze() for text that arrives page by page,
+        e.g. from ParsedDocument.aiter_pages().
+
+        Skills, experience and education are extracted from each page on
+        cpu_pool as it arrives, plus a short seam across each page boundary,
+        and the AI call starts as soon as enough text for its prompt has been
+        seen. Parsing of later pages therefore overlaps with the analysis,
+        and the joined document text is never built. local_ms adds up the
+        time spent on the pages. Errors raised by ``pages`` propagate
+        unchanged.
+        """
+        stages: Dict[str, float] = {}
+        started = time.perf_counter()
+        local_seconds = 0.0
+        scan = self._new_page_scan(skill_taxonomy.current())
+        ai_task: Optional[asyncio.Task] = None
+        try:
+            async for page in _aiter_pages(pages):
+                local_started = time.perf_counter()
+                await cpu_pool.run(lambda: self._scan_page(scan, normalize_text(page)))
+                local_seconds += time.perf_counter() - local_started
+                if ai_task is None and len(scan["prefix"]) > AI_PROMPT_CHARS:
+                    ai_task = asyncio.create_task(
+                        self._timed_ai(normalize_text(scan["prefix"]), target_role, stages)
+                    )
+
+            try:
+                if ai_task is None:
+                    ai_task = asyncio.create_task(
+                        self._timed_ai(normalize_text(scan["prefix"]), target_role, stages)
+                    )
+                local_started = time.perf_counter()
+                local = await cpu_pool.run(self._finish_page_scan, scan, target_role)
+                local_seconds += time.perf_counter() - local_started
+                stages["local_ms"] = round(local_seconds * 1000, 2)
+                ai_insights = await ai_task
+                stages["total_ms"] = _ms_since(started)
+                return ResumeAnalysisResponse(ai_insights=ai_insights, **local)
+            except Exception as e:
+                raise Exception(f"Resume analysis failed: {str(e)}")
+        finally:
+            if ai_task is not None and not ai_task.done():
+                ai_task.cancel()
+            self._record_stages(stages, timings)
+
+    def _analyze_locally(self, text: str, target_role: Optional[str], taxonomy: SkillTaxonomy) -> Dict[str, Any]:
+        """Everything but the AI insights, from normalized text; runs on cpu_pool."""
+        document = ResumeDocument(text)
+        skills = self._extract_skills(document, taxonomy)
+        fields = self._extract_fields(document)
+        experience = self._build_experience(
+            experience_years_by_pattern(document.lower),
+            list(fields["companies"]), list(fields["roles"]), self._industry_titles(fields["industries"])
+        )
+        education = self._build_education(fields["degrees"], fields["certifications"], fields["institutions"])
+        return self._local_results(skills, experience, education, target_role, taxonomy)
+
+    def _finish_page_scan(self, scan: Dict[str, Any], target_role: Optional[str]) -> Dict[str, Any]:
+        """_analyze_locally() for an incremental scan whose pages have all been folded in."""
+        proficiency = self._proficiency_level(scan["indicators"])
+        skills = self._build_skill_analysis(scan["skills"], proficiency, scan["taxonomy"])
+        fields = self._scanned_fields(scan)
+        experience = self._build_experience(
+            scan["years"], list(fields["companies"]), list(fields["roles"]), self._industry_titles(fields["industries"])
+        )
+        education = self._build_education(fields["degrees"], fields["certifications"], fields["institutions"])
+        return self._local_results(skills, experience, education, target_role, scan["taxonomy"])
+
+    def _local_results(
+        self,
+        skills: SkillAnalysis,
+        experience: Dict[str, Any],
+        education: Dict[str, Any],
+        target_role: Optional[str],
+        taxonomy: SkillTaxonomy
+    ) -> Dict[str, Any]:
+        return {
+            "skills": skills,
+            "experience": experience,
+            "education": education,
+            "score": self._calculate_score(skills, experience, education),
+            "job_suggestions": self._generate_job_suggestions(skills, target_role, taxonomy),
+            "recommendations": self._generate_recommendations(skills, experience, target_role)
+        }
+
+    async def _timed_ai(self, text: str, target_role: Optional[str], stages: Dict[str, float]) -> Dict[str, Any]:
+        started = time.perf_counter()
+        try:
+            return await self._analyze_with_ai(text, target_role)
+        finally:
+            stages["ai_ms"] = _ms_since(started)
+
+    def _record_stages(self, stages: Dict[str, float], timings: Optional[Dict[str, float]]):
+        if timings is not None:
+            timings.update(stages)
+        for stage, ms in stages.items():
+            summary = self._stage_stats.setdefault(stage, {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+            summary["count"] += 1
+            summary["total_ms"] += ms
+            summary["max_ms"] = max(summary["max_ms"], ms)
+
+    def stats(self) -> Dict[str, Any]:
+        """Duration of each analysis stage over all analyses so far."""
+        return {
+            stage: {
+                "count": summary["count"],
+                "mean_ms": round(summary["total_ms"] / summary["count"], 2),
+                "max_ms": round(summary["max_ms"], 2)
+            }
+            for stage, summary in self._stage_stats.items()
+        }
 
-    def _extract_skills(self, text: str) -> SkillAnalysis:
-        text_lower = text.lower()
-        found_skills = []
+    def _new_page_scan(self, taxonomy: SkillTaxonomy) -> Dict[str, Any]:
+        return {
+            "taxonomy": taxonomy,
+            "skills": set(),
+            "indicators": set(),
+            "years": [None] * EXPERIENCE_PATTERN_COUNT,
+            # Per field, what was found in its sections and anywhere; the latter is
+            # only collected until one of the field's sections has been seen
+            "fields": {field: {"in_sections": set(), "anywhere": set()} for field in _FIELD_SECTIONS},
+            "section": None,
+            "sections_seen": set(),
+            "prefix": "",
+            "tail": ""
+        }
+
+    def _scan_page(self, scan: Dict[str, Any], page: str):
+        """Fold one cleaned page into an incremental scan."""
+        if not page:
+            return
+        if scan["tail"]:
+            # Only skills and years are short enough to be usefully matched across a page break
+            seam = normalize_text(scan["tail"] + "\n" + page[:PAGE_SEAM_CHARS])
+            scan["skills"].update(scan["taxonomy"].matcher.find(seam))
+            self._merge_years(scan["years"], experience_years_by_pattern(seam.lower()))
+        # A section still open at the end of the previous page continues on this one
+        document = ResumeDocument(page, scan["section"])
+        scan["skills"].update(self._find_skills(document, scan["taxonomy"]))
+        scan["indicators"].update(self._find_proficiency_indicators(document.lower))
+        self._merge_years(scan["years"], experience_years_by_pattern(document.lower))
+        for field, sections in _FIELD_SECTIONS.items():
+            extract = self._field_extractors[field]
+            found = scan["fields"][field]
+            if document.has_section(sections):
+                text, text_lower = document.section_text(sections), document.section_text(sections, lower=True)
+                found["in_sections"].update(extract(text, text_lower))
+            if scan["sections_seen"].isdisjoint(sections):
+                found["anywhere"].update(extract(document.text, document.lower))
+        scan["sections_seen"].update(document.sections)
+        scan["section"] = document.last_section
+        if len(scan["prefix"]) <= AI_PROMPT_CHARS:
+            scan["prefix"] = f"{scan['prefix']}\n{page}" if scan["prefix"] else page
+        scan["tail"] = page[-PAGE_SEAM_CHARS:]
+
+    @staticmethod
+    def _scanned_fields(scan: Dict[str, Any]) -> Dict[str, Set[str]]:
+        # Same choice as ResumeDocument.scope(): the field's sections if the resume had any
+        return {
+            field: found["anywhere"] if scan["sections_seen"].isdisjoint(_FIELD_SECTIONS[field]) else found["in_sections"]
+            for field, found in scan["fields"].items()
+        }
+
+    @staticmethod
+    def _merge_years(years: List[Optional[int]], page_years: List[Optional[int]]):
+        # Keep the first match of each pattern in reading order, like analyze()
+        for i, value in enumerate(page_years):
+            if years[i] is None:
+                years[i] = value
+
+    def _extract_skills(self, document: ResumeDocument, taxonomy: SkillTaxonomy) -> SkillAnalysis:
+        return self._build_skill_analysis(
+            self._find_skills(document, taxonomy),
+            self._proficiency_level(self._find_proficiency_indicators(document.lower)),
+            taxonomy
+        )
+
+    def _find_skills(self, document: ResumeDocument, taxonomy: SkillTaxonomy) -> Set[str]:
+        # Needs the original text too: short names like "R" and "Go" are matched case-sensitively
+        return taxonomy.matcher.find(document.text, document.lower)
+
+    def _build_skill_analysis(self, found: Set[str], proficiency: str, taxonomy: SkillTaxonomy) -> SkillAnalysis:
         skills_by_category = {}
         categories = []
-        for category, skills in self.skill_categories.items():
-            category_skills = []
-            for skill in skills:
-                if self._skill_exists_in_text(skill, text_lower):
-                    category_skills.append(skill)
-                    found_skills.append(skill)
+        for category, skills in taxonomy.skill_categories.items():
+            category_skills = [skill for skill in skills if skill in found]
             if category_skills:
                 skills_by_category[category] = category_skills
                 categories.append(SkillCategory(
                     name=category,
                     skills=category_skills,
-                    proficiency=self._estimate_proficiency(category_skills, text)
+                    proficiency=proficiency
                 ))
-        found_skills = list(set(found_skills))
+        found_skills = list(found)
         return SkillAnalysis(
             identified=found_skills,
             by_category=skills_by_category,
-            missing=self._suggest_missing_skills(found_skills, target_role=None),
+            missing=self._suggest_missing_skills(found_skills, None, taxonomy),
             categories=categories
         )
 
-    def _skill_exists_in_text(self, skill: str, text_lower: str) -> bool:
-        skill_lower = skill.lower()
-        if skill_lower in text_lower:
-            return True
-        variations = {
-            "node.js": ["nodejs", "node js"],
-            "vue.js": ["vuejs", "vue js"],
-            "express.js": ["expressjs", "express js"],
-            "c++": ["cpp", "c plus plus"],
-            "c#": ["c sharp", "csharp"],
-            "asp.net": ["aspnet", "asp net"]
+    def _extract_fields(self, document: ResumeDocument) -> Dict[str, Set[str]]:
+        return {
+            field: self._field_extractors[field](document.scope(sections), document.scope(sections, lower=True))
+            for field, sections in _FIELD_SECTIONS.items()
         }
-        if skill_lower in variations:
-            return any(var in text_lower for var in variations[skill_lower])
-        return False
-
-    def _extract_experience(self, text: str) -> Dict[str, Any]:
-        experience_patterns = [
-            r'(\d+)\+?\s*years?\s*(?:of\s*)?(?:professional\s*)?experience',
-            r'experience:?\s*(\d+)\+?\s*years?',
-            r'(\d+)\+?\s*years?\s*in\s*(?:the\s*)?(?:field|industry|role)',
-            r'(\d+)\+?\s*years?\s*(?:working|developing|programming)',
-            r'over\s*(\d+)\s*years?',
-            r'more\s*than\s*(\d+)\s*years?'
-        ]
-        total_years = 0
-        for pattern in experience_patterns:
-            matches = re.findall(pattern, text.lower())
-            if matches:
-                total_years = max(total_years, int(matches[0]))
-        companies = self._extract_companies(text)
-        roles = self._extract_roles(text)
+
+    def _build_experience(
+        self,
+        years_by_pattern: List[Optional[int]],
+        companies: List[str],
+        roles: List[str],
+        industries: List[str]
+    ) -> Dict[str, Any]:
+        total_years = max([0] + [years for years in years_by_pattern if years is not None])
         return {
             "total_years": total_years,
             "level": self._determine_experience_level(total_years),
             "companies": companies[:5],
             "roles": roles[:5],
-            "industries": self._extract_industries(text)
+            "industries": industries
         }
 
-    def _extract_companies(self, text: str) -> List[str]:
-        company_patterns = [
-            r'(?:at|@)\s+([A-Z][a-zA-Z\s&.,]+(?:Inc|LLC|Corp|Ltd|Co\.?))',
-            r'([A-Z][a-zA-Z\s&.,]+(?:Technologies|Tech|Systems|Solutions|Services|Software|Inc|LLC|Corp|Ltd))',
-        ]
-        companies = []
-        for pattern in company_patterns:
-            matches = re.findall(pattern, text)
-            companies.extend([match.strip() for match in matches if len(match.strip()) > 2])
-        return list(set(companies))
-
-    def _extract_roles(self, text: str) -> List[str]:
-        role_keywords = [
-            "developer", "engineer", "analyst", "manager", "lead", "senior",
-            "junior", "architect", "consultant", "specialist", "coordinator",
-            "administrator", "designer", "programmer", "scientist"
-        ]
-        roles = []
-        text_lower = text.lower()
-        for keyword in role_keywords:
-            if keyword in text_lower:
-                pattern = rf'(\w+\s+)*{keyword}(?:\s+\w+)*'
-                matches = re.findall(pattern, text_lower)
-                if matches:
-                    roles.extend([match.strip() for match in matches if len(match.strip()) > 5])
-        return list(set(roles))
-
-    def _extract_industries(self, text: str) -> List[str]:
-        industries = [
-            "fintech", "healthcare", "e-commerce", "education", "gaming",
-            "automotive", "banking", "insurance", "retail", "media",
-            "telecommunications", "consulting", "manufacturing"
-        ]
-        found_industries = []
-        text_lower = text.lower()
-        for industry in industries:
-            if industry in text_lower:
-                found_industries.append(industry.title())
-        return found_industries
-
-    def _extract_education(self, text: str) -> Dict[str, Any]:
-        education_patterns = {
-            "degrees": [
-                r"bachelor(?:'?s)?(?:\s+of\s+|\s+in\s+)?(.*?)(?:\n|,|\.|\s{2,})",
-                r"master(?:'?s)?(?:\s+of\s+|\s+in\s+)?(.*?)(?:\n|,|\.|\s{2,})",
-                r"phd(?:\s+in\s+)?(.*?)(?:\n|,|\.|\s{2,})",
-                r"doctorate(?:\s+in\s+)?(.*?)(?:\n|,|\.|\s{2,})",
-                r"mba(?:\s+in\s+)?(.*?)(?:\n|,|\.|\s{2,})",
-                r"b\.?tech(?:\s+in\s+)?(.*?)(?:\n|,|\.|\s{2,})",
-                r"m\.?tech(?:\s+in\s+)?(.*?)(?:\n|,|\.|\s{2,})"
-            ],
-            "certifications": [
-                r"certified?\s+([A-Za-z\s]+)(?:\s+\([A-Z]+\))?",
-                r"certification\s+in\s+([A-Za-z\s]+)",
-                r"([A-Z]{2,})\s+certified",
-                r"aws\s+(.*?)(?:\s+certified|certification)",
-                r"google\s+(.*?)(?:\s+certified|certification)",
-                r"microsoft\s+(.*?)(?:\s+certified|certification)"
-            ]
+    def _find_industries(self, text_lower: str) -> Set[str]:
+        return {industry for industry in self.industries if industry in text_lower}
+
+    def _industry_titles(self, industries: Set[str]) -> List[str]:
+        return [industry.title() for industry in self.industries if industry in industries]
+
+    @staticmethod
+    def _build_education(degrees: Set[str], certifications: Set[str], institutions: Set[str]) -> Dict[str, Any]:
+        return {
+            "degrees": list(degrees)[:5],
+            "certifications": list(certifications)[:10],
+            "institutions": list(institutions)[:5]
         }
-        degrees = []
-        certifications = []
-        institutions = []
-        text_lower = text.lower()
-        for pattern in education_patterns["degrees"]:
-            matches = re.findall(pattern, text_lower, re.IGNORECASE)
-            degrees.extend([match.strip() for match in matches if len(match.strip()) > 2])
-        for pattern in education_patterns["certifications"]:
-            matches = re.findall(pattern, text_lower, re.IGNORECASE)
-            certifications.extend([match.strip() for match in matches if len(match.strip()) > 2])
-        institution_patterns = [
-            r'(?:university|college|institute|school)\s+of\s+([A-Za-z\s]+)',
-            r'([A-Za-z\s]+)\s+(?:university|college|institute)',
-            r'(?:at|from)\s+([A-Z][A-Za-z\s]+(?:University|College|Institute|School))'
-        ]
-        for pattern in institution_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            institutions.extend([match.strip() for match in matches if len(match.strip()) > 3])
+
+    def _find_proficiency_indicators(self, text_lower: str) -> Set[str]:
         return {
-            "degrees": list(set(degrees))[:5],
-            "certifications": list(set(certifications))[:10],
-            "institutions": list(set(institutions))[:5]
+            indicator
+            for indicator in _EXPERT_INDICATORS + _INTERMEDIATE_INDICATORS
+            if indicator in text_lower
         }
 
-    def _estimate_proficiency(self, skills: List[str], text: str) -> str:
-        text_lower = text.lower()
-        expert_indicators = ["expert", "advanced", "lead", "senior", "architect", "years"]
-        intermediate_indicators = ["proficient", "experienced", "solid", "good"]
-        expert_count = sum(1 for indicator in expert_indicators if indicator in text_lower)
-        intermediate_count = sum(1 for indicator in intermediate_indicators if indicator in text_lower)
+    def _proficiency_level(self, indicators: Set[str]) -> str:
+        expert_count = sum(1 for indicator in _EXPERT_INDICATORS if indicator in indicators)
+        intermediate_count = sum(1 for indicator in _INTERMEDIATE_INDICATORS if indicator in indicators)
         if expert_count >= 2:
             return "Advanced"
         elif intermediate_count >= 1 or expert_count >= 1:
@@ -279,58 +397,36 @@ class ResumeAnalyzer:
             }
         )
 
-    def _generate_job_suggestions(self, skills: SkillAnalysis, target_role: Optional[str]) -> List[JobSuggestion]:
+    def _generate_job_suggestions(
+        self, skills: SkillAnalysis, target_role: Optional[str], taxonomy: SkillTaxonomy
+    ) -> List[JobSuggestion]:
         suggestions = []
         identified_skills = set(skill.lower() for skill in skills.identified)
-        for role, keywords in self.job_roles.items():
+        for role, keywords in taxonomy.job_roles.items():
+            if not keywords:
+                continue
             match_count = sum(1 for keyword in keywords if keyword in identified_skills)
             match_percentage = min(int((match_count / len(keywords)) * 100), 100)
             if match_percentage > 20:
-                required_skills = self._get_role_requirements(role)
+                required_skills = taxonomy.role_requirements(role)
                 missing_skills = [skill for skill in required_skills if skill.lower() not in identified_skills]
                 suggestions.append(JobSuggestion(
                     title=role,
                     match_percentage=match_percentage,
                     requirements=required_skills,
                     missing_skills=missing_skills,
-                    salary_range=self._get_salary_range(role)
+                    salary_range=taxonomy.salary_range(role)
                 ))
         suggestions.sort(key=lambda x: x.match_percentage, reverse=True)
         return suggestions[:5]
 
-    def _get_role_requirements(self, role: str) -> List[str]:
-        role_requirements = {
-            "Frontend Developer": ["JavaScript", "React", "HTML", "CSS", "Git"],
-            "Backend Developer": ["Python", "Node.js", "Database", "API", "Git"],
-            "Full Stack Developer": ["JavaScript", "React", "Node.js", "Database", "Git"],
-            "Data Scientist": ["Python", "Pandas", "Machine Learning", "SQL", "Statistics"],
-            "DevOps Engineer": ["AWS", "Docker", "Kubernetes", "CI/CD", "Git"],
-            "Mobile Developer": ["React Native", "Flutter", "iOS", "Android", "Git"],
-            "QA Engineer": ["Testing", "Automation", "Selenium", "API Testing", "Git"]
-        }
-        return role_requirements.get(role, ["Programming", "Problem Solving", "Git"])
-
-    def _get_salary_range(self, role: str) -> Dict[str, Any]:
-        salary_ranges = {
-            "Frontend Developer": {"min": 60000, "max": 120000, "currency": "USD"},
-            "Backend Developer": {"min": 70000, "max": 130000, "currency": "USD"},
-            "Full Stack Developer": {"min": 75000, "max": 140000, "currency": "USD"},
-            "Data Scientist": {"min": 80000, "max": 150000, "currency": "USD"},
-            "DevOps Engineer": {"min": 85000, "max": 160000, "currency": "USD"},
-            "Mobile Developer": {"min": 65000, "max": 125000, "currency": "USD"},
-            "QA Engineer": {"min": 55000, "max": 100000, "currency": "USD"}
-        }
-        return salary_ranges.get(role, {"min": 50000, "max": 100000, "currency": "USD"})
-
-    def _suggest_missing_skills(self, current_skills: List[str], target_role: Optional[str]) -> List[str]:
+    def _suggest_missing_skills(
+        self, current_skills: List[str], target_role: Optional[str], taxonomy: SkillTaxonomy
+    ) -> List[str]:
         current_lower = set(skill.lower() for skill in current_skills)
-        trending_skills = [
-            "Docker", "Kubernetes", "AWS", "TypeScript", "GraphQL", 
-            "Microservices", "CI/CD", "Testing", "Agile", "REST API"
-        ]
-        missing = [skill for skill in trending_skills if skill.lower() not in current_lower]
+        missing = [skill for skill in taxonomy.trending_skills if skill.lower() not in current_lower]
         if target_role:
-            role_skills = self._get_role_requirements(target_role)
+            role_skills = taxonomy.role_requirements(target_role)
             missing.extend([skill for skill in role_skills if skill.lower() not in current_lower])
         return list(set(missing))[:10]
 
@@ -351,10 +447,18 @@ class ResumeAnalyzer:
 
         Keep the analysis professional and actionable.
         """
+        if not self.perplexity.is_available():
+            return {
+                "analysis": "AI analysis temporarily unavailable",
+                "ai_generated": False,
+                "error": "AI service circuit open",
+                "timestamp": datetime.now().isoformat()
+            }
         try:
             response = await self.perplexity.chat(
                 prompt,
-                model="llama-3.1-sonar-small"  # <— Supported Perplexity model!
+                model="llama-3.1-sonar-small",  # <— Supported Perplexity model!
+                operation="ResumeAnalyzer._analyze_with_ai"
             )
             try:
                 return json.loads(response)
@@ -397,3 +501,16 @@ class ResumeAnalyzer:
         if not experience.get("education", {}).get("certifications"):
             recommendations.append("Consider obtaining industry-recognized certifications")
         return recommendations[:8]
+
+
+def _ms_since(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 2)
+
+
+async def _aiter_pages(pages: Union[Iterable[str], AsyncIterable[str]]) -> AsyncIterator[str]:
+    if hasattr(pages, "__aiter__"):
+        async for page in pages:
+            yield page
+    else:
+        for page in pages:
+            yield page
@@ -1,6 +1,6 @@
 import asyncio
 import uuid
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, AsyncIterator
 from datetime import datetime
 from utils.perplexity_client import PerplexityClient
 from models.response_models import TutorResponse
@@ -44,8 +44,10 @@ class TutorService:
             # Build the tutor prompt
             prompt = self._build_tutor_prompt(question, context, subject, conversation_id)
             
-            # Get response from AI
-            ai_response = await self.perplexity.chat(prompt)
+            # Get response from AI (not cached: answers depend on the conversation)
+            ai_response = await self.perplexity.chat(
+                prompt, cache=False, priority="interactive", operation="TutorService.ask"
+            )
             
             # Store conversation context
             self._store_conversation_context(conversation_id, question, ai_response, subject)
@@ -73,6 +75,50 @@ class TutorService:
             )
 
 
+    async def ask_stream(self, question: str, context: Optional[str] = None, subject: Optional[str] = None, conversation_id: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream a tutor answer as events: one "start", many "token", then a final
+        "done" (or "error") carrying the full TutorResponse.
+        """
+        if not conversation_id:
+            conversation_id = f"conv_{uuid.uuid4().hex[:8]}"
+
+        yield {"event": "start", "data": {"conversation_id": conversation_id}}
+
+        prompt = self._build_tutor_prompt(question, context, subject, conversation_id)
+        answer_parts = []
+        try:
+            async for token in self.perplexity.chat_stream(
+                prompt, priority="interactive", operation="TutorService.ask_stream"
+            ):
+                answer_parts.append(token)
+                yield {"event": "token", "data": {"content": token}}
+
+            ai_response = "".join(answer_parts).strip()
+            self._store_conversation_context(conversation_id, question, ai_response, subject)
+
+            response = TutorResponse(
+                answer=ai_response,
+                question=question,
+                subject=subject,
+                suggestions=self._generate_follow_up_suggestions(question, subject, ai_response),
+                conversation_id=conversation_id,
+                error=False
+            )
+            yield {"event": "done", "data": response.dict()}
+
+        except Exception as e:
+            response = TutorResponse(
+                answer="I'm sorry, I'm having trouble processing your question right now. Please try rephrasing your question or try again later.",
+                question=question,
+                subject=subject,
+                suggestions=self._get_default_suggestions(),
+                conversation_id=conversation_id,
+                error=True
+            )
+            yield {"event": "error", "data": response.dict()}
+
+
     def _build_tutor_prompt(self, question: str, context: Optional[str], subject: Optional[str], conversation_id: str) -> str:
         """Build a comprehensive prompt for the AI tutor"""
         
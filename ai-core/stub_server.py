@@ -0,0 +1,74 @@
+"""
+Perplexity-compatible stub upstream for offline load testing.
+
+Serves recorded fixtures (see utils/llm_replay.py) on POST /chat/completions
+with simulated latency, injected 429/500/timeout faults and SSE streaming.
+Point AI Core at it with PERPLEXITY_BASE_URL=http://localhost:8001.
+"""
+from fastapi import FastAPI, Request
+from fastapi.responses import Response, StreamingResponse
+import uvicorn
+import asyncio
+import os
+import json
+import logging
+from dotenv import load_dotenv
+
+from utils.llm_replay import llm_replay
+
+load_dotenv()
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+app = FastAPI(title="SkillForge LLM Stub", docs_url=None, redoc_url=None)
+
+
+def _error_response(status: int, headers, text: str) -> Response:
+    return Response(content=text, status_code=status, headers=headers, media_type="application/json")
+
+
+@app.post("/chat/completions")
+async def chat_completions(request: Request):
+    """
+    Replay a recorded completion, as JSON or as a server-sent event stream
+    """
+    payload = await request.json()
+    try:
+        if payload.get("stream"):
+            status, headers, chunks, text = await llm_replay.stream(payload)
+            if status != 200:
+                return _error_response(status, headers, text)
+            return StreamingResponse(
+                chunks,
+                media_type="text/event-stream",
+                headers={"Cache-Control": "no-cache"}
+            )
+
+        status, headers, text = await llm_replay.complete(payload)
+        if status != 200:
+            return _error_response(status, headers, text)
+        return Response(content=text, status_code=200, media_type="application/json")
+    except asyncio.TimeoutError:
+        # Injected timeout: the client should have given up long before this
+        return _error_response(504, {}, json.dumps({"error": {"message": "Upstream timeout (injected)"}}))
+
+
+@app.get("/stats")
+async def stats():
+    """
+    Get replay counters and simulation settings
+    """
+    return llm_replay.stats()
+
+
+if __name__ == "__main__":
+    uvicorn.run(
+        "stub_server:app",
+        host=os.getenv("STUB_HOST", "127.0.0.1"),
+        port=int(os.getenv("STUB_PORT", 8001)),
+        access_log=False
+    )
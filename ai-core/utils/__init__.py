@@ -2,6 +2,34 @@
 AI Core Utils Package
 """
 from .perplexity_client import PerplexityClient
-from .pdf_parser import PDFParser
+from .pdf_parser import PDFParser, ParsedDocument, PDFLimits, PDFLimitError
+from .http_pool import HTTPPool, http_pool
+from .llm_cache import LLMCache, llm_cache
+from .single_flight import SingleFlight, llm_single_flight
+from .rate_limiter import AdaptiveRateLimiter, llm_rate_limiter
+from .circuit_breaker import CircuitBreaker, CircuitOpenError, llm_circuit_breaker
+from .deadline import DeadlineExceeded, deadline_scope
+from .llm_replay import ReplayEngine, llm_replay
+from .usage_tracker import UsageTracker, llm_usage
+from .pdf_cache import PDFTextCache, pdf_text_cache
+from .pdf_worker_pool import PDFWorkerPool, WorkerLimitExceeded, WorkerCrashed, pdf_worker_pool
+from .skill_taxonomy import SkillTaxonomy, SkillTaxonomyStore, skill_taxonomy
+from .resume_document import ResumeDocument
+from .cpu_pool import CPUPool, cpu_pool
 
-__all__ = ['PerplexityClient', 'PDFParser']
+__all__ = [
+    'PerplexityClient', 'PDFParser', 'ParsedDocument', 'PDFLimits', 'PDFLimitError',
+    'HTTPPool', 'http_pool',
+    'LLMCache', 'llm_cache',
+    'SingleFlight', 'llm_single_flight',
+    'AdaptiveRateLimiter', 'llm_rate_limiter',
+    'CircuitBreaker', 'CircuitOpenError', 'llm_circuit_breaker',
+    'DeadlineExceeded', 'deadline_scope',
+    'ReplayEngine', 'llm_replay',
+    'UsageTracker', 'llm_usage',
+    'PDFTextCache', 'pdf_text_cache',
+    'PDFWorkerPool', 'WorkerLimitExceeded', 'WorkerCrashed', 'pdf_worker_pool',
+    'SkillTaxonomy', 'SkillTaxonomyStore', 'skill_taxonomy',
+    'ResumeDocument',
+    'CPUPool', 'cpu_pool'
+]
@@ -0,0 +1,195 @@
+import os
+import time
+import logging
+from collections import deque
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the upstream while the circuit is open."""
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for the upstream LLM API.
+
+    Tracks the last N call outcomes and opens when either the error rate or
+    the slow-call rate crosses its threshold. While open every call fails
+    immediately; after a cool-down a limited number of probe calls are let
+    through (half-open) and their outcome closes or re-opens the circuit.
+
+    A probe whose call ends without an outcome worth recording (a 4xx or
+    429 answer, an empty response, a cancelled request) must be handed back
+    with release_probe(), or the circuit would stay half-open with no probe
+    left until the 2 x open_seconds safety reset.
+    """
+
+    def __init__(self, name: str = "perplexity"):
+        self.name = name
+        self._configured = False
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._half_open_probes = 0
+        # Bumped whenever the probes are reset, so a stale release can't free someone else's probe
+        self._probe_generation = 0
+        self._outcomes = deque()
+        self._counters = {
+            "successes": 0,
+            "failures": 0,
+            "slow_calls": 0,
+            "short_circuited": 0,
+            "times_opened": 0
+        }
+
+    def _ensure_configured(self):
+        # Configured on first use so values from .env (loaded after import) apply
+        if self._configured:
+            return
+        self.window_size = int(os.getenv("LLM_BREAKER_WINDOW", 20))
+        self.min_calls = int(os.getenv("LLM_BREAKER_MIN_CALLS", 5))
+        self.error_rate_threshold = float(os.getenv("LLM_BREAKER_ERROR_RATE", 0.5))
+        # Quiz and learning-path generations normally take 10-40 s; only calls
+        # close to the client's 60 s timeout count as slow
+        self.slow_call_seconds = float(os.getenv("LLM_BREAKER_SLOW_CALL_SECONDS", 55))
+        self.slow_call_rate_threshold = float(os.getenv("LLM_BREAKER_SLOW_CALL_RATE", 0.5))
+        self.open_seconds = float(os.getenv("LLM_BREAKER_OPEN_SECONDS", 30))
+        self.half_open_max_probes = int(os.getenv("LLM_BREAKER_HALF_OPEN_PROBES", 1))
+        self._outcomes = deque(maxlen=self.window_size)
+        self._configured = True
+
+    @property
+    def state(self) -> str:
+        self._ensure_configured()
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+            self._transition(HALF_OPEN)
+        elif self._state == HALF_OPEN and time.monotonic() - self._opened_at >= 2 * self.open_seconds:
+            # Probes never reported back (e.g. cancelled); allow fresh ones
+            self._opened_at = time.monotonic() - self.open_seconds
+            self._half_open_probes = 0
+            self._probe_generation += 1
+        return self._state
+
+    @property
+    def is_open(self) -> bool:
+        """True while calls would be short-circuited; does not use up a probe."""
+        state = self.state
+        return state == OPEN or (state == HALF_OPEN and self._half_open_probes >= self.half_open_max_probes)
+
+    def allow_request(self) -> bool:
+        """Return whether a call may go upstream, reserving a probe when half-open."""
+        return self._reserve() is not False
+
+    def _reserve(self):
+        # None: allowed without a probe; an int: the generation of the reserved probe; False: refused
+        state = self.state
+        if state == CLOSED:
+            return None
+        if state == HALF_OPEN and self._half_open_probes < self.half_open_max_probes:
+            self._half_open_probes += 1
+            return self._probe_generation
+        self._counters["short_circuited"] += 1
+        return False
+
+    def check(self) -> Optional[int]:
+        """
+        Raise CircuitOpenError if a call may not go upstream.
+
+        Returns a probe token when a half-open probe was reserved (None
+        otherwise); pass it to release_probe() once the call is over.
+        """
+        probe = self._reserve()
+        if probe is False:
+            raise CircuitOpenError(f"Circuit '{self.name}' is open; upstream calls are suspended")
+        return probe
+
+    def release_probe(self, probe: Optional[int]):
+        """
+        Hand back a probe reserved by check() whose call recorded no outcome.
+
+        A no-op if ``probe`` is None or an outcome has since reset the probes,
+        so it is safe to call unconditionally when an attempt ends.
+        """
+        if probe is None or self._state != HALF_OPEN or probe != self._probe_generation:
+            return
+        self._half_open_probes = max(self._half_open_probes - 1, 0)
+
+    def record_success(self, latency: float):
+        self._ensure_configured()
+        slow = latency >= self.slow_call_seconds
+        self._counters["successes"] += 1
+        if slow:
+            self._counters["slow_calls"] += 1
+        self._outcomes.append((True, slow))
+
+        if self._state == HALF_OPEN:
+            if slow:
+                self._transition(OPEN)
+            else:
+                self._transition(CLOSED)
+        elif self._state == CLOSED:
+            self._evaluate()
+
+    def record_failure(self):
+        self._ensure_configured()
+        self._counters["failures"] += 1
+        self._outcomes.append((False, False))
+
+        if self._state == HALF_OPEN:
+            self._transition(OPEN)
+        elif self._state == CLOSED:
+            self._evaluate()
+
+    def _evaluate(self):
+        if len(self._outcomes) < self.min_calls:
+            return
+        total = len(self._outcomes)
+        error_rate = sum(1 for ok, _ in self._outcomes if not ok) / total
+        slow_rate = sum(1 for _, slow in self._outcomes if slow) / total
+        if error_rate >= self.error_rate_threshold or slow_rate >= self.slow_call_rate_threshold:
+            logger.warning(
+                f"Circuit '{self.name}' opening (error_rate={error_rate:.2f}, slow_rate={slow_rate:.2f})"
+            )
+            self._transition(OPEN)
+
+    def _transition(self, new_state: str):
+        if new_state == self._state:
+            return
+        logger.info(f"Circuit '{self.name}': {self._state} -> {new_state}")
+        self._state = new_state
+        self._half_open_probes = 0
+        self._probe_generation += 1
+        if new_state == OPEN:
+            self._opened_at = time.monotonic()
+            self._counters["times_opened"] += 1
+        elif new_state == CLOSED:
+            self._outcomes.clear()
+
+    def reset(self):
+        self._ensure_configured()
+        self._transition(CLOSED)
+
+    def stats(self) -> Dict[str, Any]:
+        state = self.state
+        total = len(self._outcomes)
+        retry_in = 0.0
+        if state == OPEN:
+            retry_in = max(self.open_seconds - (time.monotonic() - self._opened_at), 0.0)
+        return {
+            "name": self.name,
+            "state": state,
+            "window_calls": total,
+            "error_rate": round(sum(1 for ok, _ in self._outcomes if not ok) / total, 4) if total else 0.0,
+            "slow_call_rate": round(sum(1 for _, slow in self._outcomes if slow) / total, 4) if total else 0.0,
+            "retry_in_seconds": round(retry_in, 2),
+            **self._counters
+        }
+
+
+# Shared breaker for the Perplexity upstream
+llm_circuit_breaker = CircuitBreaker()
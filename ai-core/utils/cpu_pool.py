@@ -0,0 +1,102 @@
+import os
+import time
+import asyncio
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class CPUPool:
+    """
+    Worker threads for CPU-bound request work, such as regex extraction over a
+    resume, so it doesn't run on the event loop.
+
+    Python's regex engine holds the GIL while matching, so the threads add
+    no parallelism to that work. What they buy is that the event loop keeps
+    being scheduled (every sys.getswitchinterval()) while a large resume is
+    analyzed, so other requests, e.g. tutor streams, are not stalled for the
+    whole extraction and awaited I/O (the LLM call) proceeds meanwhile.
+    Jobs run with a copy of the caller's context variables. CPU_POOL_WORKERS
+    bounds how many jobs run at once; the rest queue.
+    """
+
+    def __init__(self):
+        self._configured = False
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # Counters are updated from the worker threads
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._counters = {
+            "jobs": 0,
+            "errors": 0,
+            "queue_seconds": 0.0,
+            "run_seconds": 0.0
+        }
+
+    def _ensure_configured(self):
+        # Configured on first use so values from .env (loaded after import) apply
+        if self._configured:
+            return
+        self.size = max(1, int(os.getenv("CPU_POOL_WORKERS", min(4, os.cpu_count() or 1))))
+        self._configured = True
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        self._ensure_configured()
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.size, thread_name_prefix="cpu-pool")
+        return self._executor
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        """Run ``func(*args)`` on a worker thread and return its result."""
+        executor = self._get_executor()
+        context = contextvars.copy_context()
+        submitted = time.perf_counter()
+        with self._lock:
+            self._queued += 1
+
+        def job():
+            started = time.perf_counter()
+            with self._lock:
+                self._queued -= 1
+                self._running += 1
+                self._counters["queue_seconds"] += started - submitted
+            failed = False
+            try:
+                return context.run(func, *args)
+            except Exception:
+                failed = True
+                raise
+            finally:
+                with self._lock:
+                    self._running -= 1
+                    self._counters["jobs"] += 1
+                    self._counters["errors"] += failed
+                    self._counters["run_seconds"] += time.perf_counter() - started
+
+        return await asyncio.get_running_loop().run_in_executor(executor, job)
+
+    def stats(self) -> Dict[str, Any]:
+        self._ensure_configured()
+        return {
+            "size": self.size,
+            "queued": self._queued,
+            "running": self._running,
+            "jobs": self._counters["jobs"],
+            "errors": self._counters["errors"],
+            "queue_seconds": round(self._counters["queue_seconds"], 3),
+            "run_seconds": round(self._counters["run_seconds"], 3)
+        }
+
+    def shutdown(self):
+        """Stop the worker threads; jobs not yet started are dropped."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Shared pool for CPU-bound analysis work
+cpu_pool = CPUPool()
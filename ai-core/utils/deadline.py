@@ -0,0 +1,97 @@
+import asyncio
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional, Iterator, Awaitable, TypeVar
+
+T = TypeVar("T")
+
+# Absolute deadline on the time.monotonic() clock for the current request
+_current_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+
+
+class DeadlineExceeded(Exception):
+    """Raised when the request's latency budget cannot cover more work."""
+
+
+@contextmanager
+def deadline_scope(budget_seconds: Optional[float]) -> Iterator[None]:
+    """
+    Run the enclosed block under a latency budget.
+
+    Nested scopes can only shorten the deadline, never extend it.
+    """
+    if budget_seconds is None:
+        yield
+        return
+    deadline = time.monotonic() + budget_seconds
+    outer = _current_deadline.get()
+    if outer is not None:
+        deadline = min(deadline, outer)
+    token = _current_deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _current_deadline.reset(token)
+
+
+@contextmanager
+def no_deadline() -> Iterator[None]:
+    """Run the enclosed block without the caller's deadline, e.g. work shared by several requests."""
+    token = _current_deadline.set(None)
+    try:
+        yield
+    finally:
+        _current_deadline.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """Seconds left in the current budget, or None when no deadline is set."""
+    deadline = _current_deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def check(min_seconds: float = 0.0):
+    """Raise DeadlineExceeded if less than min_seconds of budget remain."""
+    left = remaining()
+    if left is not None and left <= min_seconds:
+        raise DeadlineExceeded(f"Request deadline exceeded ({max(left, 0.0):.2f}s left)")
+
+
+def cap_timeout(timeout: float) -> float:
+    """Shrink a timeout so it never outlives the current deadline."""
+    left = remaining()
+    if left is None:
+        return timeout
+    return max(min(timeout, left), 0.0)
+
+
+async def within_deadline(awaitable: Awaitable[T]) -> T:
+    """Await something, giving up with DeadlineExceeded when the budget runs out."""
+    left = remaining()
+    if left is None:
+        return await awaitable
+    if left <= 0:
+        # Close un-awaited coroutines to avoid 'never awaited' warnings
+        if asyncio.iscoroutine(awaitable):
+            awaitable.close()
+        raise DeadlineExceeded("Request deadline exceeded")
+    try:
+        return await asyncio.wait_for(awaitable, timeout=left)
+    except asyncio.TimeoutError:
+        raise DeadlineExceeded("Request deadline exceeded")
+
+
+def parse_deadline_header(value: Optional[str]) -> Optional[float]:
+    """
+    Convert an X-Request-Deadline header (absolute Unix epoch milliseconds)
+    into a budget in seconds from now.
+    """
+    if not value:
+        return None
+    try:
+        return float(value) / 1000.0 - time.time()
+    except ValueError:
+        return None
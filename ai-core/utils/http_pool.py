@@ -0,0 +1,130 @@
+import aiohttp
+import asyncio
+import os
+import logging
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class HTTPPool:
+    """
+    Process-wide pooled aiohttp session shared by every PerplexityClient.
+
+    Keeps TCP/TLS connections alive between calls and caches DNS lookups,
+    so only the first request to a host pays for connection setup.
+    """
+
+    def __init__(self):
+        self._load_config()
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._lock = asyncio.Lock()
+        self._counters = {
+            "requests": 0,
+            "connections_created": 0,
+            "connections_reused": 0,
+            "dns_cache_hits": 0,
+            "dns_cache_misses": 0,
+            "sessions_opened": 0
+        }
+
+    def _load_config(self):
+        self.limit = int(os.getenv("HTTP_POOL_LIMIT", 100))
+        self.limit_per_host = int(os.getenv("HTTP_POOL_LIMIT_PER_HOST", 20))
+        self.dns_ttl = int(os.getenv("HTTP_POOL_DNS_TTL", 300))
+        self.keepalive_timeout = float(os.getenv("HTTP_POOL_KEEPALIVE_TIMEOUT", 30))
+
+    async def open(self) -> aiohttp.ClientSession:
+        """Create the shared session if it is not already open."""
+        async with self._lock:
+            if self._session is None or self._session.closed:
+                # Re-read limits so values from .env (loaded after import) apply
+                self._load_config()
+                connector = aiohttp.TCPConnector(
+                    limit=self.limit,
+                    limit_per_host=self.limit_per_host,
+                    ttl_dns_cache=self.dns_ttl,
+                    use_dns_cache=True,
+                    keepalive_timeout=self.keepalive_timeout,
+                    enable_cleanup_closed=True
+                )
+                self._session = aiohttp.ClientSession(
+                    connector=connector,
+                    trace_configs=[self._build_trace_config()]
+                )
+                self._counters["sessions_opened"] += 1
+                logger.info(
+                    f"HTTP pool opened (limit={self.limit}, per_host={self.limit_per_host}, "
+                    f"dns_ttl={self.dns_ttl}s)"
+                )
+            return self._session
+
+    async def close(self):
+        """Close the shared session and release all pooled connections."""
+        async with self._lock:
+            if self._session is not None and not self._session.closed:
+                await self._session.close()
+                logger.info("HTTP pool closed")
+            self._session = None
+
+    async def get_session(self) -> aiohttp.ClientSession:
+        """
+        Return the shared session, opening it lazily when used outside of
+        the FastAPI lifecycle (scripts, benchmarks).
+        """
+        if self._session is None or self._session.closed:
+            return await self.open()
+        return self._session
+
+    @property
+    def is_open(self) -> bool:
+        return self._session is not None and not self._session.closed
+
+    def stats(self) -> Dict[str, Any]:
+        """Return connection pool statistics."""
+        stats: Dict[str, Any] = {
+            "open": self.is_open,
+            "limit": self.limit,
+            "limit_per_host": self.limit_per_host,
+            "dns_ttl": self.dns_ttl,
+            "keepalive_timeout": self.keepalive_timeout,
+            **self._counters
+        }
+        if self.is_open:
+            connector = self._session.connector
+            # aiohttp does not expose these counts publicly
+            stats["idle_connections"] = sum(len(conns) for conns in getattr(connector, "_conns", {}).values())
+            stats["active_connections"] = len(getattr(connector, "_acquired", ()))
+        else:
+            stats["idle_connections"] = 0
+            stats["active_connections"] = 0
+        return stats
+
+    def _build_trace_config(self) -> aiohttp.TraceConfig:
+        trace_config = aiohttp.TraceConfig()
+
+        async def on_request_start(session, ctx, params):
+            self._counters["requests"] += 1
+
+        async def on_connection_create_end(session, ctx, params):
+            self._counters["connections_created"] += 1
+
+        async def on_connection_reuseconn(session, ctx, params):
+            self._counters["connections_reused"] += 1
+
+        async def on_dns_cache_hit(session, ctx, params):
+            self._counters["dns_cache_hits"] += 1
+
+        async def on_dns_cache_miss(session, ctx, params):
+            self._counters["dns_cache_misses"] += 1
+
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+        trace_config.on_dns_cache_hit.append(on_dns_cache_hit)
+        trace_config.on_dns_cache_miss.append(on_dns_cache_miss)
+        return trace_config
+
+
+# Shared instance, opened and closed by the FastAPI startup/shutdown events
+http_pool = HTTPPool()
@@ -0,0 +1,261 @@
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import logging
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "llm_cache.sqlite3")
+
+
+def make_cache_key(payload: Dict[str, Any]) -> str:
+    """
+    Canonical content hash of the fields that determine a completion.
+    """
+    canonical = {
+        "model": payload.get("model"),
+        "messages": payload.get("messages"),
+        "temperature": payload.get("temperature"),
+        "max_tokens": payload.get("max_tokens"),
+        "top_p": payload.get("top_p")
+    }
+    encoded = json.dumps(canonical, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class MemoryLRU:
+    """In-memory LRU tier bounded by total value size in bytes."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self._entries: "OrderedDict[str, Tuple[str, float, int]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at, size = entry
+        if expires_at < time.time():
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: str, expires_at: float):
+        size = len(value.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (value, expires_at, size)
+        self.current_bytes += size
+        while self.current_bytes > self.max_bytes and self._entries:
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+
+    def delete(self, key: str):
+        if key in self._entries:
+            self._remove(key)
+
+    def clear(self):
+        self._entries.clear()
+        self.current_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, key: str):
+        _, _, size = self._entries.pop(key)
+        self.current_bytes -= size
+
+
+class SQLiteTier:
+    """On-disk tier that survives restarts. All calls are blocking."""
+
+    def __init__(self, path: str, max_entries: int):
+        self.path = path
+        self.max_entries = max_entries
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._writes = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "created_at REAL NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_expires ON llm_cache (expires_at)")
+            self._conn.commit()
+        return self._conn
+
+    def get(self, key: str) -> Optional[Tuple[str, float]]:
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT value, expires_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or row[1] < time.time():
+            return None
+        return row[0], row[1]
+
+    def set(self, key: str, value: str, expires_at: float):
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, created_at, expires_at) VALUES (?, ?, ?, ?)",
+                (key, value, time.time(), expires_at)
+            )
+            self._writes += 1
+            if self._writes % 100 == 0:
+                self._prune(conn)
+            conn.commit()
+
+    def delete(self, key: str):
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+            conn.commit()
+
+    def clear(self):
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM llm_cache")
+            conn.commit()
+
+    def count(self) -> int:
+        with self._lock:
+            return self._connect().execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _prune(self, conn: sqlite3.Connection):
+        conn.execute("DELETE FROM llm_cache WHERE expires_at < ?", (time.time(),))
+        conn.execute(
+            "DELETE FROM llm_cache WHERE key IN ("
+            "SELECT key FROM llm_cache ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,)
+        )
+
+
+class LLMCache:
+    """
+    Two-tier content-addressed cache for LLM completions.
+
+    Lookups go memory -> SQLite; disk hits are promoted into memory.
+    """
+
+    def __init__(self):
+        self._memory: Optional[MemoryLRU] = None
+        self._disk: Optional[SQLiteTier] = None
+        self._counters = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "writes": 0,
+            "invalidations": 0,
+            "errors": 0
+        }
+
+    def _ensure_configured(self):
+        # Configured on first use so values from .env (loaded after import) apply
+        if self._memory is not None:
+            return
+        self.enabled = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+        self.default_ttl = int(os.getenv("LLM_CACHE_TTL", 86400))
+        self._memory = MemoryLRU(int(os.getenv("LLM_CACHE_MEMORY_BYTES", 32 * 1024 * 1024)))
+        self._disk = SQLiteTier(
+            os.getenv("LLM_CACHE_DB_PATH", DEFAULT_DB_PATH),
+            int(os.getenv("LLM_CACHE_DISK_MAX_ENTRIES", 50000))
+        )
+
+    async def get(self, key: str) -> Optional[str]:
+        self._ensure_configured()
+        if not self.enabled:
+            return None
+
+        value = self._memory.get(key)
+        if value is not None:
+            self._counters["memory_hits"] += 1
+            return value
+
+        try:
+            row = await asyncio.to_thread(self._disk.get, key)
+        except sqlite3.Error as e:
+            self._counters["errors"] += 1
+            logger.warning(f"LLM cache disk read failed: {e}")
+            row = None
+
+        if row is not None:
+            value, expires_at = row
+            self._memory.set(key, value, expires_at)
+            self._counters["disk_hits"] += 1
+            return value
+
+        self._counters["misses"] += 1
+        return None
+
+    async def set(self, key: str, value: str, ttl: Optional[int] = None):
+        self._ensure_configured()
+        if not self.enabled:
+            return
+        expires_at = time.time() + (ttl if ttl is not None else self.default_ttl)
+        self._memory.set(key, value, expires_at)
+        self._counters["writes"] += 1
+        try:
+            await asyncio.to_thread(self._disk.set, key, value, expires_at)
+        except sqlite3.Error as e:
+            self._counters["errors"] += 1
+            logger.warning(f"LLM cache disk write failed: {e}")
+
+    async def invalidate(self, key: str):
+        self._ensure_configured()
+        self._memory.delete(key)
+        self._counters["invalidations"] += 1
+        try:
+            await asyncio.to_thread(self._disk.delete, key)
+        except sqlite3.Error as e:
+            self._counters["errors"] += 1
+            logger.warning(f"LLM cache disk delete failed: {e}")
+
+    async def clear(self):
+        self._ensure_configured()
+        self._memory.clear()
+        await asyncio.to_thread(self._disk.clear)
+
+    def close(self):
+        if self._disk is not None:
+            self._disk.close()
+
+    def stats(self) -> Dict[str, Any]:
+        self._ensure_configured()
+        lookups = self._counters["memory_hits"] + self._counters["disk_hits"] + self._counters["misses"]
+        hits = self._counters["memory_hits"] + self._counters["disk_hits"]
+        return {
+            "enabled": self.enabled,
+            "default_ttl": self.default_ttl,
+            "memory_entries": len(self._memory),
+            "memory_bytes": self._memory.current_bytes,
+            "memory_max_bytes": self._memory.max_bytes,
+            "disk_path": self._disk.path,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            **self._counters
+        }
+
+
+# Shared instance used by every PerplexityClient
+llm_cache = LLMCache()
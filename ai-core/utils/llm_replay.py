@@ -0,0 +1,269 @@
+import asyncio
+import json
+import math
+import os
+import random
+import time
+import logging
+from typing import Dict, Any, Optional, Tuple, AsyncIterator
+from utils.llm_cache import make_cache_key
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FIXTURES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fixtures", "llm")
+
+# Served for prompts without a recording when present in the fixtures dir
+DEFAULT_FIXTURE_NAME = "_default.json"
+
+
+class ReplayEngine:
+    """
+    Record/replay backend for Perplexity chat completions.
+
+    Record mode stores real upstream responses as JSON fixtures keyed by the
+    same canonical prompt hash as the response cache. Replay mode serves them
+    offline with a configurable latency distribution, injected 429/500/timeout
+    faults and optional SSE streaming. Used both in-process by
+    PerplexityClient (PERPLEXITY_MODE=replay) and by stub_server.py.
+    """
+
+    def __init__(self):
+        self._configured = False
+        self._rng = random.Random()
+        self._counters = {
+            "served": 0,
+            "fixture_hits": 0,
+            "default_hits": 0,
+            "synthetic": 0,
+            "recorded": 0,
+            "injected_429": 0,
+            "injected_500": 0,
+            "injected_timeouts": 0
+        }
+
+    def _ensure_configured(self):
+        # Configured on first use so values from .env (loaded after import) apply
+        if self._configured:
+            return
+        self.configure()
+
+    def configure(self, **overrides):
+        """
+        (Re)load settings from the environment; keyword arguments override them.
+        """
+        settings = {
+            "fixtures_dir": os.getenv("LLM_FIXTURES_DIR", DEFAULT_FIXTURES_DIR),
+            "latency_dist": os.getenv("LLM_REPLAY_LATENCY_DIST", "fixed"),
+            "latency_ms": float(os.getenv("LLM_REPLAY_LATENCY_MS", 0)),
+            "latency_jitter_ms": float(os.getenv("LLM_REPLAY_LATENCY_JITTER_MS", 0)),
+            "error_429_rate": float(os.getenv("LLM_REPLAY_429_RATE", 0)),
+            "error_500_rate": float(os.getenv("LLM_REPLAY_500_RATE", 0)),
+            "timeout_rate": float(os.getenv("LLM_REPLAY_TIMEOUT_RATE", 0)),
+            "retry_after_seconds": float(os.getenv("LLM_REPLAY_RETRY_AFTER", 1)),
+            "hang_seconds": float(os.getenv("LLM_REPLAY_HANG_SECONDS", 120)),
+            "stream_chunk_chars": int(os.getenv("LLM_REPLAY_STREAM_CHUNK_CHARS", 16)),
+            "stream_chunk_delay_ms": float(os.getenv("LLM_REPLAY_STREAM_CHUNK_DELAY_MS", 15)),
+            "miss_behavior": os.getenv("LLM_REPLAY_MISS", "synthetic"),
+            "seed": os.getenv("LLM_REPLAY_SEED")
+        }
+        settings.update(overrides)
+        for name, value in settings.items():
+            setattr(self, name, value)
+        if self.seed is not None:
+            self._rng.seed(self.seed)
+        self._configured = True
+
+    # Fixtures
+
+    def _fixture_path(self, key: str) -> str:
+        return os.path.join(self.fixtures_dir, key[:2], f"{key}.json")
+
+    def record(self, payload: Dict[str, Any], response: Dict[str, Any]):
+        """Save an upstream response as the fixture for this payload."""
+        self._ensure_configured()
+        key = make_cache_key(payload)
+        path = self._fixture_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fixture = {
+            "key": key,
+            "recorded_at": time.time(),
+            "request": {
+                name: payload.get(name)
+                for name in ("model", "messages", "temperature", "max_tokens", "top_p")
+            },
+            "response": response
+        }
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(fixture, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+        self._counters["recorded"] += 1
+
+    def lookup(self, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Return the recorded upstream response for a payload, if any."""
+        self._ensure_configured()
+        path = self._fixture_path(make_cache_key(payload))
+        if not os.path.exists(path):
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)["response"]
+
+    def _resolve_response(self, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        response = self.lookup(payload)
+        if response is not None:
+            self._counters["fixture_hits"] += 1
+            return response
+
+        default_path = os.path.join(self.fixtures_dir, DEFAULT_FIXTURE_NAME)
+        if os.path.exists(default_path):
+            with open(default_path, "r", encoding="utf-8") as f:
+                self._counters["default_hits"] += 1
+                return json.load(f)["response"]
+
+        if self.miss_behavior == "error":
+            return None
+
+        self._counters["synthetic"] += 1
+        prompt = payload.get("messages", [{}])[-1].get("content", "")
+        content = f"Replay stub response (no fixture recorded for this prompt, {len(prompt)} chars)."
+        prompt_chars = sum(len(m.get("content", "")) for m in payload.get("messages", []))
+        return {
+            "model": payload.get("model"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}}],
+            "usage": {
+                "prompt_tokens": prompt_chars // 4,
+                "completion_tokens": len(content) // 4,
+                "total_tokens": (prompt_chars + len(content)) // 4
+            }
+        }
+
+    # Simulation
+
+    def sample_latency(self) -> float:
+        """Draw one simulated upstream latency in seconds."""
+        self._ensure_configured()
+        mean = self.latency_ms
+        jitter = self.latency_jitter_ms
+        if self.latency_dist == "uniform":
+            value = self._rng.uniform(mean - jitter, mean + jitter)
+        elif self.latency_dist == "normal":
+            value = self._rng.gauss(mean, jitter)
+        elif self.latency_dist == "lognormal" and mean > 0:
+            # jitter is the standard deviation; convert to log-space parameters
+            sigma = math.sqrt(math.log(1 + (jitter / mean) ** 2))
+            value = self._rng.lognormvariate(math.log(mean) - sigma ** 2 / 2, sigma)
+        else:
+            value = mean
+        return max(value, 0.0) / 1000.0
+
+    def sample_fault(self) -> Optional[str]:
+        """Pick an injected fault ("429", "500", "timeout") or None."""
+        self._ensure_configured()
+        roll = self._rng.random()
+        if roll < self.error_429_rate:
+            return "429"
+        roll -= self.error_429_rate
+        if roll < self.error_500_rate:
+            return "500"
+        roll -= self.error_500_rate
+        if roll < self.timeout_rate:
+            return "timeout"
+        return None
+
+    async def _apply_fault(self, fault: Optional[str], timeout: Optional[float]) -> Optional[Tuple[int, Dict[str, str], str]]:
+        if fault == "timeout":
+            self._counters["injected_timeouts"] += 1
+            await asyncio.sleep(timeout if timeout is not None else self.hang_seconds)
+            raise asyncio.TimeoutError("Injected upstream timeout")
+        if fault == "429":
+            self._counters["injected_429"] += 1
+            return 429, {"Retry-After": str(self.retry_after_seconds)}, json.dumps(
+                {"error": {"message": "Rate limit exceeded (injected)"}}
+            )
+        if fault == "500":
+            self._counters["injected_500"] += 1
+            return 500, {}, json.dumps({"error": {"message": "Internal error (injected)"}})
+        return None
+
+    async def complete(self, payload: Dict[str, Any], timeout: Optional[float] = None) -> Tuple[int, Dict[str, str], str]:
+        """
+        Simulate a non-streaming /chat/completions call.
+
+        Returns:
+            Tuple of (status, headers, body text).
+        """
+        self._ensure_configured()
+        fault = self.sample_fault()
+        latency = self.sample_latency()
+        if timeout is not None and latency > timeout:
+            fault = "timeout"
+        else:
+            await asyncio.sleep(latency)
+
+        faulted = await self._apply_fault(fault, timeout)
+        if faulted:
+            return faulted
+
+        self._counters["served"] += 1
+        response = self._resolve_response(payload)
+        if response is None:
+            return 400, {}, json.dumps({"error": {"message": "No fixture recorded for this prompt"}})
+        return 200, {"Content-Type": "application/json"}, json.dumps(response)
+
+    async def stream(self, payload: Dict[str, Any], timeout: Optional[float] = None) -> Tuple[int, Dict[str, str], Optional[AsyncIterator[bytes]], str]:
+        """
+        Simulate a streaming /chat/completions call. The sampled latency is the
+        time to first token; the content is then sent in SSE chunks.
+
+        Returns:
+            Tuple of (status, headers, SSE byte-chunk iterator or None, error body text).
+        """
+        self._ensure_configured()
+        fault = self.sample_fault()
+        latency = self.sample_latency()
+        if timeout is not None and latency > timeout:
+            fault = "timeout"
+        else:
+            await asyncio.sleep(latency)
+
+        faulted = await self._apply_fault(fault, timeout)
+        if faulted:
+            status, headers, text = faulted
+            return status, headers, None, text
+
+        self._counters["served"] += 1
+        response = self._resolve_response(payload)
+        if response is None:
+            return 400, {}, None, json.dumps({"error": {"message": "No fixture recorded for this prompt"}})
+
+        message = response["choices"][0].get("message") or {}
+        content = message.get("content", "")
+        return 200, {"Content-Type": "text/event-stream"}, self._iter_sse_chunks(content, response.get("usage")), ""
+
+    async def _iter_sse_chunks(self, content: str, usage: Optional[Dict[str, Any]]) -> AsyncIterator[bytes]:
+        size = max(self.stream_chunk_chars, 1)
+        for start in range(0, len(content), size):
+            if start:
+                await asyncio.sleep(self.stream_chunk_delay_ms / 1000.0)
+            event = {"choices": [{"index": 0, "delta": {"content": content[start:start + size]}}]}
+            yield f"data: {json.dumps(event)}\n\n".encode("utf-8")
+        if usage:
+            yield f"data: {json.dumps({'choices': [], 'usage': usage})}\n\n".encode("utf-8")
+        yield b"data: [DONE]\n\n"
+
+    def stats(self) -> Dict[str, Any]:
+        self._ensure_configured()
+        return {
+            "fixtures_dir": self.fixtures_dir,
+            "latency_dist": self.latency_dist,
+            "latency_ms": self.latency_ms,
+            "latency_jitter_ms": self.latency_jitter_ms,
+            "error_429_rate": self.error_429_rate,
+            "error_500_rate": self.error_500_rate,
+            "timeout_rate": self.timeout_rate,
+            **self._counters
+        }
+
+
+# Shared instance used by PerplexityClient and stub_server.py
+llm_replay = ReplayEngine()
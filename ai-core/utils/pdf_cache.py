@@ -0,0 +1,193 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import logging
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "pdf_text_cache.sqlite3")
+
+
+def document_digest(pdf_buffer: bytes) -> str:
+    """SHA-256 of the raw PDF bytes."""
+    return hashlib.sha256(pdf_buffer).hexdigest()
+
+
+class PDFTextCache:
+    """
+    On-disk cache of PDF extraction results keyed by content hash.
+
+    Each entry holds the cleaned full text, cleaned per-page text, metadata
+    and validation of one document, so a hit needs no PyPDF2 work at all.
+    Entries are tagged with the parser version and cleaning options that
+    produced them; entries from other versions are never served and are
+    purged on open. The store is bounded by total size and evicts least
+    recently used entries.
+    All calls are blocking.
+    """
+
+    def __init__(self):
+        self._configured = False
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._counters = {
+            "hits": 0,
+            "misses": 0,
+            "writes": 0,
+            "evictions": 0,
+            "invalidations": 0,
+            "errors": 0
+        }
+
+    def _ensure_configured(self):
+        # Configured on first use so values from .env (loaded after import) apply
+        if self._configured:
+            return
+        from utils.pdf_parser import extraction_version
+        self.parser_version = extraction_version()
+        self.enabled = os.getenv("PDF_CACHE_ENABLED", "true").lower() == "true"
+        self.path = os.getenv("PDF_CACHE_DB_PATH", DEFAULT_DB_PATH)
+        self.max_bytes = int(os.getenv("PDF_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+        self._configured = True
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS pdf_text_cache ("
+                "digest TEXT PRIMARY KEY, parser_version TEXT NOT NULL, value TEXT NOT NULL, "
+                "size_bytes INTEGER NOT NULL, created_at REAL NOT NULL, last_access REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_pdf_text_cache_access ON pdf_text_cache (last_access)")
+            # Results from older cleaning rules are never valid again
+            purged = self._conn.execute(
+                "DELETE FROM pdf_text_cache WHERE parser_version != ?", (self.parser_version,)
+            ).rowcount
+            if purged:
+                logger.info(f"Purged {purged} PDF cache entries from older parser versions")
+            self._conn.commit()
+        return self._conn
+
+    def get(self, digest: str) -> Optional[Dict[str, Any]]:
+        """Return the cached extraction result for a document digest, if any."""
+        self._ensure_configured()
+        if not self.enabled:
+            return None
+        try:
+            with self._lock:
+                conn = self._connect()
+                row = conn.execute(
+                    "SELECT value FROM pdf_text_cache WHERE digest = ? AND parser_version = ?",
+                    (digest, self.parser_version)
+                ).fetchone()
+                if row is not None:
+                    conn.execute("UPDATE pdf_text_cache SET last_access = ? WHERE digest = ?", (time.time(), digest))
+                    conn.commit()
+        except sqlite3.Error as e:
+            self._counters["errors"] += 1
+            logger.warning(f"PDF cache read failed: {e}")
+            return None
+
+        if row is None:
+            self._counters["misses"] += 1
+            return None
+        self._counters["hits"] += 1
+        return json.loads(row[0])
+
+    def set(self, digest: str, result: Dict[str, Any]):
+        """Store an extraction result, evicting least recently used entries over the size budget."""
+        self._ensure_configured()
+        if not self.enabled:
+            return
+        value = json.dumps(result, ensure_ascii=False)
+        size = len(value.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        now = time.time()
+        try:
+            with self._lock:
+                conn = self._connect()
+                conn.execute(
+                    "INSERT OR REPLACE INTO pdf_text_cache "
+                    "(digest, parser_version, value, size_bytes, created_at, last_access) VALUES (?, ?, ?, ?, ?, ?)",
+                    (digest, self.parser_version, value, size, now, now)
+                )
+                self._counters["writes"] += 1
+                self._evict(conn)
+                conn.commit()
+        except sqlite3.Error as e:
+            self._counters["errors"] += 1
+            logger.warning(f"PDF cache write failed: {e}")
+
+    def _evict(self, conn: sqlite3.Connection):
+        total = conn.execute("SELECT COALESCE(SUM(size_bytes), 0) FROM pdf_text_cache").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for digest, size in conn.execute(
+            "SELECT digest, size_bytes FROM pdf_text_cache ORDER BY last_access ASC"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            conn.execute("DELETE FROM pdf_text_cache WHERE digest = ?", (digest,))
+            total -= size
+            self._counters["evictions"] += 1
+
+    def invalidate(self, digest: str):
+        """Drop the cached result for one document digest."""
+        self._ensure_configured()
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM pdf_text_cache WHERE digest = ?", (digest,))
+            conn.commit()
+        self._counters["invalidations"] += 1
+
+    def invalidate_document(self, pdf_buffer: bytes):
+        """Drop the cached result for a document given its bytes."""
+        self.invalidate(document_digest(pdf_buffer))
+
+    def clear(self):
+        """Drop every entry, e.g. after changing cleaning rules without bumping PARSER_VERSION."""
+        self._ensure_configured()
+        with self._lock:
+            conn = self._connect()
+            removed = conn.execute("DELETE FROM pdf_text_cache").rowcount
+            conn.commit()
+        self._counters["invalidations"] += removed
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def stats(self) -> Dict[str, Any]:
+        self._ensure_configured()
+        entries, total_bytes = 0, 0
+        if self.enabled:
+            try:
+                with self._lock:
+                    entries, total_bytes = self._connect().execute(
+                        "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM pdf_text_cache"
+                    ).fetchone()
+            except sqlite3.Error as e:
+                logger.warning(f"PDF cache stats failed: {e}")
+        lookups = self._counters["hits"] + self._counters["misses"]
+        return {
+            "enabled": self.enabled,
+            "parser_version": self.parser_version,
+            "entries": entries,
+            "bytes": total_bytes,
+            "max_bytes": self.max_bytes,
+            "hit_rate": round(self._counters["hits"] / lookups, 4) if lookups else 0.0,
+            **self._counters
+        }
+
+
+# Shared cache for extracted PDF text
+pdf_text_cache = PDFTextCache()
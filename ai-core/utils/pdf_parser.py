@@ -1,137 +1,834 @@
 import PyPDF2
 import io
-from typing import Dict, Any, List
-import re
+import os
+import sys
+import mmap
+import time
+import asyncio
+from typing import Dict, Any, AsyncIterator, Iterable, Iterator, List, Optional, Tuple
 import logging
+from utils.pdf_cache import pdf_text_cache, document_digest
+from utils.text_normalizer import get_normalizer
+from utils.repeated_lines import RepeatedLineFilter
+from utils.pdf_worker_pool import pdf_worker_pool, WorkerLimitExceeded
+from utils.pdf_text_layer import detect_text_layer
 
 logger = logging.getLogger(__name__)
 
-class PDFParser:
-    """PDF parsing utility for extracting text from PDF documents."""
+# Part of the extraction cache key; bump whenever extraction or cleaning rules change
+PARSER_VERSION = "6"
 
-    @staticmethod
-    def extract_text_from_buffer(pdf_buffer: bytes) -> str:
+# Hard upper bound on a worker job: the cooperative decode deadline plus this grace period
+_WORKER_KILL_GRACE_SECONDS = 2.0
+
+
+def _get_worker_count() -> int:
+    return int(os.getenv("PDF_WORKERS", os.cpu_count() or 1))
+
+
+def _get_parallel_workers() -> int:
+    """Workers a document may be split across: no more than there are CPUs to run them."""
+    return max(1, min(_get_worker_count(), os.cpu_count() or 1))
+
+
+def _sandbox_enabled() -> bool:
+    return os.getenv("PDF_SANDBOX", "true").lower() == "true"
+
+
+def _strip_repeated_lines_enabled() -> bool:
+    return os.getenv("PDF_STRIP_REPEATED_LINES", "true").lower() == "true"
+
+
+def extraction_version() -> str:
+    """PARSER_VERSION plus the configured cleaning options, which also change the text."""
+    strip = "strip" if _strip_repeated_lines_enabled() else "keep"
+    return f"{PARSER_VERSION}-{get_normalizer().mode}-{strip}"
+
+
+class PDFLimitError(Exception):
+    """Raised as soon as a PDF exceeds one of its PDFLimits caps."""
+
+    def __init__(self, limit: str, value: float, maximum: float):
+        super().__init__(f"PDF exceeds the {limit} limit ({value} > {maximum})")
+        self.limit = limit
+        self.value = value
+        self.maximum = maximum
+
+    def __reduce__(self):
+        # Raised inside process-pool workers, so it must survive pickling
+        return (PDFLimitError, (self.limit, self.value, self.maximum))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"limit": self.limit, "value": self.value, "max": self.maximum}
+
+
+class PDFLimits:
+    """
+    Resource caps for parsing one PDF; 0 disables a cap.
+
+    - max_file_bytes: size of the file itself
+    - max_pages: pages in the document
+    - max_page_chars: characters extracted from any single page
+    - max_decode_seconds: wall-clock time spent extracting text; in the
+      sandboxed worker pool a worker still busy shortly after this is killed
+    - max_cpu_seconds: CPU time of one worker job (POSIX only)
+    """
+
+    def __init__(
+        self,
+        max_file_bytes: int = 0,
+        max_pages: int = 0,
+        max_page_chars: int = 0,
+        max_decode_seconds: float = 0,
+        max_cpu_seconds: float = 0
+    ):
+        self.max_file_bytes = max_file_bytes
+        self.max_pages = max_pages
+        self.max_page_chars = max_page_chars
+        self.max_decode_seconds = max_decode_seconds
+        self.max_cpu_seconds = max_cpu_seconds
+
+    @classmethod
+    def from_env(cls) -> "PDFLimits":
+        return cls(
+            max_file_bytes=int(os.getenv("PDF_MAX_FILE_BYTES", 25 * 1024 * 1024)),
+            max_pages=int(os.getenv("PDF_MAX_PAGES", 200)),
+            max_page_chars=int(os.getenv("PDF_MAX_PAGE_CHARS", 100000)),
+            max_decode_seconds=float(os.getenv("PDF_MAX_DECODE_SECONDS", 30)),
+            max_cpu_seconds=float(os.getenv("PDF_MAX_CPU_SECONDS", 20))
+        )
+
+
+class _PageGuard:
+    """
+    Visitor callbacks that abort a page's text extraction mid-page once
+    it has produced too many characters or the decode deadline has passed.
+    """
+
+    # Operators between deadline checks; a time call per operator is measurable
+    CHECK_EVERY = 256
+
+    def __init__(self, limits: Optional[PDFLimits], deadline: Optional[float]):
+        self.max_chars = limits.max_page_chars if limits else 0
+        self.max_seconds = limits.max_decode_seconds if limits else 0
+        self.deadline = deadline
+        self.chars = 0
+        self.operators = 0
+
+    def check_deadline(self):
+        if self.deadline and time.time() > self.deadline:
+            elapsed = round(self.max_seconds + time.time() - self.deadline, 3)
+            raise PDFLimitError("decode_seconds", elapsed, self.max_seconds)
+
+    def check_chars(self, chars: int):
+        if self.max_chars and chars > self.max_chars:
+            raise PDFLimitError("page_chars", chars, self.max_chars)
+
+    def on_operator(self, operator, operands, cm, tm):
+        self.operators += 1
+        if self.operators % self.CHECK_EVERY == 0:
+            self.check_deadline()
+
+    def on_text(self, text, cm, tm, font_dict, font_size):
+        self.chars += len(text)
+        self.check_chars(self.chars)
+
+
+def _extract_pages(
+    reader: PyPDF2.PdfReader,
+    start: int,
+    end: int,
+    limits: Optional[PDFLimits] = None,
+    deadline: Optional[float] = None
+) -> List[str]:
+    """
+    Raw text of pages [start, end); pages that fail to extract come back empty.
+
+    Raises:
+        PDFLimitError: If a page exceeds max_page_chars or the deadline
+            (a ``time.time()`` value) passes.
+    """
+    pages_text = []
+    for page_num in range(start, end):
+        guard = _PageGuard(limits, deadline)
+        guard.check_deadline()
+        try:
+            page_text = reader.pages[page_num].extract_text(
+                visitor_operand_before=guard.on_operator,
+                visitor_text=guard.on_text
+            ) or ""
+        except PDFLimitError:
+            raise
+        except Exception as page_error:
+            logger.warning(f"Failed to extract text from page {page_num + 1}: {page_error}")
+            page_text = ""
+        guard.check_chars(len(page_text))
+        pages_text.append(page_text)
+    return pages_text
+
+
+def _extract_page_range(
+    source: Any,
+    start: int,
+    end: int,
+    limits: Optional[PDFLimits] = None,
+    deadline: Optional[float] = None
+) -> List[str]:
+    """
+    Worker entry point: parse the document and extract one page range.
+    ``source`` is a file path, which the worker maps itself, or the PDF bytes.
+    """
+    if isinstance(source, str):
+        with open(source, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return _extract_pages(PyPDF2.PdfReader(mapped), start, end, limits, deadline)
+    return _extract_pages(PyPDF2.PdfReader(io.BytesIO(source)), start, end, limits, deadline)
+
+
+def _inspect_document(
+    source: Any,
+    extract_below_pages: int,
+    limits: PDFLimits,
+    deadline: Optional[float]
+) -> Dict[str, Any]:
+    """
+    Worker entry point: page count, metadata, validation and the pages
+    validation sampled, so the parent process never runs PyPDF2 itself.
+    Documents with fewer than ``extract_below_pages`` pages have every page
+    extracted in the same job. ``source`` is a file path or the PDF bytes.
+    """
+    if isinstance(source, str):
+        document = ParsedDocument.from_file(source, limits=limits)
+    else:
+        document = ParsedDocument(source, limits=limits)
+    with document:
+        # The parent has already missed the extraction cache
+        document._cache_checked = True
+        document._deadline = deadline
+        validation = document.validate()
+        metadata = document.metadata()
+        if document.page_count < extract_below_pages:
+            document.raw_pages()
+        return {
+            "page_count": document.page_count,
+            "metadata": metadata,
+            "validation": validation,
+            "raw_pages": dict(document._raw_pages)
+        }
+
+
+def _split_page_ranges(page_count: int, parts: int) -> List[Tuple[int, int]]:
+    """Split [0, page_count) into at most `parts` contiguous, near-equal ranges."""
+    parts = max(1, min(parts, page_count))
+    size, extra = divmod(page_count, parts)
+    ranges = []
+    start = 0
+    for i in range(parts):
+        end = start + size + (1 if i < extra else 0)
+        ranges.append((start, end))
+        start = end
+    return ranges
+
+
+class ParsedDocument:
+    """
+    A PDF parsed once and shared by validation, metadata and text extraction.
+
+    The cross-reference table is read on first access and page text is
+    extracted lazily and memoized, so e.g. validate() followed by text()
+    extracts every page exactly once. Results of a successful text() are
+    stored in the content-hash cache; a document found there is served
+    without touching PyPDF2.
+
+    Parsing is bounded by ``limits`` (PDFLimits.from_env() by default);
+    exceeding any cap raises PDFLimitError. Use from_file() for documents
+    on disk: the file is memory-mapped rather than read into memory, and
+    should be closed when done.
+    """
+
+    def __init__(self, pdf_buffer: bytes, limits: Optional[PDFLimits] = None, file_path: Optional[str] = None):
+        self.limits = limits or PDFLimits.from_env()
+        self.pdf_buffer = pdf_buffer
+        self.file_path = file_path
+        self.file_size = len(pdf_buffer)
+        if self.limits.max_file_bytes and self.file_size > self.limits.max_file_bytes:
+            raise PDFLimitError("file_bytes", self.file_size, self.limits.max_file_bytes)
+        self.from_cache = False
+        self._deadline: Optional[float] = None
+        self._digest: Optional[str] = None
+        self._cache_checked = False
+        self._reader: Optional[PyPDF2.PdfReader] = None
+        self._page_count: Optional[int] = None
+        self._raw_pages: Dict[int, str] = {}
+        self._text: Optional[str] = None
+        self._clean_pages: Optional[List[str]] = None
+        self._metadata: Optional[Dict[str, Any]] = None
+        self._validation: Optional[Dict[str, Any]] = None
+        self._text_layer: Optional[Dict[str, Any]] = None
+        self._repeated_lines: Optional[Dict[str, Any]] = None
+
+    @classmethod
+    def from_file(cls, file_path: str, limits: Optional[PDFLimits] = None) -> "ParsedDocument":
         """
-        Extract text from an in‑memory PDF buffer.
+        Memory-map a PDF on disk instead of reading it.
+
+        Pages are only faulted in as PyPDF2 seeks to them, and the size cap
+        is checked before anything is mapped.
         """
+        limits = limits or PDFLimits.from_env()
+        with open(file_path, 'rb') as f:
+            file_size = os.fstat(f.fileno()).st_size
+            if limits.max_file_bytes and file_size > limits.max_file_bytes:
+                raise PDFLimitError("file_bytes", file_size, limits.max_file_bytes)
+            # Empty files can't be mapped
+            pdf_buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if file_size else b""
+        return cls(pdf_buffer, limits=limits, file_path=file_path)
+
+    def close(self):
+        """Release the file mapping (required before deleting the file on Windows)."""
+        if isinstance(self.pdf_buffer, mmap.mmap):
+            self._reader = None
+            self.pdf_buffer.close()
+
+    def __enter__(self) -> "ParsedDocument":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def deadline(self) -> Optional[float]:
+        """Wall-clock time by which text extraction must finish, started on first use."""
+        if self._deadline is None and self.limits.max_decode_seconds:
+            self._deadline = time.time() + self.limits.max_decode_seconds
+        return self._deadline
+
+    @property
+    def digest(self) -> str:
+        if self._digest is None:
+            self._digest = document_digest(self.pdf_buffer)
+        return self._digest
+
+    def _load_from_cache(self) -> bool:
+        """Fill results from the extraction cache (looked up at most once)."""
+        if not self._cache_checked:
+            self._cache_checked = True
+            cached = pdf_text_cache.get(self.digest)
+            if cached is not None:
+                self.from_cache = True
+                self._page_count = cached["page_count"]
+                self._text = cached["text"]
+                self._clean_pages = cached["pages"]
+                self._metadata = cached["metadata"]
+                self._validation = cached["validation"]
+                self._repeated_lines = cached["repeated_lines"]
+        return self.from_cache
+
+    def _store_in_cache(self):
         try:
-            pdf_file = io.BytesIO(pdf_buffer)
-            pdf_reader = PyPDF2.PdfReader(pdf_file)
+            result = {
+                "page_count": self.page_count,
+                "text": self._text,
+                "pages": self.pages(),
+                "metadata": self.metadata(),
+                "validation": self.validate(),
+                "repeated_lines": self._repeated_lines
+            }
+            pdf_text_cache.set(self.digest, result)
+        except Exception as e:
+            logger.warning(f"Not caching PDF extraction result: {e}")
 
-            if len(pdf_reader.pages) == 0:
-                raise Exception("PDF file is empty or corrupted")
+    @property
+    def reader(self) -> PyPDF2.PdfReader:
+        if self._reader is None:
+            # A mapped file is already a seekable stream; reading from it copies nothing up front
+            stream = self.pdf_buffer if isinstance(self.pdf_buffer, mmap.mmap) else io.BytesIO(self.pdf_buffer)
+            self._reader = PyPDF2.PdfReader(stream)
+        return self._reader
+
+    @property
+    def page_count(self) -> int:
+        if self._page_count is None:
+            page_count = len(self.reader.pages)
+            if self.limits.max_pages and page_count > self.limits.max_pages:
+                raise PDFLimitError("pages", page_count, self.limits.max_pages)
+            self._page_count = page_count
+        return self._page_count
+
+    def page_text(self, page_num: int) -> str:
+        """Raw extracted text of one page (0-based), memoized."""
+        if page_num not in self._raw_pages:
+            self._raw_pages[page_num] = self._extract_page(page_num)
+        return self._raw_pages[page_num]
+
+    def text_layer(self) -> Dict[str, Any]:
+        """Fast text-layer check on the content streams, memoized (see utils/pdf_text_layer.py)."""
+        if self._text_layer is None:
+            self._text_layer = detect_text_layer(self.reader)
+        return self._text_layer
+
+    @property
+    def has_no_text_layer(self) -> bool:
+        """True only when a completed check found no text on any page."""
+        text_layer = self._text_layer
+        if text_layer is None and self._validation is not None:
+            text_layer = self._validation.get('text_layer')
+        return text_layer is not None and text_layer['has_text_layer'] is False
+
+    def _extract_page(self, page_num: int) -> str:
+        # Image-only pages would only yield an empty string, slowly
+        if self.has_no_text_layer:
+            return ""
+        return _extract_pages(self.reader, page_num, page_num + 1, self.limits, self.deadline)[0]
+
+    def raw_pages(self) -> List[str]:
+        """Raw extracted text of every page."""
+        return [self.page_text(page_num) for page_num in range(self.page_count)]
+
+    async def _run_in_worker(self, func, *args) -> Any:
+        """Run a job for this document in the sandboxed worker pool."""
+        deadline = self.deadline
+        timeout = None
+        if deadline is not None:
+            timeout = max(0.0, deadline - time.time()) + _WORKER_KILL_GRACE_SECONDS
+        # Mapped files are re-mapped by path in the worker instead of being pickled
+        source = self.file_path if self.file_path is not None else bytes(self.pdf_buffer)
+        try:
+            return await pdf_worker_pool.run(
+                func, source, *args, self.limits, deadline,
+                timeout=timeout,
+                cpu_seconds=self.limits.max_cpu_seconds
+            )
+        except WorkerLimitExceeded as e:
+            if e.limit == "wall_seconds":
+                # The worker was killed: report it against the document's decode budget
+                elapsed = round(time.time() - deadline + self.limits.max_decode_seconds, 3)
+                raise PDFLimitError("decode_seconds", elapsed, self.limits.max_decode_seconds)
+            raise PDFLimitError(e.limit, e.value, e.maximum)
+
+    async def inspect_async(self, extract_below_pages: int = 0):
+        """
+        Load page count, metadata and validation off the event loop.
+
+        With PDF_SANDBOX on (the default) the document is opened in the
+        worker pool, so a pathological file can't hang or crash the API
+        process; otherwise on a thread. Documents with fewer than
+        ``extract_below_pages`` pages also have all their pages extracted,
+        saving a second parse in another job.
+
+        Raises:
+            PDFLimitError: If the document exceeds a cap.
+            PyPDF2.errors.PdfReadError: If the document can't be read.
+        """
+        if await asyncio.to_thread(self._load_from_cache):
+            return
+        if self._page_count is not None and self._metadata is not None and self._validation is not None:
+            return
+        if not _sandbox_enabled():
+            await asyncio.to_thread(lambda: (self.page_count, self.validate(), self.metadata()))
+            return
+        result = await self._run_in_worker(_inspect_document, extract_below_pages)
+        self._page_count = result["page_count"]
+        self._metadata = result["metadata"]
+        self._validation = result["validation"]
+        for page_num, page_text in result["raw_pages"].items():
+            self._raw_pages.setdefault(page_num, page_text)
 
-            text_parts = []
-            for page_num in range(len(pdf_reader.pages)):
-                try:
-                    page = pdf_reader.pages[page_num]
-                    page_text = page.extract_text() or ""
-                    if page_text.strip():
-                        text_parts.append(page_text)
-                except Exception as page_error:
-                    logger.warning(f"Failed to extract text from page {page_num + 1}: {page_error}")
+    def _first_missing_page(self) -> int:
+        page_num = 0
+        while page_num in self._raw_pages:
+            page_num += 1
+        return page_num
 
+    async def _extract_range_async(self, start: int, end: int):
+        """Memoize raw text of pages [start, end) not extracted yet, via the worker pool."""
+        while start < end and start in self._raw_pages:
+            start += 1
+        if start >= end:
+            return
+        if self.has_no_text_layer:
+            for page_num in range(start, end):
+                self._raw_pages[page_num] = ""
+            return
+        chunk = await self._run_in_worker(_extract_page_range, start, end)
+        for offset, page_text in enumerate(chunk):
+            self._raw_pages.setdefault(start + offset, page_text)
+
+    async def extract_pages_async(self):
+        """
+        Extract every page that isn't memoized yet, off the event loop.
+
+        Documents with at least PDF_PARALLEL_MIN_PAGES pages are split into
+        page ranges extracted in parallel on the worker pool and merged in
+        page order. Smaller ones, and every document when there is only one
+        CPU, are extracted sequentially: by a single worker job, or on one
+        thread when PDF_SANDBOX is off. Each range re-parses the document, so
+        splitting only pays when the ranges really run at the same time.
+        """
+        workers = _get_parallel_workers()
+        min_parallel_pages = int(os.getenv("PDF_PARALLEL_MIN_PAGES", 16))
+        # Documents that won't be split across workers are extracted by the inspection job itself
+        extract_below_pages = min_parallel_pages if workers > 1 else sys.maxsize
+        await self.inspect_async(extract_below_pages=extract_below_pages)
+        if self.from_cache:
+            return
+        page_count = self.page_count
+        start = self._first_missing_page()
+        if start >= page_count:
+            return
+
+        parallel = workers > 1 and page_count >= min_parallel_pages
+        if not parallel and not _sandbox_enabled():
+            await asyncio.to_thread(self.raw_pages)
+            return
+
+        ranges = _split_page_ranges(page_count - start, workers if parallel else 1)
+        await asyncio.gather(*(
+            self._extract_range_async(start + range_start, start + range_end)
+            for range_start, range_end in ranges
+        ))
+
+    def text(self) -> str:
+        """Cleaned full text; raises if the document has no extractable text."""
+        self._load_from_cache()
+        if self._text is None:
+            if self.page_count == 0:
+                raise Exception("PDF file is empty or corrupted")
+            # Pages are cleaned in order the same way, so streaming consumers see the same text
+            text_parts = [page_text for page_text in self.pages() if page_text]
             if not text_parts:
+                if self.has_no_text_layer:
+                    raise Exception("No text could be extracted from the PDF: it has no text layer (scanned or image-only)")
                 raise Exception("No text could be extracted from the PDF")
+            self._text = "\n".join(text_parts)
+            self._store_in_cache()
+        return self._text
+
+    def pages(self) -> List[str]:
+        """Cleaned text per page."""
+        self._load_from_cache()
+        if self._clean_pages is None:
+            self._clean_pages = list(self._cleaned(self.raw_pages()))
+        return self._clean_pages
+
+    def _cleaned(self, raw_pages: Iterable[str]) -> Iterator[str]:
+        """Normalize pages in order, dropping headers and footers repeated from earlier pages."""
+        normalizer = get_normalizer()
+        repeats = RepeatedLineFilter() if _strip_repeated_lines_enabled() else None
+        for raw_text in raw_pages:
+            page_text = normalizer.normalize(raw_text)
+            yield repeats.strip(page_text) if repeats else page_text
+        if repeats:
+            self._repeated_lines = repeats.stats()
+            if repeats.lines_removed:
+                logger.info(f"Stripped repeated header/footer lines: {self._repeated_lines}")
+
+    @property
+    def repeated_lines(self) -> Optional[Dict[str, Any]]:
+        """
+        What stripping repeated headers and footers saved, once every page is
+        cleaned: ``lines_removed``, ``bytes_saved`` and ``tokens_saved``
+        (estimated). None before that or with PDF_STRIP_REPEATED_LINES off.
+        """
+        return self._repeated_lines
+
+    def iter_pages(self) -> Iterator[str]:
+        """
+        Cleaned text per page, yielded as each page is decoded.
+
+        Raw page text is released as soon as it is cleaned (pages already
+        memoized, e.g. by validate(), are reused), so only the cleaned pages
+        accumulate. Once
+        every page has been yielded the result is memoized and cached as if
+        text() had been called.
+        """
+        if self._load_from_cache() or self._clean_pages is not None:
+            yield from self._clean_pages
+            return
+
+        def raw_pages() -> Iterator[str]:
+            for page_num in range(self.page_count):
+                raw_text = self._raw_pages.pop(page_num, None)
+                yield self._extract_page(page_num) if raw_text is None else raw_text
+
+        clean_pages = []
+        for page_text in self._cleaned(raw_pages()):
+            clean_pages.append(page_text)
+            yield page_text
+        self._clean_pages = clean_pages
+        if any(clean_pages):
+            self._text = "\n".join(page_text for page_text in clean_pages if page_text)
+            self._store_in_cache()
+
+    async def aiter_pages(self) -> AsyncIterator[str]:
+        """
+        iter_pages() for async consumers.
+
+        Pages are decoded ahead of the consumer, so the caller can analyze
+        page N while page N+1 is being parsed: in worker-pool jobs of
+        PDF_STREAM_CHUNK_PAGES pages with PDF_SANDBOX on, otherwise one page
+        at a time on a thread.
+        """
+        if _sandbox_enabled():
+            async for page_text in self._aiter_pages_sandboxed():
+                yield page_text
+            return
+        pages = self.iter_pages()
+        read_ahead = asyncio.ensure_future(asyncio.to_thread(next, pages, None))
+        try:
+            while True:
+                page_text = await read_ahead
+                if page_text is None:
+                    return
+                read_ahead = asyncio.ensure_future(asyncio.to_thread(next, pages, None))
+                yield page_text
+        finally:
+            # The generator can't be closed while a worker thread is still inside it
+            await asyncio.wait([read_ahead])
+            pages.close()
 
-            return PDFParser._clean_extracted_text("\n".join(text_parts))
+    async def _aiter_pages_sandboxed(self) -> AsyncIterator[str]:
+        await self.inspect_async()
+        if self.from_cache:
+            for page_text in self._clean_pages:
+                yield page_text
+            return
+        chunk_pages = max(1, int(os.getenv("PDF_STREAM_CHUNK_PAGES", 4)))
+        ranges = [
+            (start, min(start + chunk_pages, self.page_count))
+            for start in range(0, self.page_count, chunk_pages)
+        ]
+        # Every page is memoized before iter_pages() reaches it, so it never parses in this process
+        pages = self.iter_pages()
+        read_ahead = None
+        try:
+            for i, (start, end) in enumerate(ranges):
+                current = read_ahead or asyncio.ensure_future(self._extract_range_async(start, end))
+                read_ahead = None
+                if i + 1 < len(ranges):
+                    read_ahead = asyncio.ensure_future(self._extract_range_async(*ranges[i + 1]))
+                await current
+                for _ in range(start, end):
+                    yield next(pages)
+            # Finishing the generator memoizes the result and writes the cache
+            await asyncio.to_thread(list, pages)
+        finally:
+            if read_ahead is not None:
+                await asyncio.wait([read_ahead])
+                if not read_ahead.cancelled():
+                    # Already failing or stopped early; don't leave the error unretrieved
+                    read_ahead.exception()
+            pages.close()
+
+    def metadata(self) -> Dict[str, Any]:
+        self._load_from_cache()
+        if self._metadata is not None:
+            return dict(self._metadata)
+        reader = self.reader
+        metadata = {
+            'pages': self.page_count,
+            'encrypted': reader.is_encrypted
+        }
+
+        if reader.metadata:
+            doc_info = reader.metadata
+            metadata.update({
+                'title': doc_info.get('/Title', ''),
+                'author': doc_info.get('/Author', ''),
+                'subject': doc_info.get('/Subject', ''),
+                'creator': doc_info.get('/Creator', ''),
+                'producer': doc_info.get('/Producer', ''),
+                'creation_date': str(doc_info.get('/CreationDate', '')),
+                'modification_date': str(doc_info.get('/ModDate', ''))
+            })
+
+        self._metadata = metadata
+        return dict(metadata)
+
+    def validate(self) -> Dict[str, Any]:
+        self._load_from_cache()
+        if self._validation is not None:
+            return dict(self._validation, errors=list(self._validation['errors']))
+        validation = {
+            'is_valid': False,
+            'is_readable': False,
+            'has_text': False,
+            'page_count': 0,
+            'file_size': self.file_size,
+            'errors': []
+        }
+        try:
+            self.reader
+            validation['is_valid'] = True
+            validation['page_count'] = self.page_count
+
+            if validation['page_count'] > 0:
+                validation['is_readable'] = True
+                text_layer = self.text_layer()
+                validation['text_layer'] = text_layer
+                if text_layer['has_text_layer'] is not None:
+                    validation['has_text'] = text_layer['has_text_layer']
+                else:
+                    # Undecided by the content-stream scan: sample extracted text instead
+                    sample_text = ""
+                    for i in range(min(3, validation['page_count'])):
+                        # Memoized, so text() won't extract these pages again
+                        sample_text += self.page_text(i)
+                        if len(sample_text.strip()) > 50:
+                            validation['has_text'] = True
+                            break
+
+            if self.reader.is_encrypted:
+                validation['errors'].append("PDF is encrypted")
+
+        except PyPDF2.errors.PdfReadError as e:
+            validation['errors'].append(f"PDF read error: {e}")
+        except Exception as e:
+            validation['errors'].append(f"Validation error: {e}")
 
+        self._validation = validation
+        return dict(validation, errors=list(validation['errors']))
+
+
+class PDFParser:
+    """PDF parsing utility for extracting text from PDF documents."""
+
+    @staticmethod
+    def parse(pdf_buffer: bytes) -> ParsedDocument:
+        """
+        Wrap a PDF buffer in a parse-once ParsedDocument.
+
+        Prefer this over the individual helpers below when more than one of
+        validation, metadata and text is needed for the same document.
+        """
+        return ParsedDocument(pdf_buffer)
+
+    @staticmethod
+    def iter_pages(pdf_buffer: bytes) -> Iterator[str]:
+        """
+        Yield cleaned text page by page as each page is decoded (see
+        ParsedDocument.iter_pages).
+        """
+        try:
+            yield from ParsedDocument(pdf_buffer).iter_pages()
+        except PDFLimitError:
+            raise
+        except PyPDF2.errors.PdfReadError as pdf_error:
+            raise Exception(f"PDF file is invalid: {pdf_error}")
+
+    @staticmethod
+    def extract_text_from_buffer(pdf_buffer: bytes) -> str:
+        """
+        Extract text from an in‑memory PDF buffer.
+        """
+        try:
+            return ParsedDocument(pdf_buffer).text()
+        except PDFLimitError:
+            raise
         except PyPDF2.errors.PdfReadError as pdf_error:
             raise Exception(f"PDF file is invalid: {pdf_error}")
         except Exception as e:
             raise Exception(f"PDF parsing failed: {e}")
 
+    @staticmethod
+    async def extract_text_from_buffer_async(pdf_buffer: bytes) -> str:
+        """
+        Extract text without blocking the event loop (see
+        ParsedDocument.extract_pages_async). Output is identical to
+        extract_text_from_buffer().
+        """
+        return await PDFParser.extract_text_async(ParsedDocument(pdf_buffer))
+
+    @staticmethod
+    async def extract_text_async(document: ParsedDocument) -> str:
+        """Cleaned full text of an already wrapped document, extracted off the event loop."""
+        try:
+            await document.extract_pages_async()
+            return await asyncio.to_thread(document.text)
+        except PDFLimitError:
+            raise
+        except PyPDF2.errors.PdfReadError as pdf_error:
+            raise Exception(f"PDF file is invalid: {pdf_error}")
+        except Exception as e:
+            raise Exception(f"PDF parsing failed: {e}")
+
+    @staticmethod
+    async def parse_file_async(file_path: str) -> ParsedDocument:
+        """Memory-map a PDF on disk off the event loop (see ParsedDocument.from_file); close it when done."""
+        try:
+            return await asyncio.to_thread(ParsedDocument.from_file, file_path)
+        except FileNotFoundError:
+            raise Exception(f"PDF file not found: {file_path}")
+        except PermissionError:
+            raise Exception(f"Permission denied: {file_path}")
+
+    @staticmethod
+    async def extract_text_from_file_async(file_path: str) -> str:
+        """Async counterpart of extract_text_from_file()."""
+        with await PDFParser.parse_file_async(file_path) as document:
+            return await PDFParser.extract_text_async(document)
+
+    @staticmethod
+    def shutdown_workers():
+        """Stop the PDF worker processes, if any were started."""
+        pdf_worker_pool.shutdown()
+
     @staticmethod
     def extract_text_from_file(file_path: str) -> str:
-        """Extract text from a PDF file on disk."""
+        """Extract text from a PDF file on disk (memory-mapped, see ParsedDocument.from_file)."""
         try:
-            with open(file_path, 'rb') as f:
-                return PDFParser.extract_text_from_buffer(f.read())
+            with ParsedDocument.from_file(file_path) as document:
+                return document.text()
         except FileNotFoundError:
             raise Exception(f"PDF file not found: {file_path}")
         except PermissionError:
             raise Exception(f"Permission denied: {file_path}")
+        except PDFLimitError:
+            raise
         except Exception as e:
             raise Exception(f"Failed to read PDF file: {e}")
 
     @staticmethod
     def _clean_extracted_text(text: str) -> str:
-        """Clean up extracted text."""
-        if not text:
-            return ""
-        text = re.sub(r'\n\s*\n', '\n\n', text)  # compress blank lines
-        text = re.sub(r' +', ' ', text)          # compress spaces
-        text = re.sub(r'[^\x00-\x7F]+', ' ', text)
-        text = text.replace('\f', '\n')
-        text = re.sub(r'(?<=[a-z])\n(?=[a-z])', ' ', text)
-        text = re.sub(r'\n+', '\n', text)
-        return text.strip()
+        """Clean up extracted text (single pass, see utils/text_normalizer.py)."""
+        return get_normalizer().normalize(text)
 
     @staticmethod
     def extract_metadata(pdf_buffer: bytes) -> Dict[str, Any]:
         """Extract metadata from a PDF."""
         try:
-            pdf_file = io.BytesIO(pdf_buffer)
-            reader = PyPDF2.PdfReader(pdf_file)
-
-            metadata = {
-                'pages': len(reader.pages),
-                'encrypted': reader.is_encrypted
-            }
-
-            if reader.metadata:
-                doc_info = reader.metadata
-                metadata.update({
-                    'title': doc_info.get('/Title', ''),
-                    'author': doc_info.get('/Author', ''),
-                    'subject': doc_info.get('/Subject', ''),
-                    'creator': doc_info.get('/Creator', ''),
-                    'producer': doc_info.get('/Producer', ''),
-                    'creation_date': str(doc_info.get('/CreationDate', '')),
-                    'modification_date': str(doc_info.get('/ModDate', ''))
-                })
-
-            return metadata
+            return ParsedDocument(pdf_buffer).metadata()
         except Exception as e:
             logger.error(f"Failed to extract PDF metadata: {e}")
             return {'pages': 0, 'encrypted': False, 'error': str(e)}
 
+    @staticmethod
+    def detect_text_layer(pdf_buffer: bytes) -> Dict[str, Any]:
+        """
+        Tell text PDFs from scanned/image-only ones without extracting text
+        (see utils/pdf_text_layer.py).
+        """
+        return ParsedDocument(pdf_buffer).text_layer()
+
+    @staticmethod
+    def has_text_layer(pdf_buffer: bytes) -> bool:
+        """False only when no page of the PDF shows any text."""
+        return PDFParser.detect_text_layer(pdf_buffer)['has_text_layer'] is not False
+
     @staticmethod
     def validate_pdf(pdf_buffer: bytes) -> Dict[str, Any]:
         """Validate a PDF file."""
-        validation = {
-            'is_valid': False,
-            'is_readable': False,
-            'has_text': False,
-            'page_count': 0,
-            'file_size': len(pdf_buffer),
-            'errors': []
-        }
         try:
-            pdf_file = io.BytesIO(pdf_buffer)
-            reader = PyPDF2.PdfReader(pdf_file)
-            validation['is_valid'] = True
-            validation['page_count'] = len(reader.pages)
-
-            if validation['page_count'] > 0:
-                validation['is_readable'] = True
-                sample_text = ""
-                for i in range(min(3, validation['page_count'])):
-                    page_text = reader.pages[i].extract_text() or ""
-                    sample_text += page_text
-                    if len(sample_text.strip()) > 50:
-                        validation['has_text'] = True
-                        break
-
-            if reader.is_encrypted:
-                validation['errors'].append("PDF is encrypted")
-
-        except PyPDF2.errors.PdfReadError as e:
-            validation['errors'].append(f"PDF read error: {e}")
-        except Exception as e:
-            validation['errors'].append(f"Validation error: {e}")
-
-        return validation
+            return ParsedDocument(pdf_buffer).validate()
+        except PDFLimitError as e:
+            # Over a cap before parsing starts: still report rather than raise
+            return {
+                'is_valid': False,
+                'is_readable': False,
+                'has_text': False,
+                'page_count': 0,
+                'file_size': len(pdf_buffer),
+                'errors': [str(e)]
+            }
 
     @staticmethod
     def extract_text_by_pages(pdf_buffer: bytes) -> List[str]:
@@ -139,16 +836,8 @@ class PDFParser:
         Extract text from PDF as a list of strings, one per page.
         """
         try:
-            pdf_file = io.BytesIO(pdf_buffer)
-            reader = PyPDF2.PdfReader(pdf_file)
-            pages_text = []
-            for page_num in range(len(reader.pages)):
-                try:
-                    page_text = reader.pages[page_num].extract_text() or ""
-                    pages_text.append(PDFParser._clean_extracted_text(page_text))
-                except Exception as err:
-                    logger.warning(f"Error extracting page {page_num + 1}: {err}")
-                    pages_text.append("")
-            return pages_text
+            return ParsedDocument(pdf_buffer).pages()
+        except PDFLimitError:
+            raise
         except Exception as e:
             raise Exception(f"PDF page extraction failed: {e}")
@@ -0,0 +1,126 @@
+import re
+import logging
+from typing import Dict, Any, Optional, Set
+
+import PyPDF2
+
+logger = logging.getLogger(__name__)
+
+# Start of a text object
+_BEGIN_TEXT = re.compile(rb"(?<![A-Za-z])BT(?![A-Za-z])")
+
+# A string or string array operand followed by a text-showing operator (Tj, TJ, ' or ")
+_SHOW_TEXT = re.compile(rb"[)>\]]\s*(?:Tj|TJ|'|\")")
+
+# Inline image (scanners sometimes embed the page image directly in the content stream)
+_INLINE_IMAGE = re.compile(rb"(?<![A-Za-z])BI(?![A-Za-z])")
+
+# Form XObjects nest; real documents rarely go beyond a couple of levels
+_MAX_FORM_DEPTH = 4
+
+
+def _stream_data(contents) -> bytes:
+    """Decoded bytes of a content stream or an array of content streams."""
+    if contents is None:
+        return b""
+    contents = contents.get_object()
+    if isinstance(contents, PyPDF2.generic.ArrayObject):
+        return b"\n".join(_stream_data(part) for part in contents)
+    return contents.get_data()
+
+
+def _shows_text(data: bytes) -> bool:
+    return _BEGIN_TEXT.search(data) is not None and _SHOW_TEXT.search(data) is not None
+
+
+def _scan_resources(resources, fonts: Set[str], counts: Dict[str, int], seen: Set[Any], depth: int) -> bool:
+    """Collect fonts and images from a resource dictionary; True if a nested form shows text."""
+    if resources is None:
+        return False
+    resources = resources.get_object()
+    for name in (resources.get("/Font") or {}).keys():
+        fonts.add(str(name))
+
+    shows_text = False
+    for ref in (resources.get("/XObject") or {}).values():
+        xobject = ref.get_object()
+        # Shared forms and images are referenced from many pages; look at each once
+        key = (ref.idnum, ref.generation) if isinstance(ref, PyPDF2.generic.IndirectObject) else id(xobject)
+        if key in seen:
+            continue
+        seen.add(key)
+        subtype = xobject.get("/Subtype")
+        if subtype == "/Image":
+            counts["images"] += 1
+        elif subtype == "/Form" and depth < _MAX_FORM_DEPTH:
+            if _shows_text(xobject.get_data()):
+                shows_text = True
+            if _scan_resources(xobject.get("/Resources"), fonts, counts, seen, depth + 1):
+                shows_text = True
+    return shows_text
+
+
+def detect_text_layer(reader: PyPDF2.PdfReader, max_pages: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Decide whether a PDF has a text layer without running text extraction.
+
+    Scans each page's content stream (and the Form XObjects it uses) for a
+    text object with a text-showing operator, stopping at the first page
+    that has one. No layout analysis, font decoding or string building is
+    done, so image-only documents (scanned resumes) are told apart from
+    text documents far faster than extracting even one page.
+
+    Args:
+        reader (PyPDF2.PdfReader): Opened document.
+        max_pages (Optional[int]): Scan at most this many pages (all by default).
+
+    Returns:
+        Dict[str, Any]: ``has_text_layer`` (None when some pages couldn't
+        be or weren't scanned), ``first_text_page`` (0-based or None),
+        ``pages_scanned``, ``fonts`` and ``images`` seen on the scanned
+        pages, and ``classification``: "text", "image_only", "empty" or
+        "unknown".
+    """
+    page_count = len(reader.pages)
+    limit = page_count if max_pages is None else min(page_count, max_pages)
+    fonts: Set[str] = set()
+    counts = {"images": 0}
+    seen: Set[Any] = set()
+    first_text_page = None
+    pages_scanned = 0
+    scan_errors = 0
+
+    for page_num in range(limit):
+        pages_scanned += 1
+        page = reader.pages[page_num]
+        try:
+            shows_text = _scan_resources(page.get("/Resources"), fonts, counts, seen, 0)
+            data = _stream_data(page.get("/Contents"))
+            shows_text = _shows_text(data) or shows_text
+            if not shows_text and _INLINE_IMAGE.search(data):
+                counts["images"] += 1
+        except Exception as page_error:
+            logger.warning(f"Failed to scan page {page_num + 1} for text: {page_error}")
+            scan_errors += 1
+            continue
+        if shows_text:
+            first_text_page = page_num
+            break
+
+    if first_text_page is not None:
+        has_text_layer, classification = True, "text"
+    elif scan_errors or limit < page_count:
+        # Pages we couldn't or didn't look at may still have text
+        has_text_layer, classification = None, "unknown"
+    elif counts["images"]:
+        has_text_layer, classification = False, "image_only"
+    else:
+        has_text_layer, classification = False, "empty"
+    return {
+        "has_text_layer": has_text_layer,
+        "first_text_page": first_text_page,
+        "pages_scanned": pages_scanned,
+        "fonts": len(fonts),
+        "images": counts["images"],
+        "classification": classification
+    }
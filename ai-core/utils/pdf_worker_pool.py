@@ -0,0 +1,307 @@
+import os
+import math
+import time
+import signal
+import asyncio
+import logging
+import multiprocessing
+from collections import deque
+from typing import Dict, Any, List, Optional, Callable
+
+try:
+    import resource
+except ImportError:  # Windows: no per-process CPU or memory rlimits
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+# Recent job durations kept per worker for percentiles
+_DURATION_WINDOW = 1000
+
+
+class WorkerLimitExceeded(Exception):
+    """Raised when a job exceeds its wall-clock or CPU limit and its worker is stopped."""
+
+    def __init__(self, limit: str, value: float, maximum: float):
+        super().__init__(f"PDF worker exceeded the {limit} limit ({value} > {maximum})")
+        self.limit = limit
+        self.value = value
+        self.maximum = maximum
+
+    def __reduce__(self):
+        return (WorkerLimitExceeded, (self.limit, self.value, self.maximum))
+
+
+class WorkerCrashed(Exception):
+    """Raised when a worker process dies while running a job."""
+
+
+class _CPULimitReached(BaseException):
+    # BaseException so PyPDF2's broad `except Exception` handlers can't swallow it
+    pass
+
+
+def _on_cpu_limit(signum, frame):
+    raise _CPULimitReached()
+
+
+def _cpu_seconds_used() -> float:
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+def _worker_main(conn, max_memory_bytes: int):
+    """Worker process loop: run jobs from the pipe until told to stop."""
+    # Ctrl+C goes to the whole process group; the parent decides when workers stop
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    if resource is not None:
+        if max_memory_bytes:
+            resource.setrlimit(resource.RLIMIT_AS, (max_memory_bytes, max_memory_bytes))
+        signal.signal(signal.SIGXCPU, _on_cpu_limit)
+
+    while True:
+        try:
+            job = conn.recv()
+        except (EOFError, OSError):
+            return
+        if job is None:
+            return
+        func, args, cpu_seconds = job
+
+        cpu_limited = resource is not None and cpu_seconds
+        started_cpu = 0.0
+        if cpu_limited:
+            # Only the soft limit moves: an unprivileged process can't raise its hard limit again
+            started_cpu = _cpu_seconds_used()
+            _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+            resource.setrlimit(resource.RLIMIT_CPU, (math.ceil(started_cpu + cpu_seconds), hard))
+        try:
+            reply = ("ok", func(*args))
+        except _CPULimitReached:
+            used = round(_cpu_seconds_used() - started_cpu, 3)
+            reply = ("error", WorkerLimitExceeded("cpu_seconds", used, cpu_seconds))
+        except Exception as e:
+            reply = ("error", e)
+        finally:
+            if cpu_limited:
+                resource.setrlimit(resource.RLIMIT_CPU, (resource.RLIM_INFINITY, hard))
+
+        try:
+            conn.send(reply)
+        except Exception as e:
+            # e.g. an exception type that doesn't pickle
+            conn.send(("error", Exception(f"{type(e).__name__}: {e}")))
+
+
+class _WorkerSlot:
+    """One worker position in the pool; its process is replaced when killed or recycled."""
+
+    def __init__(self, index: int):
+        self.index = index
+        self.process: Optional[multiprocessing.Process] = None
+        self.conn = None
+        self.docs_since_start = 0
+        self.counters = {
+            "docs": 0,
+            "errors": 0,
+            "kills": 0,
+            "cpu_limit_hits": 0,
+            "crashes": 0,
+            "recycles": 0,
+            "starts": 0
+        }
+        self.durations = deque(maxlen=_DURATION_WINDOW)
+
+    @property
+    def alive(self) -> bool:
+        return self.process is not None and self.process.is_alive()
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(math.ceil(fraction * len(ordered))) - 1)]
+
+
+class PDFWorkerPool:
+    """
+    Sandboxed process pool for PDF parsing.
+
+    Unlike ProcessPoolExecutor, each worker is owned individually, so one
+    that runs past its job's wall-clock timeout can be killed and replaced
+    without disturbing the others. Each job also gets a CPU-time budget via
+    RLIMIT_CPU (POSIX only), which interrupts runaway pure-Python parsing
+    inside the worker. Workers are recycled after PDF_WORKER_MAX_DOCS jobs
+    to bound memory growth, and PDF_WORKER_MAX_MEMORY_MB optionally caps
+    each worker's address space.
+
+    A "doc" in the stats is one job: a whole document or one page range of it.
+    """
+
+    def __init__(self):
+        self._configured = False
+        self._slots: List[_WorkerSlot] = []
+        self._idle: Optional[asyncio.Queue] = None
+        self._context = multiprocessing.get_context("spawn")
+
+    def _ensure_configured(self):
+        # Configured on first use so values from .env (loaded after import) apply
+        if self._configured:
+            return
+        self.size = max(1, int(os.getenv("PDF_WORKERS", os.cpu_count() or 1)))
+        self.max_docs = int(os.getenv("PDF_WORKER_MAX_DOCS", 100))
+        self.max_memory_bytes = int(os.getenv("PDF_WORKER_MAX_MEMORY_MB", 0)) * 1024 * 1024
+        self._slots = [_WorkerSlot(i) for i in range(self.size)]
+        self._configured = True
+
+    def _idle_slots(self) -> asyncio.Queue:
+        # Created lazily so it binds to the running loop
+        if self._idle is None:
+            self._idle = asyncio.Queue()
+            for slot in self._slots:
+                self._idle.put_nowait(slot)
+        return self._idle
+
+    def _start(self, slot: _WorkerSlot):
+        # spawn, not fork: the parent runs an event loop and helper threads
+        parent_conn, child_conn = self._context.Pipe()
+        process = self._context.Process(
+            target=_worker_main,
+            args=(child_conn, self.max_memory_bytes),
+            name=f"pdf-worker-{slot.index}",
+            daemon=True
+        )
+        process.start()
+        child_conn.close()
+        slot.process = process
+        slot.conn = parent_conn
+        slot.docs_since_start = 0
+        slot.counters["starts"] += 1
+
+    def _stop(self, slot: _WorkerSlot, graceful: bool = False):
+        process, conn = slot.process, slot.conn
+        slot.process = None
+        slot.conn = None
+        slot.docs_since_start = 0
+        if process is None:
+            return
+        if graceful and process.is_alive():
+            try:
+                conn.send(None)
+            except Exception:
+                pass
+            process.join(timeout=2)
+        if process.is_alive():
+            process.kill()
+            process.join(timeout=2)
+        conn.close()
+
+    async def run(
+        self,
+        func: Callable,
+        *args,
+        timeout: Optional[float] = None,
+        cpu_seconds: float = 0
+    ) -> Any:
+        """
+        Run a picklable module-level function in a worker process.
+
+        Args:
+            func (Callable): Function to call in the worker.
+            *args: Its (picklable) arguments.
+            timeout (Optional[float]): Wall-clock seconds before the worker is killed.
+            cpu_seconds (float): CPU seconds the job may use (0 for no limit).
+
+        Raises:
+            WorkerLimitExceeded: If the job ran out of wall-clock or CPU time.
+            WorkerCrashed: If the worker died, e.g. from a native crash or out of memory.
+        """
+        self._ensure_configured()
+        idle = self._idle_slots()
+        slot = await idle.get()
+        try:
+            return await self._run_on(slot, func, args, timeout, cpu_seconds)
+        finally:
+            idle.put_nowait(slot)
+
+    async def _run_on(self, slot: _WorkerSlot, func: Callable, args: tuple, timeout: Optional[float], cpu_seconds: float) -> Any:
+        if not slot.alive:
+            if slot.process is not None:
+                self._stop(slot)
+            await asyncio.to_thread(self._start, slot)
+
+        started = time.perf_counter()
+        try:
+            await asyncio.to_thread(slot.conn.send, (func, args, cpu_seconds))
+            ready = await asyncio.to_thread(slot.conn.poll, timeout)
+            if not ready:
+                elapsed = round(time.perf_counter() - started, 3)
+                slot.counters["kills"] += 1
+                logger.warning(f"Killing PDF worker {slot.process.pid} after {elapsed}s")
+                await asyncio.to_thread(self._stop, slot)
+                raise WorkerLimitExceeded("wall_seconds", elapsed, timeout)
+            status, value = await asyncio.to_thread(slot.conn.recv)
+        except asyncio.CancelledError:
+            # The worker is still busy with this job; its late reply would go to the next one
+            slot.counters["kills"] += 1
+            self._stop(slot)
+            raise
+        except (EOFError, OSError) as e:
+            exit_code = None
+            if slot.process is not None:
+                await asyncio.to_thread(slot.process.join, 1)
+                exit_code = slot.process.exitcode
+            slot.counters["crashes"] += 1
+            await asyncio.to_thread(self._stop, slot)
+            raise WorkerCrashed(f"PDF worker died while parsing (exit code {exit_code})")
+
+        slot.durations.append(time.perf_counter() - started)
+        slot.counters["docs"] += 1
+        slot.docs_since_start += 1
+        if self.max_docs and slot.docs_since_start >= self.max_docs:
+            slot.counters["recycles"] += 1
+            await asyncio.to_thread(self._stop, slot, True)
+
+        if status == "error":
+            slot.counters["errors"] += 1
+            if isinstance(value, WorkerLimitExceeded):
+                slot.counters["cpu_limit_hits"] += 1
+            raise value
+        return value
+
+    def shutdown(self):
+        """Stop every worker; they are started again on the next job."""
+        for slot in self._slots:
+            self._stop(slot, graceful=True)
+        self._idle = None
+
+    def stats(self) -> Dict[str, Any]:
+        self._ensure_configured()
+        workers = []
+        for slot in self._slots:
+            durations = list(slot.durations)
+            workers.append({
+                "worker": slot.index,
+                "pid": slot.process.pid if slot.process is not None else None,
+                "alive": slot.alive,
+                "docs_since_start": slot.docs_since_start,
+                "p50_ms": round(_percentile(durations, 0.5) * 1000, 2),
+                "p99_ms": round(_percentile(durations, 0.99) * 1000, 2),
+                **slot.counters
+            })
+        return {
+            "size": self.size,
+            "max_docs_per_worker": self.max_docs,
+            "max_memory_mb": self.max_memory_bytes // (1024 * 1024),
+            "cpu_limits_supported": resource is not None,
+            "docs": sum(w["docs"] for w in workers),
+            "kills": sum(w["kills"] for w in workers),
+            "cpu_limit_hits": sum(w["cpu_limit_hits"] for w in workers),
+            "crashes": sum(w["crashes"] for w in workers),
+            "workers": workers
+        }
+
+
+# Shared pool for PDF parsing
+pdf_worker_pool = PDFWorkerPool()
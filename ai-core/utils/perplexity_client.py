@@ -3,8 +3,18 @@ import asyncio
 import json
 import os
 import logging
-from typing import Dict, Any, Optional, List
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, Any, Optional, List, AsyncIterator, Tuple, Union
 from datetime import datetime
+from utils.http_pool import http_pool
+from utils.llm_cache import llm_cache, make_cache_key
+from utils.single_flight import llm_single_flight
+from utils.rate_limiter import llm_rate_limiter, parse_retry_after
+from utils.circuit_breaker import llm_circuit_breaker
+from utils.llm_replay import llm_replay
+from utils.usage_tracker import llm_usage, estimate_prompt_tokens
+from utils import deadline
 
 logger = logging.getLogger(__name__)
 
@@ -14,8 +24,13 @@ class PerplexityClient:
     """
 
     def __init__(self, api_key: Optional[str] = None):
+        # "live" calls the API, "record" also saves responses as fixtures,
+        # "replay" serves saved fixtures without touching the network
+        self.mode = os.getenv("PERPLEXITY_MODE", "live").lower()
         self.api_key = api_key or os.getenv("PERPLEXITY_API_KEY")
-        self.base_url = "https://api.perplexity.ai"
+        self.base_url = os.getenv("PERPLEXITY_BASE_URL", "https://api.perplexity.ai")
+        if self.mode == "replay" and not self.api_key:
+            self.api_key = "replay"
         if not self.api_key:
             raise ValueError("PERPLEXITY_API_KEY environment variable not set")
 
@@ -24,6 +39,8 @@ class PerplexityClient:
         self.max_retries = 3
         self.retry_delay = 1.0
         self.default_timeout = 60
+        # Attempts are skipped when less than this much of the request budget is left
+        self.min_attempt_seconds = 1.0
 
     async def chat(self, prompt: str, model: Optional[str] = None, **kwargs) -> str:
         """
@@ -32,7 +49,11 @@ class PerplexityClient:
         Args:
             prompt (str): User prompt or question.
             model (Optional[str]): Model to use (defaults to self.default_model).
-            **kwargs: Additional request parameters.
+            **kwargs: Additional request parameters. ``cache=False`` skips the
+                response cache; ``cache_ttl`` overrides its TTL in seconds;
+                ``priority`` picks the rate-limiter lane ("interactive",
+                "standard" or "batch"); ``operation`` labels the call
+                for token usage accounting.
 
         Returns:
             str: AI generated response.
@@ -40,13 +61,392 @@ class PerplexityClient:
         Raises:
             Exception: For failure or after max retries.
         """
-        model = model or self.default_model
-        headers = {
+        use_cache = kwargs.pop("cache", True)
+        cache_ttl = kwargs.pop("cache_ttl", None)
+        priority = kwargs.pop("priority", "standard")
+        operation = kwargs.pop("operation", None)
+        headers = self._build_headers()
+        payload = self._build_payload(prompt, model, stream=False, **kwargs)
+        estimated_tokens = estimate_prompt_tokens(payload["messages"])
+
+        request_key = make_cache_key(payload)
+        if use_cache:
+            cached = await llm_cache.get(request_key)
+            if cached is not None:
+                logger.info("Perplexity response served from cache")
+                llm_usage.record_request(payload["model"], operation, estimated_tokens, cache_hit=True)
+                return cached
+
+        async def fetch() -> str:
+            # Shared by every coalesced caller, so no single caller's deadline bounds it
+            with deadline.no_deadline():
+                content = await self._request_completion(headers, payload, priority, operation)
+            if use_cache:
+                await llm_cache.set(request_key, content, ttl=cache_ttl)
+            return content
+
+        # Identical in-flight prompts share one upstream call, if they also agree
+        # on caching and lane; a waiter whose own deadline expires stops waiting
+        # without aborting the shared call
+        flight_key = f"{request_key}:{use_cache}:{cache_ttl}:{priority}"
+        task, coalesced = llm_single_flight.join(flight_key, fetch)
+        llm_usage.record_request(payload["model"], operation, estimated_tokens, coalesced=coalesced)
+        return await deadline.within_deadline(llm_single_flight.wait(task))
+
+    async def invalidate_cache(self, prompt: str, model: Optional[str] = None, **kwargs):
+        """
+        Drop the cached response for a prompt, e.g. when it failed to parse.
+
+        Args:
+            prompt (str): Prompt exactly as passed to chat().
+            model (Optional[str]): Model passed to chat().
+            **kwargs: Request parameters passed to chat().
+        """
+        kwargs.pop("cache", None)
+        kwargs.pop("cache_ttl", None)
+        kwargs.pop("priority", None)
+        kwargs.pop("operation", None)
+        payload = self._build_payload(prompt, model, stream=False, **kwargs)
+        await llm_cache.invalidate(make_cache_key(payload))
+
+    async def chat_many(
+        self,
+        prompts: List[str],
+        model: Optional[str] = None,
+        concurrency: int = 4,
+        return_exceptions: bool = False,
+        **kwargs
+    ) -> List[Union[str, Exception]]:
+        """
+        Run many chat requests with bounded concurrency.
+
+        Every prompt goes through chat(), so caching, coalescing, rate limiting
+        and retries apply per item exactly as for a single call.
+
+        Args:
+            prompts (List[str]): Prompts to send.
+            model (Optional[str]): Model to use for every prompt.
+            concurrency (int): Maximum number of prompts in flight at once.
+            return_exceptions (bool): Put failures in the result list instead
+                of raising the first one and cancelling the rest.
+            **kwargs: Request parameters passed to chat() for every prompt.
+
+        Returns:
+            List[Union[str, Exception]]: Responses in the same order as prompts.
+
+        Raises:
+            Exception: The first failure, unless return_exceptions is set.
+        """
+        results: List[Union[str, Exception]] = [None] * len(prompts)
+        async for index, result in self.chat_many_as_completed(
+            prompts, model, concurrency=concurrency, return_exceptions=return_exceptions, **kwargs
+        ):
+            results[index] = result
+        return results
+
+    async def chat_many_as_completed(
+        self,
+        prompts: List[str],
+        model: Optional[str] = None,
+        concurrency: int = 4,
+        return_exceptions: bool = False,
+        **kwargs
+    ) -> AsyncIterator[Tuple[int, Union[str, Exception]]]:
+        """
+        Like chat_many(), but yield each result as soon as it is ready.
+
+        Only ``concurrency`` prompts are started at a time; the next one starts
+        when a slot frees up. Leaving the loop early cancels the remaining work.
+
+        Yields:
+            Tuple[int, Union[str, Exception]]: Prompt index and its response
+            (or exception, with return_exceptions).
+        """
+        if not prompts:
+            return
+        pending = iter(enumerate(prompts))
+        results: asyncio.Queue = asyncio.Queue()
+
+        async def worker():
+            for index, prompt in pending:
+                try:
+                    result = await self.chat(prompt, model, **kwargs)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as err:
+                    result = err
+                await results.put((index, result))
+
+        workers = [asyncio.ensure_future(worker()) for _ in range(max(1, min(concurrency, len(prompts))))]
+        try:
+            for _ in range(len(prompts)):
+                index, result = await results.get()
+                if isinstance(result, Exception) and not return_exceptions:
+                    raise result
+                yield index, result
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    async def _request_completion(self, headers: Dict[str, str], payload: Dict[str, Any], priority: str = "standard", operation: Optional[str] = None) -> str:
+        """Send a non-streaming completion request with retries."""
+        for attempt in range(self.max_retries):
+            backoff = 0.0
+            # Fail fast when the upstream is degraded or the budget can't cover an attempt
+            probe = llm_circuit_breaker.check()
+            try:
+                deadline.check(self.min_attempt_seconds)
+                async with llm_rate_limiter.slot(priority):
+                    started_at = time.monotonic()
+                    status, response_headers, text = await self._send(
+                        headers, payload, deadline.cap_timeout(self.default_timeout)
+                    )
+
+                retry_after = parse_retry_after(response_headers.get("Retry-After"))
+                llm_rate_limiter.record_response(status, retry_after)
+                if status == 200:
+                    data = json.loads(text)
+                    if not data.get("choices"):
+                        raise Exception("No choices returned from API.")
+                    content = data["choices"][0]["message"]
+                    if isinstance(content, dict) and "content" in content:
+                        content = content["content"]
+                    if not content:
+                        raise Exception("Empty response content.")
+                    llm_circuit_breaker.record_success(time.monotonic() - started_at)
+                    llm_usage.record_usage(
+                        payload["model"], operation, data.get("usage"),
+                        estimate_prompt_tokens(payload["messages"]), content
+                    )
+                    if self.mode == "record":
+                        llm_replay.record(payload, data)
+                    logger.info(f"Perplexity API successful call (attempt {attempt + 1})")
+                    return content.strip()
+                elif status == 429:
+                    # With Retry-After the limiter pauses every lane; otherwise back off locally
+                    backoff = 0.0 if retry_after else self.retry_delay * (2 ** attempt)
+                    logger.warning(
+                        f"Rate limited; retrying after {retry_after or backoff}s (attempt {attempt + 1})"
+                    )
+                elif status == 401:
+                    raise Exception("Unauthorized: Invalid API key.")
+                elif status == 400:
+                    try:
+                        err_data = json.loads(text)
+                        err_msg = err_data.get("error", {}).get("message", "Bad request.")
+                    except Exception:
+                        err_msg = "Bad request."
+                    raise Exception(f"Bad request: {err_msg}")
+                else:
+                    err_msg = f"Error {status}: {text}"
+                    llm_circuit_breaker.record_failure()
+                    if attempt == self.max_retries - 1:
+                        raise Exception(err_msg)
+                    logger.warning(f"{err_msg}; retrying (attempt {attempt + 1})")
+                if backoff:
+                    await self._sleep_within_deadline(backoff)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+                # A timeout we imposed to honour the deadline says nothing about upstream health
+                deadline.check()
+                llm_circuit_breaker.record_failure()
+                if attempt == self.max_retries - 1:
+                    raise Exception(f"Request error: {err}")
+                logger.warning(f"Request error: {err}; retrying (attempt {attempt + 1})")
+                await self._sleep_within_deadline(self.retry_delay)
+            except json.JSONDecodeError as err:
+                llm_circuit_breaker.record_failure()
+                if attempt == self.max_retries - 1:
+                    raise Exception(f"Invalid JSON response: {err}")
+                logger.warning(f"JSON decode error: {err}; retrying (attempt {attempt + 1})")
+                await self._sleep_within_deadline(self.retry_delay)
+            finally:
+                # 4xx/429 answers, empty responses and cancellation record no outcome: hand the probe back
+                llm_circuit_breaker.release_probe(probe)
+        raise Exception("All attempts failed.")
+
+    async def _send(self, headers: Dict[str, str], payload: Dict[str, Any], timeout: float) -> Tuple[int, Dict[str, str], str]:
+        """Perform one upstream call, or its recorded replay, returning (status, headers, body)."""
+        if self.mode == "replay":
+            return await llm_replay.complete(payload, timeout)
+        session = await http_pool.get_session()
+        async with session.post(
+            f"{self.base_url}/chat/completions",
+            headers=headers,
+            json=payload,
+            timeout=aiohttp.ClientTimeout(total=timeout),
+        ) as response:
+            text = await response.text()
+            return response.status, response.headers, text
+
+    async def _sleep_within_deadline(self, delay: float):
+        """Sleep before a retry, or give up now if the budget can't cover it."""
+        left = deadline.remaining()
+        if left is not None and left - delay < self.min_attempt_seconds:
+            raise deadline.DeadlineExceeded(f"Not enough time left to retry ({left:.2f}s)")
+        await asyncio.sleep(delay)
+
+    async def chat_stream(self, prompt: str, model: Optional[str] = None, **kwargs) -> AsyncIterator[str]:
+        """
+        Stream a chat completion from Perplexity API token by token.
+
+        Upstream server-sent events are parsed incrementally and each content
+        delta is yielded as soon as it arrives. Retries only happen before
+        the first token is yielded.
+
+        Args:
+            prompt (str): User prompt or question.
+            model (Optional[str]): Model to use (defaults to self.default_model).
+            **kwargs: Additional request parameters (same as chat()).
+
+        Yields:
+            str: Content deltas in generation order.
+
+        Raises:
+            Exception: For failure or after max retries.
+        """
+        priority = kwargs.pop("priority", "interactive")
+        operation = kwargs.pop("operation", None)
+        headers = self._build_headers()
+        headers["Accept"] = "text/event-stream"
+        payload = self._build_payload(prompt, model, stream=True, **kwargs)
+        estimated_tokens = estimate_prompt_tokens(payload["messages"])
+        llm_usage.record_request(payload["model"], operation, estimated_tokens)
+
+        for attempt in range(self.max_retries):
+            started = False
+            backoff = 0.0
+            probe = llm_circuit_breaker.check()
+            try:
+                deadline.check(self.min_attempt_seconds)
+                async with llm_rate_limiter.slot(priority):
+                    started_at = time.monotonic()
+                    async with self._open_stream(headers, payload) as (status, response_headers, chunks, read_text):
+
+                        retry_after = parse_retry_after(response_headers.get("Retry-After"))
+                        llm_rate_limiter.record_response(status, retry_after)
+                        if status == 200:
+                            received = []
+                            usage = {}
+                            async for delta in self._iter_sse_deltas(chunks, usage):
+                                if not started:
+                                    # Time-to-first-token is what the breaker judges for streams
+                                    llm_circuit_breaker.record_success(time.monotonic() - started_at)
+                                started = True
+                                received.append(delta)
+                                yield delta
+                            if not started:
+                                raise Exception("Empty response content.")
+                            llm_usage.record_usage(
+                                payload["model"], operation, usage, estimated_tokens, "".join(received)
+                            )
+                            if self.mode == "record":
+                                llm_replay.record(payload, {
+                                    "model": payload["model"],
+                                    "choices": [{"index": 0, "message": {"role": "assistant", "content": "".join(received)}}]
+                                })
+                            logger.info(f"Perplexity API successful stream (attempt {attempt + 1})")
+                            return
+
+                        text = await read_text()
+                        if status == 429:
+                            backoff = 0.0 if retry_after else self.retry_delay * (2 ** attempt)
+                            logger.warning(
+                                f"Rate limited; retrying stream after {retry_after or backoff}s (attempt {attempt + 1})"
+                            )
+                        elif status == 401:
+                            raise Exception("Unauthorized: Invalid API key.")
+                        elif status == 400:
+                            raise Exception(f"Bad request: {text}")
+                        else:
+                            err_msg = f"Error {status}: {text}"
+                            llm_circuit_breaker.record_failure()
+                            if attempt == self.max_retries - 1:
+                                raise Exception(err_msg)
+                            logger.warning(f"{err_msg}; retrying stream (attempt {attempt + 1})")
+                if backoff:
+                    await self._sleep_within_deadline(backoff)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+                deadline.check()
+                llm_circuit_breaker.record_failure()
+                if started or attempt == self.max_retries - 1:
+                    raise Exception(f"Stream error: {err}")
+                logger.warning(f"Stream error: {err}; retrying (attempt {attempt + 1})")
+                await self._sleep_within_deadline(self.retry_delay)
+            finally:
+                llm_circuit_breaker.release_probe(probe)
+        raise Exception("All attempts failed.")
+
+    @asynccontextmanager
+    async def _open_stream(self, headers: Dict[str, str], payload: Dict[str, Any]):
+        """
+        Open a streaming upstream call, or its recorded replay.
+
+        Yields:
+            Tuple of (status, headers, SSE byte-chunk iterator, coroutine function returning the body text).
+        """
+        # Only the request deadline bounds the total: a long answer may legitimately stream for a while
+        left = deadline.remaining()
+        total = max(left, 0.0) if left is not None else None
+
+        if self.mode == "replay":
+            status, response_headers, chunks, text = await llm_replay.stream(
+                payload, min(total, self.default_timeout) if total is not None else self.default_timeout
+            )
+
+            async def read_text() -> str:
+                return text
+
+            yield status, response_headers, chunks, read_text
+            return
+
+        session = await http_pool.get_session()
+        timeout = aiohttp.ClientTimeout(total=total, sock_read=self.default_timeout)
+        async with session.post(
+            f"{self.base_url}/chat/completions",
+            headers=headers,
+            json=payload,
+            timeout=timeout,
+        ) as response:
+            yield response.status, response.headers, response.content.iter_any(), response.text
+
+    async def _iter_sse_deltas(self, chunks: AsyncIterator[bytes], usage: Optional[Dict[str, Any]] = None) -> AsyncIterator[str]:
+        """Parse an OpenAI-style SSE body and yield content deltas, collecting any usage block into ``usage``."""
+        buffer = b""
+        async for chunk in chunks:
+            buffer += chunk
+            while b"\n" in buffer:
+                raw_line, buffer = buffer.split(b"\n", 1)
+                line = raw_line.decode("utf-8", errors="replace").strip()
+                if not line.startswith("data:"):
+                    continue
+                data = line[5:].strip()
+                if data == "[DONE]":
+                    return
+                try:
+                    event = json.loads(data)
+                except json.JSONDecodeError:
+                    logger.warning(f"Skipping malformed stream event: {data[:100]}")
+                    continue
+                if usage is not None and event.get("usage"):
+                    usage.update(event["usage"])
+                choices = event.get("choices") or []
+                if not choices:
+                    continue
+                delta = choices[0].get("delta") or choices[0].get("message") or {}
+                content = delta.get("content")
+                if content:
+                    yield content
+
+    def _build_headers(self) -> Dict[str, str]:
+        return {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
         }
+
+    def _build_payload(self, prompt: str, model: Optional[str], stream: bool, **kwargs) -> Dict[str, Any]:
         payload = {
-            "model": model,
+            "model": model or self.default_model,
             "messages": [
                 {
                     "role": "system",
@@ -61,7 +461,7 @@ class PerplexityClient:
             "max_tokens": kwargs.get("max_tokens", 2000),
             "temperature": kwargs.get("temperature", 0.3),
             "top_p": kwargs.get("top_p", 0.9),
-            "stream": False
+            "stream": stream
         }
 
         if "conversation_history" in kwargs:
@@ -72,58 +472,7 @@ class PerplexityClient:
             if history_msgs:
                 payload["messages"] = [payload["messages"][0]] + history_msgs + [payload["messages"][1]]
 
-        for attempt in range(self.max_retries):
-            try:
-                async with aiohttp.ClientSession() as session:
-                    timeout = aiohttp.ClientTimeout(total=self.default_timeout)
-                    async with session.post(
-                        f"{self.base_url}/chat/completions",
-                        headers=headers,
-                        json=payload,
-                        timeout=timeout,
-                    ) as response:
-
-                        text = await response.text()
-                        if response.status == 200:
-                            data = json.loads(text)
-                            if not data.get("choices"):
-                                raise Exception("No choices returned from API.")
-                            content = data["choices"][0]["message"]
-                            if isinstance(content, dict) and "content" in content:
-                                content = content["content"]
-                            if not content:
-                                raise Exception("Empty response content.")
-                            logger.info(f"Perplexity API successful call (attempt {attempt + 1})")
-                            return content.strip()
-                        elif response.status == 429:
-                            wait = self.retry_delay * (2 ** attempt)
-                            logger.warning(f"Rate limited; retrying after {wait}s (attempt {attempt + 1})")
-                            await asyncio.sleep(wait)
-                        elif response.status == 401:
-                            raise Exception("Unauthorized: Invalid API key.")
-                        elif response.status == 400:
-                            try:
-                                err_data = json.loads(text)
-                                err_msg = err_data.get("error", {}).get("message", "Bad request.")
-                            except Exception:
-                                err_msg = "Bad request."
-                            raise Exception(f"Bad request: {err_msg}")
-                        else:
-                            err_msg = f"Error {response.status}: {text}"
-                            if attempt == self.max_retries - 1:
-                                raise Exception(err_msg)
-                            logger.warning(f"{err_msg}; retrying (attempt {attempt + 1})")
-            except (aiohttp.ClientError, asyncio.TimeoutError) as err:
-                if attempt == self.max_retries - 1:
-                    raise Exception(f"Request error: {err}")
-                logger.warning(f"Request error: {err}; retrying (attempt {attempt + 1})")
-                await asyncio.sleep(self.retry_delay)
-            except json.JSONDecodeError as err:
-                if attempt == self.max_retries - 1:
-                    raise Exception(f"Invalid JSON response: {err}")
-                logger.warning(f"JSON decode error: {err}; retrying (attempt {attempt + 1})")
-                await asyncio.sleep(self.retry_delay)
-        raise Exception("All attempts failed.")
+        return payload
 
     def get_available_models(self) -> List[str]:
         """
@@ -143,6 +492,80 @@ class PerplexityClient:
             "llama-3.1-70b-instruct"
         ]
 
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """
+        Return statistics for the shared HTTP connection pool.
+
+        Returns:
+            Dict[str, Any]: Pool limits and connection counters.
+        """
+        return http_pool.stats()
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """
+        Return statistics for the shared LLM response cache.
+
+        Returns:
+            Dict[str, Any]: Hit/miss counters and tier sizes.
+        """
+        return llm_cache.stats()
+
+    def get_coalescing_stats(self) -> Dict[str, Any]:
+        """
+        Return statistics for single-flight coalescing of identical requests.
+
+        Returns:
+            Dict[str, Any]: Executed vs coalesced call counters.
+        """
+        return llm_single_flight.stats()
+
+    def get_rate_limiter_stats(self) -> Dict[str, Any]:
+        """
+        Return statistics for the adaptive upstream rate limiter.
+
+        Returns:
+            Dict[str, Any]: Current limits plus queue depth and wait time per lane.
+        """
+        return llm_rate_limiter.stats()
+
+    def is_available(self) -> bool:
+        """
+        Whether upstream calls are currently allowed by the circuit breaker.
+
+        Services use this to skip straight to their template fallbacks.
+
+        Returns:
+            bool: False while the circuit is open.
+        """
+        return not llm_circuit_breaker.is_open
+
+    def get_circuit_breaker_stats(self) -> Dict[str, Any]:
+        """
+        Return state and counters of the upstream circuit breaker.
+
+        Returns:
+            Dict[str, Any]: Breaker state, window error/slow rates and counters.
+        """
+        return llm_circuit_breaker.stats()
+
+    def get_usage_stats(self) -> Dict[str, Any]:
+        """
+        Return token usage aggregated per endpoint, per operation and per model.
+
+        Returns:
+            Dict[str, Any]: Estimated and reported prompt/completion token counters.
+        """
+        return llm_usage.stats()
+
+    def get_replay_stats(self) -> Dict[str, Any]:
+        """
+        Return statistics for the record/replay engine.
+
+        Returns:
+            Dict[str, Any]: Simulation settings plus fixture hit and injected fault counters.
+        """
+        return llm_replay.stats()
+
     def _get_timestamp(self) -> str:
         return datetime.utcnow().isoformat() + "Z"
 
@@ -155,7 +578,7 @@ class PerplexityClient:
         """
         try:
             # Simple test query
-            test_response = await self.chat("Hello", max_tokens=10)
+            test_response = await self.chat("Hello", max_tokens=10, cache=False, operation="health_check")
             
             return {
                 "status": "healthy",
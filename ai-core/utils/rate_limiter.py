@@ -0,0 +1,238 @@
+import asyncio
+import heapq
+import itertools
+import os
+import time
+import logging
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Dict, Any, Optional, AsyncIterator
+from utils import deadline
+
+logger = logging.getLogger(__name__)
+
+# Lower value = served first
+PRIORITY_LANES = {
+    "interactive": 0,  # /tutor-ask
+    "standard": 1,     # /analyze-resume
+    "batch": 2         # /generate-quiz, /generate-learning-path
+}
+
+
+class AdaptiveRateLimiter:
+    """
+    Client-side limiter for upstream LLM calls.
+
+    Combines a token bucket (requests per second) with a concurrency cap and
+    serves queued callers strictly by priority lane. Both limits back off
+    multiplicatively on 429 responses and recover additively on success;
+    a Retry-After header pauses all dispatching until it has elapsed.
+    """
+
+    def __init__(self):
+        self._configured = False
+        self._waiters = []
+        self._seq = itertools.count()
+        self._active = 0
+        self._tokens = 0.0
+        self._last_refill = time.monotonic()
+        self._paused_until = 0.0
+        self._last_backoff = 0.0
+        self._wakeup: Optional[asyncio.TimerHandle] = None
+        self._recent_statuses = deque(maxlen=100)
+        self._lanes = {
+            lane: {"queued": 0, "acquired": 0, "total_wait": 0.0, "max_wait": 0.0}
+            for lane in PRIORITY_LANES
+        }
+        self._counters = {"rate_limited": 0, "retry_after_pauses": 0, "backoffs": 0}
+
+    def _ensure_configured(self):
+        # Configured on first use so values from .env (loaded after import) apply
+        if self._configured:
+            return
+        self.max_rate = float(os.getenv("LLM_RATE_LIMIT_RPS", 5))
+        self.burst = float(os.getenv("LLM_RATE_LIMIT_BURST", 10))
+        self.max_concurrency = int(os.getenv("LLM_MAX_CONCURRENCY", 8))
+        self.min_rate = max(self.max_rate * 0.05, 0.1)
+        self.rate = self.max_rate
+        self.concurrency_limit = self.max_concurrency
+        self._tokens = self.burst
+        self._configured = True
+
+    @asynccontextmanager
+    async def slot(self, lane: str = "standard") -> AsyncIterator[None]:
+        """
+        Hold one upstream slot for the duration of the block.
+
+        Queueing gives up with DeadlineExceeded once the request budget is spent.
+        """
+        # The deadline is enforced inside acquire(): a wait_for around it could
+        # time out just after the slot was granted and leak it
+        deadline.check()
+        try:
+            await self.acquire(lane, timeout=deadline.remaining())
+        except asyncio.TimeoutError:
+            raise deadline.DeadlineExceeded("Request deadline exceeded while queued for an upstream slot")
+        try:
+            yield
+        finally:
+            self.release()
+
+    async def acquire(self, lane: str = "standard", timeout: Optional[float] = None):
+        """
+        Wait for an upstream slot; pair every successful call with release().
+
+        Raises asyncio.TimeoutError, holding no slot, if none was granted
+        within ``timeout`` seconds.
+        """
+        self._ensure_configured()
+        if lane not in PRIORITY_LANES:
+            lane = "standard"
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        enqueued_at = time.monotonic()
+        heapq.heappush(self._waiters, (PRIORITY_LANES[lane], next(self._seq), future, lane))
+        self._lanes[lane]["queued"] += 1
+        self._dispatch()
+
+        try:
+            if timeout is None:
+                await future
+            else:
+                await asyncio.wait((future,), timeout=max(timeout, 0.0))
+        except asyncio.CancelledError:
+            self._abandon(future, lane)
+            raise
+        if not future.done():
+            self._abandon(future, lane)
+            raise asyncio.TimeoutError(f"No upstream slot within {timeout:.2f}s")
+
+        waited = time.monotonic() - enqueued_at
+        stats = self._lanes[lane]
+        stats["acquired"] += 1
+        stats["total_wait"] += waited
+        stats["max_wait"] = max(stats["max_wait"], waited)
+
+    def _abandon(self, future: asyncio.Future, lane: str):
+        if future.done() and not future.cancelled():
+            # Granted just before the caller gave up: hand the slot back
+            self.release()
+        else:
+            future.cancel()
+            self._lanes[lane]["queued"] -= 1
+            self._dispatch()
+
+    def release(self):
+        self._active = max(self._active - 1, 0)
+        self._dispatch()
+
+    def record_response(self, status: int, retry_after: Optional[float] = None):
+        """
+        Feed an upstream outcome back into the limiter.
+
+        Args:
+            status (int): HTTP status of the upstream response.
+            retry_after (Optional[float]): Parsed Retry-After header in seconds.
+        """
+        self._ensure_configured()
+        self._recent_statuses.append(status)
+        now = time.monotonic()
+
+        if status == 429:
+            self._counters["rate_limited"] += 1
+            if retry_after:
+                self._paused_until = max(self._paused_until, now + retry_after)
+                self._counters["retry_after_pauses"] += 1
+            # Back off at most once per second so a burst of 429s doesn't collapse the limits
+            if now - self._last_backoff >= 1.0:
+                self._last_backoff = now
+                self._counters["backoffs"] += 1
+                self.rate = max(self.rate * 0.5, self.min_rate)
+                self.concurrency_limit = max(int(self.concurrency_limit * 0.5), 1)
+                logger.warning(
+                    f"Upstream rate limited; limiter backing off to {self.rate:.2f} req/s, "
+                    f"{self.concurrency_limit} concurrent"
+                )
+        elif status < 500:
+            # Additive increase towards the configured ceiling
+            self.rate = min(self.rate + self.max_rate * 0.05, self.max_rate)
+            if self.concurrency_limit < self.max_concurrency and len(self._recent_statuses) % 10 == 0:
+                self.concurrency_limit += 1
+        self._dispatch()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self._tokens + (now - self._last_refill) * self.rate, self.burst)
+        self._last_refill = now
+
+    def _dispatch(self):
+        if not self._configured:
+            return
+        self._refill()
+        now = time.monotonic()
+
+        while self._waiters:
+            _, _, future, lane = self._waiters[0]
+            if future.done():
+                heapq.heappop(self._waiters)
+                continue
+            if now < self._paused_until:
+                self._schedule_wakeup(self._paused_until - now)
+                return
+            if self._active >= self.concurrency_limit:
+                # release() will dispatch again
+                return
+            if self._tokens < 1:
+                self._schedule_wakeup((1 - self._tokens) / self.rate)
+                return
+
+            heapq.heappop(self._waiters)
+            self._tokens -= 1
+            self._active += 1
+            self._lanes[lane]["queued"] -= 1
+            future.set_result(None)
+
+    def _schedule_wakeup(self, delay: float):
+        if self._wakeup is not None and not self._wakeup.cancelled():
+            self._wakeup.cancel()
+        loop = asyncio.get_running_loop()
+        self._wakeup = loop.call_later(max(delay, 0.001), self._dispatch)
+
+    def stats(self) -> Dict[str, Any]:
+        self._ensure_configured()
+        recent = list(self._recent_statuses)
+        lanes = {}
+        for lane, stats in self._lanes.items():
+            lanes[lane] = {
+                "queue_depth": stats["queued"],
+                "acquired": stats["acquired"],
+                "avg_wait_ms": round(stats["total_wait"] / stats["acquired"] * 1000, 2) if stats["acquired"] else 0.0,
+                "max_wait_ms": round(stats["max_wait"] * 1000, 2)
+            }
+        return {
+            "active": self._active,
+            "concurrency_limit": self.concurrency_limit,
+            "max_concurrency": self.max_concurrency,
+            "rate_per_second": round(self.rate, 3),
+            "max_rate_per_second": self.max_rate,
+            "tokens_available": round(self._tokens, 2),
+            "paused_for_seconds": round(max(self._paused_until - time.monotonic(), 0.0), 2),
+            "recent_429_rate": round(recent.count(429) / len(recent), 4) if recent else 0.0,
+            "lanes": lanes,
+            **self._counters
+        }
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given in seconds; HTTP-date values are ignored."""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        return None
+
+
+# Shared instance for upstream LLM calls
+llm_rate_limiter = AdaptiveRateLimiter()
@@ -0,0 +1,104 @@
+import re
+from collections import Counter
+from typing import Dict, Any, List, Optional, Set, Tuple
+
+from utils.usage_tracker import estimate_tokens
+
+# Headers and footers sit within the first and last few lines of a page
+EDGE_LINES = 3
+
+# Earlier pages that must have had the same line at the same place before it is dropped
+MIN_EARLIER_PAGES = 2
+
+# Lines that are only a page number ("Page 2 of 3", "2", "- 2 -", "2 / 3")
+_PAGE_NUMBER = re.compile(r"page\s+\d+(?:\s+of\s+\d+)?|\d{1,3}|-\s*\d+\s*-|\d+\s*/\s*\d+", re.IGNORECASE)
+
+_DIGITS = re.compile(r"\d+")
+
+
+def _edge_slots(line: str, edge: str, index: int) -> Optional[Tuple]:
+    """
+    Where a line counts as seen: page numbers anywhere in the edge with any
+    digits, other lines exactly as written (up to whitespace) at that index.
+    """
+    text = " ".join(line.split())
+    if not any(char.isalnum() for char in text):
+        # Blank lines and lone bullets are never headers
+        return None
+    if _PAGE_NUMBER.fullmatch(text):
+        return (edge, _DIGITS.sub("#", text.casefold()))
+    return (edge, index, text)
+
+
+class RepeatedLineFilter:
+    """
+    Drops running headers, footers and page numbers from cleaned page text.
+
+    Pages are fed in order. Only the first and last EDGE_LINES lines of a
+    page are candidates. A line that is just a page number ("Page 2 of 3",
+    "- 2 -") is dropped once an earlier page had a page number in the same
+    edge. Any other line is dropped only if the same text (up to
+    whitespace) was at the same position from the top or bottom of at least
+    MIN_EARLIER_PAGES earlier pages, so dates, years of experience and other
+    lines that merely look alike are kept. The first occurrences are kept,
+    so the candidate's name and contact line still appear in the text. Seen
+    lines are counted in a hash map, so a document is filtered in linear
+    time and pages can be filtered as they stream in.
+    """
+
+    def __init__(self, edge_lines: int = EDGE_LINES, min_earlier_pages: int = MIN_EARLIER_PAGES):
+        self.edge_lines = edge_lines
+        self.min_earlier_pages = min_earlier_pages
+        # Earlier pages each edge slot was seen on
+        self._seen: Counter = Counter()
+        self.pages = 0
+        self.lines_removed = 0
+        self.bytes_saved = 0
+        self.tokens_saved = 0
+
+    def _is_repeated(self, slot: Tuple) -> bool:
+        # Page number slots have no index
+        required = 1 if len(slot) == 2 else self.min_earlier_pages
+        return self._seen[slot] >= required
+
+    def strip(self, page_text: str) -> str:
+        """Filter the next page."""
+        self.pages += 1
+        if not page_text:
+            return page_text
+        lines = page_text.split("\n")
+        line_count = len(lines)
+        kept: List[str] = []
+        removed: List[str] = []
+        page_slots: Set[Tuple] = set()
+
+        for i, line in enumerate(lines):
+            slots = []
+            if i < self.edge_lines:
+                slots.append(_edge_slots(line, "header", i))
+            if i >= line_count - self.edge_lines:
+                slots.append(_edge_slots(line, "footer", line_count - 1 - i))
+            slots = [slot for slot in slots if slot is not None]
+            page_slots.update(slots)
+            if any(self._is_repeated(slot) for slot in slots):
+                removed.append(line)
+            else:
+                kept.append(line)
+
+        self._seen.update(page_slots)
+        if not removed:
+            return page_text
+        self.lines_removed += len(removed)
+        for line in removed:
+            # Plus the newline that joined it to the page
+            self.bytes_saved += len(line.encode("utf-8")) + 1
+            self.tokens_saved += estimate_tokens(line)
+        return "\n".join(kept)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pages": self.pages,
+            "lines_removed": self.lines_removed,
+            "bytes_saved": self.bytes_saved,
+            "tokens_saved": self.tokens_saved
+        }
@@ -0,0 +1,110 @@
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from utils.text_normalizer import lower_same_length
+
+# Sections that are indexed
+SECTIONS = ("experience", "education", "skills", "projects", "certifications")
+
+_SECTION_HEADINGS = {
+    "experience": (
+        "experience", "work experience", "professional experience", "employment",
+        "employment history", "work history", "career history", "relevant experience"
+    ),
+    "education": (
+        "education", "academic background", "academics", "education and training",
+        "academic qualifications", "educational qualifications"
+    ),
+    "skills": (
+        "skills", "technical skills", "key skills", "core skills", "core competencies",
+        "technologies", "skills and tools", "tools and technologies", "tech stack"
+    ),
+    "projects": ("projects", "personal projects", "key projects", "academic projects", "side projects"),
+    "certifications": (
+        "certifications", "certificates", "licenses and certifications",
+        "certifications and licenses", "certifications and awards"
+    )
+}
+
+# Headings that end the section before them but aren't indexed
+_OTHER_HEADINGS = (
+    "summary", "professional summary", "profile", "objective", "career objective", "about me",
+    "contact", "contact information", "awards", "honors and awards", "achievements",
+    "publications", "interests", "hobbies", "languages", "references", "volunteering",
+    "volunteer experience", "activities", "extracurricular activities", "leadership"
+)
+
+_OTHER = ""
+
+# Headings by their letters alone, so "WORK EXPERIENCE:" and "E X P E R I E N C E" match
+_HEADING_KEYS: Dict[str, str] = {
+    **{heading.replace(" ", ""): _OTHER for heading in _OTHER_HEADINGS},
+    **{heading.replace(" ", ""): section for section, headings in _SECTION_HEADINGS.items() for heading in headings}
+}
+
+# A heading is a short line of its own
+_HEADING_MAX_CHARS = 40
+
+_NOT_LETTERS = re.compile(r"[\W\d_]+")
+
+
+def _heading(line: str) -> Optional[str]:
+    """Section a line opens, _OTHER for a heading that isn't indexed, None for any other line."""
+    if len(line) > _HEADING_MAX_CHARS:
+        return None
+    return _HEADING_KEYS.get(_NOT_LETTERS.sub("", line.replace("&", "and")).casefold())
+
+
+class ResumeDocument:
+    """
+    Resume text prepared once per analysis and shared by every extractor.
+
+    Holds the text, its lower-cased copy (same length, so offsets apply to
+    both), and the spans of the Experience, Education, Skills, Projects and
+    Certifications sections. A section runs
+    from the line after its heading to the next heading of any kind, and
+    may appear more than once. Extractors read only the sections they need
+    through scope(), which falls back to the whole text for resumes
+    without those headings.
+
+    For text that arrives page by page, pass the previous page's
+    ``last_section`` as ``start_section`` so a section continues across the
+    page break.
+    """
+
+    def __init__(self, text: str, start_section: Optional[str] = None):
+        self.text = text
+        self.lower = lower_same_length(text)
+        line_starts = [0] + [match.end() for match in re.finditer("\n", text)]
+        self.sections: Dict[str, List[Tuple[int, int]]] = {}
+
+        section, start = start_section, 0
+        for i, line_start in enumerate(line_starts):
+            line_end = line_starts[i + 1] - 1 if i + 1 < len(line_starts) else len(text)
+            heading = _heading(text[line_start:line_end])
+            if heading is None:
+                continue
+            self._add_span(section, start, line_start)
+            section, start = heading or None, min(line_end + 1, len(text))
+        self._add_span(section, start, len(text))
+        self.last_section = section
+
+    def _add_span(self, section: Optional[str], start: int, end: int):
+        if section and self.text[start:end].strip():
+            self.sections.setdefault(section, []).append((start, end))
+
+    def has_section(self, names: Iterable[str]) -> bool:
+        return any(name in self.sections for name in names)
+
+    def section_text(self, names: Iterable[str], lower: bool = False) -> str:
+        """Text of the named sections in document order, "" if there are none."""
+        source = self.lower if lower else self.text
+        spans = sorted(span for name in set(names) for span in self.sections.get(name, ()))
+        return "\n".join(source[start:end] for start, end in spans)
+
+    def scope(self, names: Iterable[str], lower: bool = False) -> str:
+        """Text of the named sections, or the whole text if the resume has none of them."""
+        names = tuple(names)
+        if self.has_section(names):
+            return self.section_text(names, lower)
+        return self.lower if lower else self.text
@@ -0,0 +1,129 @@
+import re
+from typing import List, Optional, Set
+
+# Every pattern here is compiled once and runs in time linear in the text:
+# repetitions are bounded or can't split the same characters two ways, a
+# digit or word run is only tried from its start so a failed match never
+# restarts inside it, and captures that scan forward are capped in length.
+# The extractors make a fixed number of passes (one per pattern) per text.
+
+# A whole number, never a tail of a longer one
+_NUMBER = r"(?<!\d)(\d+)"
+
+# Searched in lower-cased text; the first match of each counts
+_EXPERIENCE_YEARS = [
+    re.compile(pattern) for pattern in (
+        rf"{_NUMBER}\+?\s*years?\s*(?:of\s*)?(?:professional\s*)?experience",
+        rf"experience:?\s*{_NUMBER}\+?\s*years?",
+        rf"{_NUMBER}\+?\s*years?\s*in\s*(?:the\s*)?(?:field|industry|role)",
+        rf"{_NUMBER}\+?\s*years?\s*(?:working|developing|programming)",
+        rf"over\s*{_NUMBER}\s*years?",
+        rf"more\s*than\s*{_NUMBER}\s*years?"
+    )
+]
+
+EXPERIENCE_PATTERN_COUNT = len(_EXPERIENCE_YEARS)
+
+# One capitalized word of a name; connectives that open a title-case phrase don't count
+_NAME_WORD = r"(?!(?:At|As|And|For|From|In|With)\b)[A-Z][\w&.'-]*"
+
+# Starts at the first character of a word
+_WORD_START = r"(?<![\w&.'-])"
+
+# Up to four capitalized words before a company suffix ("Acme Cloud Systems", "Acme, Inc.");
+# a suffix followed by another capitalized word is part of a title ("Senior Software Engineer")
+_COMPANY = re.compile(
+    _WORD_START
+    + rf"({_NAME_WORD}(?:[ \t]+{_NAME_WORD}){{0,3}},?[ \t]+"
+    r"(?:Technologies|Tech|Systems|Solutions|Services|Software|Corporation|Corp|Inc|LLC|Ltd|Co)\b\.?)"
+    r"(?![ \t]+[A-Z])"
+)
+
+_ROLE_KEYWORDS = (
+    "developer", "engineer", "analyst", "manager", "lead", "senior",
+    "junior", "architect", "consultant", "specialist", "coordinator",
+    "administrator", "designer", "programmer", "scientist"
+)
+
+_ROLE_STOPWORDS = (
+    "a", "an", "and", "as", "at", "by", "for", "from", "i", "in", "is",
+    "my", "of", "on", "or", "our", "the", "to", "was", "we", "with"
+)
+
+# Up to three words on the same line before a role keyword ("senior software engineer"), lower-cased text
+_ROLE = re.compile(
+    r"(?<![\w+#.-])((?:(?!(?:" + "|".join(_ROLE_STOPWORDS) + r")[ \t])[a-z][a-z0-9+#.-]*[ \t]+){0,3}"
+    r"(?:" + "|".join(_ROLE_KEYWORDS) + r")s?)(?!\w)"
+)
+
+# Degree keyword; the rest of its phrase is read by a capped lookahead, so
+# degrees named inside it ("bachelor and master of ...") are found too
+_DEGREE = re.compile(
+    r"\b(?:bachelor(?:['’]?s)?|master(?:['’]?s)?|phd|doctorate|mba|b\.?tech|m\.?tech)\b"
+    r"(?=(?:\s+(?:of|in)\s+)?([^\n,.]{0,80}))"
+)
+
+# Up to six words on the same line, lower-cased text
+_CERTIFICATION_WORDS = r"[a-z][a-z0-9+#-]*(?:[ \t]+[a-z][a-z0-9+#-]*){0,5}"
+
+# Zero-width, so overlapping mentions ("aws certified solutions architect") all count
+_CERTIFICATION = re.compile(
+    r"(?=\bcertified[ \t]+(" + _CERTIFICATION_WORDS + r")"
+    r"|\bcertification[ \t]+in[ \t]+(" + _CERTIFICATION_WORDS + r")"
+    r"|\b([a-z]{2,})[ \t]+certified\b"
+    r"|\b(?:aws|google|microsoft)[ \t]+([^\n]{0,60}?)[ \t]*certifi(?:ed|cation))"
+)
+
+_INSTITUTION_KEYWORD = r"(?:University|College|Institute|School|UNIVERSITY|COLLEGE|INSTITUTE|SCHOOL)"
+
+# "Stanford University", "Massachusetts Institute of Technology", "University of Oxford"
+_INSTITUTION = re.compile(
+    _WORD_START
+    + rf"((?:{_NAME_WORD}[ \t]+){{1,4}}{_INSTITUTION_KEYWORD}(?:[ \t]+of(?:[ \t]+{_NAME_WORD}){{1,3}})?"
+    + rf"|{_INSTITUTION_KEYWORD}[ \t]+of(?:[ \t]+{_NAME_WORD}){{1,3}})\b"
+)
+
+
+def experience_years_by_pattern(text_lower: str) -> List[Optional[int]]:
+    """First number of years matched by each experience pattern, if any."""
+    years = []
+    for pattern in _EXPERIENCE_YEARS:
+        match = pattern.search(text_lower)
+        years.append(int(match.group(1)) if match else None)
+    return years
+
+
+def find_companies(text: str) -> Set[str]:
+    """Capitalized names ending in a company suffix."""
+    return {match.strip() for match in _COMPANY.findall(text) if len(match.strip()) > 2}
+
+
+def find_roles(text_lower: str) -> Set[str]:
+    """Job titles in lower-cased text: a role keyword and up to three words before it."""
+    return {match.strip() for match in _ROLE.findall(text_lower) if len(match.strip()) > 5}
+
+
+def find_degrees(text_lower: str) -> Set[str]:
+    """Fields of the degrees mentioned in lower-cased text."""
+    degrees = set()
+    for match in _DEGREE.finditer(text_lower):
+        # Cut where a double space separates columns
+        degree = match.group(1).split("  ")[0].strip()
+        if len(degree) > 2:
+            degrees.add(degree)
+    return degrees
+
+
+def find_certifications(text_lower: str) -> Set[str]:
+    """Certifications mentioned in lower-cased text."""
+    certifications = set()
+    for match in _CERTIFICATION.finditer(text_lower):
+        certification = match.group(match.lastindex).strip()
+        if len(certification) > 2:
+            certifications.add(certification)
+    return certifications
+
+
+def find_institutions(text: str) -> Set[str]:
+    """Names of universities, colleges, institutes and schools."""
+    return {match.strip() for match in _INSTITUTION.findall(text) if len(match.strip()) > 3}
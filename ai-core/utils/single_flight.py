@@ -0,0 +1,86 @@
+import asyncio
+import logging
+from typing import Dict, Any, Awaitable, Callable, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key into one underlying call.
+
+    The first caller for a key starts the work as a task; callers arriving
+    while it is in flight await the same task. Every caller awaits through
+    asyncio.shield, so a cancelled waiter never aborts the shared call.
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self._counters = {
+            "calls": 0,
+            "executions": 0,
+            "coalesced": 0,
+            "cancelled_waiters": 0
+        }
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run fn() once for all concurrent callers with the same key.
+
+        Args:
+            key (str): Identity of the work, e.g. a prompt hash.
+            fn (Callable): Zero-argument coroutine factory doing the work.
+
+        Returns:
+            The result of the shared call (exceptions are re-raised to every waiter).
+        """
+        task, _ = self.join(key, fn)
+        return await self.wait(task)
+
+    def join(self, key: str, fn: Callable[[], Awaitable[T]]) -> Tuple[asyncio.Task, bool]:
+        """
+        Start fn() for a key, or join the call already in flight for it.
+
+        Returns:
+            The shared task, and whether it was already in flight (the caller was coalesced).
+        """
+        self._counters["calls"] += 1
+        task = self._in_flight.get(key)
+        if task is None:
+            self._counters["executions"] += 1
+            task = asyncio.ensure_future(fn())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda t, k=key: self._on_done(k, t))
+        else:
+            self._counters["coalesced"] += 1
+            logger.info(f"Coalesced request onto in-flight call {key[:12]}")
+            return task, True
+        return task, False
+
+    async def wait(self, task: asyncio.Task) -> T:
+        """Await a task from join() without letting a cancelled waiter abort it."""
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if not task.cancelled():
+                self._counters["cancelled_waiters"] += 1
+            raise
+
+    def _on_done(self, key: str, task: asyncio.Task):
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # Mark the exception as retrieved in case every waiter was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "in_flight": len(self._in_flight),
+            **self._counters
+        }
+
+
+# Shared instance for upstream LLM calls
+llm_single_flight = SingleFlight()
@@ -0,0 +1,158 @@
+import re
+from typing import Dict, Iterable, List, Optional, Set
+
+from utils.text_normalizer import lower_same_length
+
+# Alphanumeric names this short ("R", "Go") are ordinary words or initials
+# in any other case, so they only match as written
+_CASE_SENSITIVE_MAX_LEN = 2
+
+# A match can't run into a letter, digit, "+" or "#" ("C" vs "C++");
+# version numbers ("HTML5", "Python3") are allowed
+_RIGHT_BOUNDARY = r"\d*(?![\w+#])"
+
+# A single capital is not a skill in a name initial ("John R. Smith") or an abbreviation ("R&D")
+_NOT_A_SKILL_AFTER_LETTER = re.compile(r"\.\s?[A-Z]|&")
+
+
+def _alias_key(alias: str) -> str:
+    return " ".join(alias.split()).lower()
+
+
+def _is_case_sensitive(alias: str) -> bool:
+    return alias.isalnum() and len(alias) <= _CASE_SENSITIVE_MAX_LEN
+
+
+def _is_word_char(char: str) -> bool:
+    # Same as \w
+    return char.isalnum() or char == "_"
+
+
+def _build_trie(words: Iterable[str]) -> Dict[str, dict]:
+    # An "" entry marks the end of a word
+    trie: Dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+    return trie
+
+
+def _trie_pattern(trie: Dict[str, dict]) -> str:
+    """Regex alternation of the words in a prefix trie, factored the same way."""
+
+    def render(node: Dict[str, dict]) -> str:
+        branches = [
+            (r"\s+" if char == " " else re.escape(char)) + render(child)
+            for char, child in sorted(node.items())
+            if char
+        ]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            # Greedy, so the longest name is tried first
+            return f"(?:{body})?"
+        return body
+
+    return render(trie)
+
+
+def _ends_word(text: str, end: int) -> bool:
+    # _RIGHT_BOUNDARY in plain Python
+    while end < len(text) and text[end].isdigit():
+        end += 1
+    return end == len(text) or not (_is_word_char(text[end]) or text[end] in "+#")
+
+
+def _words_within(text: str, trie: Dict[str, dict]) -> Set[str]:
+    """Every word of ``trie`` found in ``text`` on word boundaries, overlapping ones included."""
+    found = set()
+    for start in range(len(text)):
+        if start and _is_word_char(text[start - 1]):
+            continue
+        node = trie
+        for end in range(start, len(text)):
+            node = node.get(text[end])
+            if node is None:
+                break
+            if "" in node and _ends_word(text, end + 1):
+                found.add(text[start:end + 1])
+    return found
+
+
+class SkillMatcher:
+    """
+    Finds every known skill in a text in one left-to-right pass.
+
+    Canonical names and aliases are compiled once into a single regex whose
+    alternation is factored into a prefix trie, so at each word start the
+    engine follows at most one path per character instead of trying every
+    skill: the cost grows with the length of the text, not the number of
+    skills. Matches must start and end on word boundaries, which keeps
+    "Java" out of "JavaScript" and "Git" out of "GitHub". Names of up to two
+    letters ("R", "Go") must match case as written, everything else ignores
+    case, and runs of whitespace inside names match any whitespace.
+
+    As with an Aho-Corasick automaton, a match also reports the skills whose
+    names it contains on word boundaries ("React Native" gives React too).
+    """
+
+    def __init__(self, skill_categories: Dict[str, List[str]], aliases: Optional[Dict[str, List[str]]] = None):
+        aliases = aliases or {}
+        names: Dict[str, str] = {}
+        for skills in skill_categories.values():
+            for skill in skills:
+                names[skill] = skill
+                for alias in aliases.get(skill, []):
+                    names[alias] = skill
+
+        skills_by_key: Dict[str, Set[str]] = {}
+        # Accepted spellings of case-sensitive names, by key
+        self._case_sensitive: Dict[str, Set[str]] = {}
+        for name, skill in names.items():
+            key = _alias_key(name)
+            skills_by_key.setdefault(key, set()).add(skill)
+            if _is_case_sensitive(name):
+                self._case_sensitive.setdefault(key, set()).update((name, name.upper()))
+
+        # Skills named inside a longer name are reported along with it. Keys are
+        # lower-cased, so they never hold a case-sensitive name as written
+        case_insensitive = _build_trie(_alias_key(name) for name in names if not _is_case_sensitive(name))
+        self._skills_by_key: Dict[str, frozenset] = {
+            key: frozenset(skills.union(*(skills_by_key[word] for word in _words_within(key, case_insensitive))))
+            for key, skills in skills_by_key.items()
+        }
+
+        self._pattern = None
+        if skills_by_key:
+            # \b is cheaper than a lookbehind but needs a word character to its right
+            left = r"\b" if all(_is_word_char(key[0]) for key in skills_by_key) else r"(?<!\w)"
+            # Matched against lower-cased text: no IGNORECASE, which is markedly slower
+            self._pattern = re.compile(left + "(" + _trie_pattern(_build_trie(skills_by_key)) + ")" + _RIGHT_BOUNDARY)
+
+    def _written_as_skill(self, text: str, start: int, end: int, spellings: Set[str]) -> bool:
+        if text[start:end] not in spellings:
+            return False
+        return end - start > 1 or _NOT_A_SKILL_AFTER_LETTER.match(text, end) is None
+
+    def find(self, text: str, text_lower: Optional[str] = None) -> Set[str]:
+        """
+        Canonical names of every skill mentioned in ``text``.
+
+        ``text_lower`` saves lower-casing the text again when the caller has
+        it already; it must come from lower_same_length(text).
+        """
+        found: Set[str] = set()
+        if self._pattern is None or not text:
+            return found
+        skills_by_key = self._skills_by_key
+        case_sensitive = self._case_sensitive
+        for match in self._pattern.finditer(text_lower if text_lower is not None else lower_same_length(text)):
+            key = _alias_key(match.group(1))
+            spellings = case_sensitive.get(key)
+            if spellings is not None and not self._written_as_skill(text, match.start(1), match.end(1), spellings):
+                continue
+            found.update(skills_by_key[key])
+        return found
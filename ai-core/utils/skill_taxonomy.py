@@ -0,0 +1,204 @@
+import os
+import json
+import time
+import threading
+import logging
+from types import MappingProxyType
+from typing import Dict, Any, List, Mapping, Optional, Tuple
+
+from utils.skill_matcher import SkillMatcher
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TAXONOMY_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "skill_taxonomy.json")
+
+# Layout of the taxonomy file this code understands
+SCHEMA_VERSION = 1
+
+
+class SkillTaxonomy:
+    """
+    One version of the skill taxonomy, compiled into read-only lookups.
+
+    Built from the data file (see data/skill_taxonomy.json): skills by
+    category with their aliases, trending skills, and per-role keywords,
+    requirements and salary ranges. The skill matcher is compiled here, so
+    the cost of a large taxonomy is paid once per load, never per request.
+    Instances are never modified; a reload builds a new one.
+    """
+
+    def __init__(self, data: Dict[str, Any], source: Optional[str] = None):
+        if data.get("schema_version") != SCHEMA_VERSION:
+            raise ValueError(f"Unsupported skill taxonomy schema version: {data.get('schema_version')}")
+        self.version = str(data["version"])
+        self.source = source
+
+        self.skill_categories: Mapping[str, Tuple[str, ...]] = MappingProxyType({
+            category: tuple(skills) for category, skills in data["categories"].items()
+        })
+        known_skills = {skill for skills in self.skill_categories.values() for skill in skills}
+        unknown = set(data.get("aliases", {})) - known_skills
+        if unknown:
+            raise ValueError(f"Aliases for skills in no category: {', '.join(sorted(unknown))}")
+        self.aliases: Mapping[str, Tuple[str, ...]] = MappingProxyType({
+            skill: tuple(aliases) for skill, aliases in data.get("aliases", {}).items()
+        })
+        self.trending_skills: Tuple[str, ...] = tuple(data.get("trending_skills", []))
+
+        roles = data.get("roles", {})
+        default_role = data.get("default_role", {})
+        self.job_roles: Mapping[str, Tuple[str, ...]] = MappingProxyType({
+            role: tuple(spec.get("keywords", [])) for role, spec in roles.items()
+        })
+        self._role_requirements: Mapping[str, Tuple[str, ...]] = MappingProxyType({
+            role: tuple(spec["requirements"]) for role, spec in roles.items() if "requirements" in spec
+        })
+        self._salary_ranges: Mapping[str, Mapping[str, Any]] = MappingProxyType({
+            role: MappingProxyType(dict(spec["salary_range"])) for role, spec in roles.items() if "salary_range" in spec
+        })
+        self._default_requirements: Tuple[str, ...] = tuple(default_role.get("requirements", []))
+        self._default_salary_range: Mapping[str, Any] = MappingProxyType(dict(default_role.get("salary_range", {})))
+
+        self.skill_count = len(known_skills)
+        self.alias_count = sum(len(aliases) for aliases in self.aliases.values())
+        self.matcher = SkillMatcher(self.skill_categories, self.aliases)
+
+    @classmethod
+    def from_file(cls, path: str) -> "SkillTaxonomy":
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f), source=path)
+
+    def role_requirements(self, role: str) -> List[str]:
+        return list(self._role_requirements.get(role, self._default_requirements))
+
+    def salary_range(self, role: str) -> Dict[str, Any]:
+        return dict(self._salary_ranges.get(role, self._default_salary_range))
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "version": self.version,
+            "source": self.source,
+            "skills": self.skill_count,
+            "aliases": self.alias_count,
+            "categories": len(self.skill_categories),
+            "roles": len(self.job_roles)
+        }
+
+
+class SkillTaxonomyStore:
+    """
+    Holds the current SkillTaxonomy and swaps in a new one when the file changes.
+
+    The file (SKILL_TAXONOMY_PATH) is checked at most every
+    SKILL_TAXONOMY_RELOAD_SECONDS (0 disables the check). A changed file is
+    compiled on a background thread while requests keep using the version
+    they already have; the new version replaces it in one reference swap.
+    A file that fails to load is logged and the previous version is kept.
+    """
+
+    def __init__(self):
+        self._configured = False
+        self._current: Optional[SkillTaxonomy] = None
+        self._lock = threading.Lock()
+        # Serializes whole reloads, so an older file can't replace a newer one
+        self._reload_lock = threading.Lock()
+        self._reloading = False
+        self._file_signature: Optional[Tuple[float, int]] = None
+        # A file version that failed to load is not retried until it changes again
+        self._failed_signature: Optional[Tuple[float, int]] = None
+        self._last_check = 0.0
+        self._loaded_at: Optional[float] = None
+        self._counters = {
+            "reloads": 0,
+            "reload_errors": 0
+        }
+        self._last_error: Optional[str] = None
+
+    def _ensure_configured(self):
+        # Configured on first use so values from .env (loaded after import) apply
+        if self._configured:
+            return
+        self.path = os.getenv("SKILL_TAXONOMY_PATH", DEFAULT_TAXONOMY_PATH)
+        self.check_interval = float(os.getenv("SKILL_TAXONOMY_RELOAD_SECONDS", 5))
+        self._configured = True
+
+    def _signature(self) -> Tuple[float, int]:
+        stat = os.stat(self.path)
+        return (stat.st_mtime, stat.st_size)
+
+    def current(self) -> SkillTaxonomy:
+        """The taxonomy to use for one request; hold on to it for the whole request."""
+        self._ensure_configured()
+        if self._current is None:
+            return self.reload()
+        if self.check_interval and time.monotonic() - self._last_check >= self.check_interval:
+            self._last_check = time.monotonic()
+            self._reload_in_background_if_changed()
+        return self._current
+
+    def _reload_in_background_if_changed(self):
+        try:
+            signature = self._signature()
+        except OSError as e:
+            logger.warning(f"Cannot check skill taxonomy file {self.path}: {e}")
+            return
+        with self._lock:
+            if signature in (self._file_signature, self._failed_signature) or self._reloading:
+                return
+            self._reloading = True
+        threading.Thread(target=self._reload_quietly, name="skill-taxonomy-reload", daemon=True).start()
+
+    def _reload_quietly(self):
+        try:
+            self.reload()
+        except Exception:
+            pass
+        finally:
+            self._reloading = False
+
+    def reload(self) -> SkillTaxonomy:
+        """
+        Load and compile the taxonomy file now and make it current.
+
+        Raises if the file can't be loaded; the previous version (if any) stays current.
+        """
+        self._ensure_configured()
+        with self._reload_lock:
+            signature = None
+            try:
+                signature = self._signature()
+                taxonomy = SkillTaxonomy.from_file(self.path)
+            except Exception as e:
+                self._failed_signature = signature
+                self._counters["reload_errors"] += 1
+                self._last_error = f"{type(e).__name__}: {e}"
+                logger.error(f"Failed to load skill taxonomy from {self.path}: {e}")
+                raise
+            with self._lock:
+                previous = self._current
+                self._current = taxonomy
+                self._file_signature = signature
+                self._loaded_at = time.time()
+                self._last_error = None
+                if previous is not None:
+                    self._counters["reloads"] += 1
+        logger.info(
+            f"Loaded skill taxonomy {taxonomy.version} ({taxonomy.skill_count} skills, "
+            f"{taxonomy.alias_count} aliases) from {self.path}"
+        )
+        return taxonomy
+
+    def stats(self) -> Dict[str, Any]:
+        self._ensure_configured()
+        return {
+            "path": self.path,
+            "check_interval_seconds": self.check_interval,
+            "loaded": self._current.summary() if self._current is not None else None,
+            "loaded_at": self._loaded_at,
+            "last_error": self._last_error,
+            **self._counters
+        }
+
+
+# Shared taxonomy for skill matching and role suggestions
+skill_taxonomy = SkillTaxonomyStore()
@@ -0,0 +1,164 @@
+import os
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, Optional
+
+# Characters that end a line, including form feeds between PDF pages
+_LINE_BREAKS = "\n\r\f\v\x1c\x1d\x1e\x85\u2028\u2029"
+
+# Unicode mode drops invisible/garbage code points and expands ligatures:
+# C0 controls, soft hyphen, zero-width characters, BOM, private-use glyphs
+# (icon fonts in resume templates) and the Latin ligature block
+_UNICODE_JUNK = "\x00-\x08\x0e-\x1b\x7f\u00ad\u200b-\u200d\u2060\ufeff\ue000-\uf8ff\ufb00-\ufb06"
+
+_LIGATURES = {
+    "\ufb00": "ff", "\ufb01": "fi", "\ufb02": "fl", "\ufb03": "ffi",
+    "\ufb04": "ffl", "\ufb05": "st", "\ufb06": "st"
+}
+
+# Deletes line breaks; the length difference counts them
+_BREAK_COUNTER = str.maketrans("", "", _LINE_BREAKS)
+
+# Expands ligatures and deletes every other junk character
+_JUNK_TABLE = {
+    **{c: None for c in range(0x00, 0x09)},
+    **{c: None for c in range(0x0e, 0x1c)},
+    0x7f: None, 0xad: None, 0x200b: None, 0x200c: None, 0x200d: None, 0x2060: None, 0xfeff: None,
+    **{c: None for c in range(0xe000, 0xf900)},
+    **{ord(k): v for k, v in _LIGATURES.items()}
+}
+
+MODES = ("ascii", "unicode")
+
+DEFAULT_MODE = "ascii"
+
+# The cleaning chain PDFParser used before this module, applied to one run at
+# a time in ascii mode; the soft-wrap step needs the neighbours and is done
+# by the caller
+_ASCII_STEPS = (
+    (re.compile(r"\n\s*\n"), "\n\n"),
+    (re.compile(r" +"), " "),
+    (re.compile(r"[^\x00-\x7F]+"), " "),
+    (re.compile("\f"), "\n")
+)
+
+_NEWLINE_RUN = re.compile(r"\n+")
+
+
+@lru_cache(maxsize=4096)
+def _ascii_run(run: str) -> str:
+    """A run rewritten by the old chain, before soft wraps are joined and newlines collapsed."""
+    for pattern, replacement in _ASCII_STEPS:
+        run = pattern.sub(replacement, run)
+    return run
+
+
+class TextNormalizer:
+    """
+    Single-pass whitespace and character normalizer for extracted text.
+
+    One precompiled pattern finds every run of whitespace and unwanted
+    characters in a single scan, and each run is rewritten in one step:
+
+    - "ascii" mode (the default) gives exactly the output of the regex chain
+      PDFParser used before: blank lines and space runs are compressed,
+      each run of non-ASCII characters becomes a space, and a single
+      newline between two lowercase letters becomes a space
+    - "unicode" mode (opt-in) keeps names, accents and bullets: runs
+      containing line breaks become one newline (or a space for a soft wrap
+      between lowercase letters), other runs collapse to one space, and
+      invisible characters are dropped and ligatures expanded
+    """
+
+    def __init__(self, mode: str = DEFAULT_MODE):
+        if mode not in MODES:
+            raise ValueError(f"Unknown normalization mode: {mode}")
+        self.mode = mode
+        junk = r"\x80-\U0010ffff" if mode == "ascii" else _UNICODE_JUNK
+        # Starts with a character class so the regex engine can skip ordinary
+        # text quickly; a lone plain space is left alone
+        self._pattern = re.compile(rf"[\s{junk}](?:[\s{junk}]+|(?<! ))")
+
+    def _is_lower(self, char: str) -> bool:
+        if self.mode == "ascii":
+            return "a" <= char <= "z"
+        return char.islower()
+
+    def _replace_ascii(self, match: "re.Match") -> str:
+        run = match.group()
+        # Only short runs repeat often enough to be worth caching
+        cleaned = _ascii_run(run) if len(run) <= 32 else _ascii_run.__wrapped__(run)
+        if cleaned == "\n":
+            text = match.string
+            start, end = match.span()
+            if 0 < start and end < len(text) and self._is_lower(text[start - 1]) and self._is_lower(text[end]):
+                return " "
+            return cleaned
+        return _NEWLINE_RUN.sub("\n", cleaned)
+
+    def _replace(self, match: "re.Match") -> str:
+        run = match.group()
+        breaks = len(run) - len(run.translate(_BREAK_COUNTER))
+        if breaks:
+            breaks -= run.count("\r\n")
+            text = match.string
+            start, end = match.span()
+            if (
+                breaks == 1 and 0 < start and end < len(text)
+                and self._is_lower(text[start - 1]) and self._is_lower(text[end])
+            ):
+                return " "
+            return "\n"
+
+        cleaned = run.translate(_JUNK_TABLE)
+        if not cleaned:
+            return ""
+        if cleaned.isspace():
+            return " "
+        # Expanded ligatures mixed with whitespace
+        return (
+            (" " if cleaned[0].isspace() else "")
+            + " ".join(cleaned.split())
+            + (" " if cleaned[-1].isspace() else "")
+        )
+
+    def normalize(self, text: str) -> str:
+        """Normalize one document or page in a single pass."""
+        if not text:
+            return ""
+        replace = self._replace_ascii if self.mode == "ascii" else self._replace
+        return self._pattern.sub(replace, text).strip()
+
+    def normalize_pages(self, pages: Iterable[str]) -> Iterator[str]:
+        """
+        Normalize pages one at a time as they arrive.
+
+        Joining the non-empty results with newlines gives the document text.
+        """
+        for page in pages:
+            yield self.normalize(page)
+
+
+_normalizers: Dict[str, TextNormalizer] = {}
+
+
+def get_normalizer(mode: Optional[str] = None) -> TextNormalizer:
+    """Shared normalizer for a mode (TEXT_NORMALIZE_MODE by default)."""
+    mode = mode or os.getenv("TEXT_NORMALIZE_MODE", DEFAULT_MODE).lower()
+    if mode not in _normalizers:
+        _normalizers[mode] = TextNormalizer(mode)
+    return _normalizers[mode]
+
+
+def normalize_text(text: str, mode: Optional[str] = None) -> str:
+    """Normalize text with the shared normalizer for a mode."""
+    return get_normalizer(mode).normalize(text)
+
+
+def lower_same_length(text: str) -> str:
+    """Lower-case text without changing its length, so match positions carry over."""
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    # A few characters ("İ") lower-case to two code points; leave those as they are
+    return "".join(char.lower() if len(char.lower()) == 1 else char for char in text)
@@ -0,0 +1,135 @@
+import os
+import tempfile
+import logging
+from typing import Dict, Optional
+from fastapi import Request
+from multipart.multipart import MultipartParser, parse_options_header
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_UPLOAD_BYTES = 10 * 1024 * 1024  # matches the Node resume upload limit
+
+
+class UploadError(Exception):
+    """Raised for malformed, oversized or unsupported uploads."""
+
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class SpooledUpload:
+    """A file part written to a temp file, plus the plain form fields sent with it."""
+
+    def __init__(self):
+        self.path: Optional[str] = None
+        self.filename: Optional[str] = None
+        self.content_type: Optional[str] = None
+        self.size = 0
+        self.fields: Dict[str, str] = {}
+
+    def cleanup(self):
+        if self.path and os.path.exists(self.path):
+            os.unlink(self.path)
+        self.path = None
+
+
+async def spool_upload(request: Request, file_field: str = "file", max_bytes: Optional[int] = None) -> SpooledUpload:
+    """
+    Stream a multipart/form-data request body straight into a temp file.
+
+    Unlike FastAPI's UploadFile, the file part is never held in memory:
+    each chunk from the socket goes through the multipart parser and onto
+    disk. Only the first part named ``file_field`` is kept; small text
+    fields are collected into ``fields``.
+
+    Raises:
+        UploadError: If the body is not multipart, has no file part, or the
+            file exceeds ``max_bytes`` (MAX_UPLOAD_BYTES by default).
+    """
+    if max_bytes is None:
+        max_bytes = int(os.getenv("MAX_UPLOAD_BYTES", DEFAULT_MAX_UPLOAD_BYTES))
+
+    content_type, params = parse_options_header(request.headers.get("Content-Type", ""))
+    if content_type != b"multipart/form-data" or b"boundary" not in params:
+        raise UploadError("Expected a multipart/form-data body", status_code=415)
+
+    upload = SpooledUpload()
+    state = {
+        "headers": {}, "header_name": b"", "header_value": b"",
+        "name": None, "is_file": False, "file": None, "data": b""
+    }
+
+    def on_part_begin():
+        state.update(headers={}, name=None, is_file=False, file=None, data=b"")
+
+    def on_header_field(data, start, end):
+        state["header_name"] += data[start:end]
+
+    def on_header_value(data, start, end):
+        state["header_value"] += data[start:end]
+
+    def on_header_end():
+        state["headers"][state["header_name"].lower()] = state["header_value"]
+        state["header_name"] = b""
+        state["header_value"] = b""
+
+    def on_headers_finished():
+        _, options = parse_options_header(state["headers"].get(b"content-disposition", b""))
+        state["name"] = options.get(b"name", b"").decode("utf-8", errors="replace")
+        state["is_file"] = b"filename" in options
+        if state["is_file"] and state["name"] == file_field and upload.path is None:
+            handle = tempfile.NamedTemporaryFile(prefix="upload_", suffix=".pdf", delete=False)
+            upload.path = handle.name
+            upload.filename = options[b"filename"].decode("utf-8", errors="replace")
+            upload.content_type = state["headers"].get(b"content-type", b"").decode("latin-1") or None
+            state["file"] = handle
+
+    def on_part_data(data, start, end):
+        handle = state["file"]
+        if handle is not None:
+            upload.size += end - start
+            if upload.size > max_bytes:
+                raise UploadError(f"File exceeds the {max_bytes} byte upload limit", status_code=413)
+            # Small sequential writes land in the page cache; not worth a thread hop per chunk
+            handle.write(data[start:end])
+        elif not state["is_file"] and len(state["data"]) < 4096:
+            state["data"] += data[start:end]
+
+    def on_part_end():
+        if state["file"] is not None:
+            state["file"].close()
+            state["file"] = None
+        elif state["name"] and not state["is_file"]:
+            upload.fields[state["name"]] = state["data"].decode("utf-8", errors="replace")
+
+    parser = MultipartParser(params[b"boundary"], {
+        "on_part_begin": on_part_begin,
+        "on_part_data": on_part_data,
+        "on_part_end": on_part_end,
+        "on_header_field": on_header_field,
+        "on_header_value": on_header_value,
+        "on_header_end": on_header_end,
+        "on_headers_finished": on_headers_finished
+    })
+
+    try:
+        async for chunk in request.stream():
+            parser.write(chunk)
+        parser.finalize()
+    except UploadError:
+        _abort(state, upload)
+        raise
+    except Exception as e:
+        _abort(state, upload)
+        raise UploadError(f"Malformed multipart body: {e}")
+
+    if upload.path is None:
+        raise UploadError(f"Missing file field '{file_field}'")
+    return upload
+
+
+def _abort(state: Dict, upload: SpooledUpload):
+    if state["file"] is not None:
+        state["file"].close()
+    upload.cleanup()
@@ -0,0 +1,167 @@
+import math
+import re
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Any, Optional, List, Iterator
+
+logger = logging.getLogger(__name__)
+
+# Endpoint of the request being served, set by the API middleware
+_current_endpoint: ContextVar[Optional[str]] = ContextVar("usage_endpoint", default=None)
+
+# Word pieces and individual punctuation marks, roughly how BPE tokenizers split text
+_TOKEN_PIECE = re.compile(r"\w+|[^\w\s]")
+
+# Chat formats add a few tokens per message for role markers
+_MESSAGE_OVERHEAD_TOKENS = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the token count of a text without a tokenizer.
+
+    Short words count as one token; longer words are split every ~4 characters.
+    """
+    if not text:
+        return 0
+    return sum(max(1, math.ceil(len(piece) / 4)) for piece in _TOKEN_PIECE.findall(text))
+
+
+def estimate_prompt_tokens(messages: List[Dict[str, Any]]) -> int:
+    """Estimate prompt tokens for a list of chat messages."""
+    return sum(
+        estimate_tokens(message.get("content") or "") + _MESSAGE_OVERHEAD_TOKENS
+        for message in messages
+    )
+
+
+@contextmanager
+def endpoint_scope(endpoint: Optional[str]) -> Iterator[None]:
+    """Attribute LLM usage inside the block to an API endpoint."""
+    token = _current_endpoint.set(endpoint)
+    try:
+        yield
+    finally:
+        _current_endpoint.reset(token)
+
+
+def _new_bucket() -> Dict[str, Any]:
+    return {
+        "requests": 0,
+        "cache_hits": 0,
+        "coalesced": 0,
+        "upstream_calls": 0,
+        "estimated_prompt_tokens": 0,
+        "prompt_tokens": 0,
+        "completion_tokens": 0,
+        "total_tokens": 0,
+        "usage_missing": 0
+    }
+
+
+class UsageTracker:
+    """
+    Aggregates LLM token usage per endpoint, per service operation and per model.
+
+    Prompt tokens are estimated locally before each call; actual prompt and
+    completion tokens come from the upstream ``usage`` block (estimated from
+    the output text when the upstream does not report them).
+    """
+
+    def __init__(self):
+        self._totals = _new_bucket()
+        self._by_endpoint: Dict[str, Dict[str, Any]] = {}
+        self._by_operation: Dict[str, Dict[str, Any]] = {}
+        self._by_model: Dict[str, Dict[str, Any]] = {}
+
+    def _buckets(self, model: Optional[str], operation: Optional[str]) -> List[Dict[str, Any]]:
+        endpoint = _current_endpoint.get() or "internal"
+        return [
+            self._totals,
+            self._by_endpoint.setdefault(endpoint, _new_bucket()),
+            self._by_operation.setdefault(operation or "unlabeled", _new_bucket()),
+            self._by_model.setdefault(model or "unknown", _new_bucket())
+        ]
+
+    def record_request(
+        self,
+        model: Optional[str],
+        operation: Optional[str],
+        estimated_prompt_tokens: int,
+        cache_hit: bool = False,
+        coalesced: bool = False
+    ):
+        """
+        Count a chat request and its locally estimated prompt size.
+
+        A ``coalesced`` request shared an identical call already in flight;
+        it is only counted under "coalesced", not as a request of its own.
+        """
+        for bucket in self._buckets(model, operation):
+            if coalesced:
+                bucket["coalesced"] += 1
+                continue
+            bucket["requests"] += 1
+            bucket["estimated_prompt_tokens"] += estimated_prompt_tokens
+            if cache_hit:
+                bucket["cache_hits"] += 1
+
+    def record_usage(
+        self,
+        model: Optional[str],
+        operation: Optional[str],
+        usage: Optional[Dict[str, Any]],
+        estimated_prompt_tokens: int = 0,
+        completion_text: str = ""
+    ):
+        """
+        Count one successful upstream call.
+
+        Args:
+            model (Optional[str]): Model the call was made with.
+            operation (Optional[str]): Service operation that issued it.
+            usage (Optional[Dict[str, Any]]): Upstream ``usage`` block, if any.
+            estimated_prompt_tokens (int): Local estimate, used when usage is missing.
+            completion_text (str): Generated text, used when usage is missing.
+        """
+        missing = not usage
+        if missing:
+            prompt_tokens = estimated_prompt_tokens
+            completion_tokens = estimate_tokens(completion_text)
+            total_tokens = prompt_tokens + completion_tokens
+        else:
+            prompt_tokens = int(usage.get("prompt_tokens") or 0)
+            completion_tokens = int(usage.get("completion_tokens") or 0)
+            total_tokens = int(usage.get("total_tokens") or prompt_tokens + completion_tokens)
+
+        for bucket in self._buckets(model, operation):
+            bucket["upstream_calls"] += 1
+            bucket["prompt_tokens"] += prompt_tokens
+            bucket["completion_tokens"] += completion_tokens
+            bucket["total_tokens"] += total_tokens
+            if missing:
+                bucket["usage_missing"] += 1
+
+    def reset(self):
+        self.__init__()
+
+    @staticmethod
+    def _summarize(bucket: Dict[str, Any]) -> Dict[str, Any]:
+        calls = bucket["upstream_calls"]
+        summary = dict(bucket)
+        summary["avg_prompt_tokens"] = round(bucket["prompt_tokens"] / calls, 1) if calls else 0.0
+        summary["avg_completion_tokens"] = round(bucket["completion_tokens"] / calls, 1) if calls else 0.0
+        return summary
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "totals": self._summarize(self._totals),
+            "by_endpoint": {name: self._summarize(b) for name, b in self._by_endpoint.items()},
+            "by_operation": {name: self._summarize(b) for name, b in self._by_operation.items()},
+            "by_model": {name: self._summarize(b) for name, b in self._by_model.items()}
+        }
+
+
+# Shared tracker for all LLM calls made by this process
+llm_usage = UsageTracker()
@@ -17,7 +17,9 @@ class PerplexityService {
         timeout: this.timeout,
         headers: {
           'Content-Type': 'application/json',
-          'Authorization': `Bearer ${this.apiKey}`
+          'Authorization': `Bearer ${this.apiKey}`,
+          // Lets ai-core give up (and return its fallback) before axios times out
+          'X-Request-Deadline': String(Date.now() + this.timeout - 1000)
         }
       })
 